@@ -5,6 +5,7 @@
 """
 
 import argparse
+import logging
 import os
 import sys
 from datetime import datetime
@@ -15,7 +16,7 @@ from docx import Document
 
 from text_processing import normalize_text
 from section_detection import find_sections
-from utils import load_doc, load_config, save_results, parse_date, format_excel_file, highlight_names_in_documents
+from utils import load_doc, load_config, save_results, parse_date, format_excel_file, excel_column_widths, highlight_names_in_documents
 from processors.arrival_processor import process_arrival_at_assignment, process_arrival_at_training
 from processors.hospital_processor import process_hospital_return
 from processors.return_processor import process_return_from_assignment
@@ -476,7 +477,7 @@ def process_directory(input_dir, output_dir, config_file='config.json'):
                 print(f"Результати збережено у Excel файл: {output_excel_path}")
                 
                 # Застосовуємо форматування до файлу Excel
-                if format_excel_file(output_excel_path):
+                if format_excel_file(output_excel_path, excel_column_widths(df)):
                     print(f"Форматування успішно застосовано до {output_excel_path}")
                 else:
                     print(f"Не вдалося застосувати форматування до {output_excel_path}")
@@ -501,6 +502,9 @@ def main():
     """
     Головна функція для запуску обробки наказів.
     """
+    # Діагностика процесорів іде через logging; підсумки (INFO) виводимо в консоль
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
     # Перевірка наявності аргументів командного рядка
     if len(sys.argv) == 1 or '-j' in sys.argv or '--json' in sys.argv:
         # Запуск без параметрів або з прапорцем -j - обробка всіх документів у директорії "in"
@@ -612,7 +616,7 @@ def main():
             print(f"Результати також збережено у Excel файл: {excel_output_file}")
             
             # Застосовуємо форматування до файлу Excel
-            if format_excel_file(excel_output_file):
+            if format_excel_file(excel_output_file, excel_column_widths(df)):
                 print(f"Форматування успішно застосовано до {excel_output_file}")
             else:
                 print(f"Не вдалося застосувати форматування до {excel_output_file}")
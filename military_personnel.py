@@ -2,6 +2,7 @@
 Модуль для обробки інформації про військовослужбовців у військових наказах.
 Основні функції:
 - extract_military_personnel: Витягує записи про військовослужбовців з тексту
+- may_contain_personnel: Швидка перевірка наявності звань у тексті
 - extract_rank_and_name: Витягує звання та ім'я військовослужбовця
 - extract_military_unit: Витягує військову частину
 - create_personnel_record: Створює запис про військовослужбовця
@@ -9,6 +10,8 @@
 
 import re
 import json
+from collections import namedtuple
+from functools import lru_cache
 from text_processing import normalize_text
 
 # Завантаження конфігурації
@@ -27,6 +30,127 @@ except (FileNotFoundError, json.JSONDecodeError) as e:
         "госпітал", "пункт", "територіальн", "зональн", "відділ", "служб"
     ]
 
+# Значення ВЧ, які вважаються невизначеними (порівнюються в нижньому регістрі)
+_UNKNOWN_VCH_VALUES = frozenset(('невідомо', 'не визначено'))
+_DEFAULT_VCH = 'А1890'
+
+# Шаблон імені з negative lookahead для виключення "з матеріального забезпечення"
+NAME_PATTERN = r"([А-ЯІЇЄҐ][а-яіїєґ'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+){2})(?!\s+забезпечення|\s+з\s+матеріального)"
+
+# Шаблони, що не залежать від словника звань, компілюються один раз
+LIST_PATTERN = re.compile(r"""
+        (?: # Початок необов'язкової групи ВЧ/кількості
+            (?: # Або ВЧ попереду
+                військовослужбовців\s+військової\s+частини\s+([АA][-]?\d{4}) # Група 1: ВЧ
+                (?:,\s*у\s+кількості\s+(\d+)\s+осіб)? # Група 2: Необов'язкова кількість
+            )
+            | # Або
+            (?: # Або ВЧ після "з"
+                 (?:з|зі|із)\s+військовослужбовців\s+військової\s+частини\s+([АA][-]?\d{4}) # Група 3: ВЧ
+            )
+            | # Або
+            (?: # Або тільки кількість
+                 у\s+кількості\s+(\d+)\s+осіб # Група 4: Кількість
+            )
+        )\s*:\s* # Обов'язковий роздільник ":"
+        ( # Група 5: Текст списку
+          .*? # Нежадібний пошук будь-яких символів
+        )
+        # Кінець списку: наступний рядок починається з "Підстава:", або наступний нумерований пункт, або кінець тексту
+        (?=\n\s*Підстава:|\n\s*\d+\.\s*|\Z)
+    """, re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+# Формат "до військової частини АXXXX:"
+DESTINATION_UNIT_PATTERN = re.compile(r"""
+        (?:до|у)\s+військов(?:ої|у)\s+частин(?:и|у)\s+([АA][-]?\d{4})\s*:\s* # Група 1: ВЧ призначення
+        (.*?) # Група 2: Текст нумерованого списку
+        (?=\n\s*Видати|\n\s*Підстава:|\n\s*\d+\.\d+\.\d+|\Z) # Кінець списку
+    """, re.DOTALL | re.IGNORECASE | re.VERBOSE)
+
+# Списки у форматі "у кількості X осіб:" без явного закінчення
+EXTENDED_LIST_PATTERN = re.compile(r"у\s+кількості\s+(\d+)\s+осіб:?\s*(.*?)(?=\n\s*Підстава:|\n\s*\d+\.\d+|\n\s*зарахувати|\n\s*військов|\Z)", re.DOTALL | re.IGNORECASE)
+
+
+@lru_cache(maxsize=4)
+def _build_rank_patterns(rank_keys):
+    """
+    Компілює шаблони пошуку звання+ПІБ для набору звань один раз.
+
+    Args:
+        rank_keys (tuple): Форми звань (ключі rank_map) у порядку словника
+
+    Returns:
+        dict: Скомпільовані шаблони для extract_military_personnel та extract_rank_and_name
+    """
+    rank_names = "|".join(map(re.escape, rank_keys))
+    name_pattern = NAME_PATTERN
+    short_name = r"([А-ЯІЇЄҐ][а-яіїєґ\'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+){1,2})"
+    mob_name = r"([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)"
+    return {
+        # find_known_rank: форми звань у нижньому регістрі в порядку rank_map
+        'lowered_ranks': tuple((rank.lower(), rank) for rank in rank_keys),
+        # may_contain_personnel: будь-яка форма звання або список "у кількості"
+        'prefilter': re.compile(r'у\s+кількості|' + rank_names, re.IGNORECASE),
+        # extract_military_personnel
+        'clean_mob': re.compile(rf"({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{mob_name}", re.IGNORECASE),
+        'numbered_list': re.compile(r'^\s*\d+\.\s+(' + rank_names + r')\s+' + short_name, re.MULTILINE | re.IGNORECASE),
+        'line_by_line': re.compile(r'^(' + rank_names + r')\s+' + short_name, re.MULTILINE | re.IGNORECASE),
+        'large_list': re.compile(r'(?i)(?:^|\s*,\s*|(?<=:)\s*)(' + rank_names + r')\s+' + short_name),
+        'leading_rank': re.compile(rf"(?i)\s*({rank_names})\b"),
+        'rank_name': re.compile(rf"(?i)({rank_names})\s+" + short_name),
+        'mobilization': re.compile(rf"(?i)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{mob_name}"),
+        'ordered': [
+            ("Mobilization Full", re.compile(rf"(?i)\b({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}")),
+            ("Numbered Mobilization", re.compile(rf"(?i)\d+\.\s+({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}")),
+            ("Before Zarachuvaty", re.compile(rf"(?i)\b({rank_names})\s+{name_pattern},?\s+зарахувати")),
+            ("Numbered Standard", re.compile(rf"(?i)(?<!мобілізації\s)\d+\.\s+({rank_names})\s+{name_pattern}")),
+            ("Comma Separated", re.compile(rf"(?i)(?<!мобілізації\s),\s*({rank_names})\s+{name_pattern}")), # Додано \s* після коми
+            ("Standard", re.compile(rf"(?i)(?<!за\sпризовом\sпо\sмобілізації\s)\b({rank_names})\b\s+{name_pattern}")),
+        ],
+        # extract_rank_and_name
+        'single_mob_direct': re.compile(rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{mob_name}"),
+        'single_mob': re.compile(rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}"),
+        'single_std': re.compile(rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\b\s+{name_pattern}"),
+        'single_basic': re.compile(rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\b\s+([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)(?!\s+забезпечення|\s+з\s+матеріального)"),
+    }
+
+
+def may_contain_personnel(text, rank_map):
+    """
+    Швидка перевірка, чи може extract_military_personnel знайти когось у тексті.
+    Без жодної форми звання та без списку "у кількості X осіб" результат завжди порожній,
+    тож такі абзаци можна пропускати без нормалізації та розбору.
+
+    Args:
+        text (str): Текст абзацу
+        rank_map (dict): Словник для нормалізації звань
+
+    Returns:
+        bool: False, якщо в тексті гарантовано немає військовослужбовців
+    """
+    return _build_rank_patterns(tuple(rank_map))['prefilter'].search(text) is not None
+
+
+def find_known_rank(text, rank_map):
+    """
+    Знаходить перше (у порядку rank_map) звання, форма якого зустрічається в тексті.
+    Форми звань у нижньому регістрі кешуються разом з шаблонами, а текст зводиться
+    до нижнього регістру один раз.
+
+    Args:
+        text (str): Текст для пошуку
+        rank_map (dict): Словник для нормалізації звань
+
+    Returns:
+        str: Нормалізоване звання з rank_map або None
+    """
+    text_lower = text.lower()
+    for rank_lower, rank in _build_rank_patterns(tuple(rank_map))['lowered_ranks']:
+        if rank_lower in text_lower:
+            return rank_map[rank]
+    return None
+
+
 def extract_military_personnel(section_text, rank_map):
     """
     Витягує інформацію про всіх військовослужбовців з тексту секції.
@@ -56,15 +180,15 @@ def extract_military_personnel(section_text, rank_map):
         "тво"
     ]
     
-    # Перевіряємо наявність фраз-винятків у тексті
+    # Перевіряємо наявність фраз-винятків у тексті (нижній регістр - один раз на текст)
+    section_text_lower = section_text.lower()
     for phrase in exclusion_phrases:
-        if phrase.lower() in section_text.lower():
+        if phrase in section_text_lower:
             print(f"⚠️ Знайдено фразу-виняток: '{phrase}'. Пропускаємо цей текст як не пов'язаний з вибуттям.")
             return []
 
-    rank_names = "|".join(map(re.escape, rank_map.keys()))
-    # Оновлений шаблон імені з negative lookahead для виключення "з матеріального забезпечення"
-    name_pattern = r"([А-ЯІЇЄҐ][а-яіїєґ'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+){2})(?!\s+забезпечення|\s+з\s+матеріального)"
+    # Шаблони звання+ПІБ компілюються один раз на словник звань
+    patterns = _build_rank_patterns(tuple(rank_map))
 
     personnel = []
     seen_keys = set()  # Використовуємо для уникнення дублікатів за ключем "ранг|ім'я"
@@ -72,8 +196,7 @@ def extract_military_personnel(section_text, rank_map):
 
     # Додаємо перевірку на наявність військовослужбовців в чистому тексті перед початком розбору
     # Шукаємо спеціальний випадок - "звання за призовом по мобілізації ПІБ"
-    clean_mob_pattern = rf"({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)"
-    clean_mob_matches = list(re.finditer(clean_mob_pattern, section_text, re.IGNORECASE))
+    clean_mob_matches = list(patterns['clean_mob'].finditer(section_text))
     
     if clean_mob_matches:
         print(f"Знайдено {len(clean_mob_matches)} прямих записів мобілізованих")
@@ -99,43 +222,12 @@ def extract_military_personnel(section_text, rank_map):
                 print(f"✅ Додано прямий запис мобілізованого: {rank} {name}")
 
     # --- Крок 1: Пріоритетна обробка списків ---
-    list_pattern_text = r"""
-        (?: # Початок необов'язкової групи ВЧ/кількості
-            (?: # Або ВЧ попереду
-                військовослужбовців\s+військової\s+частини\s+([АA][-]?\d{4}) # Група 1: ВЧ
-                (?:,\s*у\s+кількості\s+(\d+)\s+осіб)? # Група 2: Необов'язкова кількість
-            )
-            | # Або
-            (?: # Або ВЧ після "з"
-                 (?:з|зі|із)\s+військовослужбовців\s+військової\s+частини\s+([АA][-]?\d{4}) # Група 3: ВЧ
-            )
-            | # Або
-            (?: # Або тільки кількість
-                 у\s+кількості\s+(\d+)\s+осіб # Група 4: Кількість
-            )
-        )\s*:\s* # Обов'язковий роздільник ":"
-        ( # Група 5: Текст списку
-          .*? # Нежадібний пошук будь-яких символів
-        )
-        # Кінець списку: наступний рядок починається з "Підстава:", або наступний нумерований пункт, або кінець тексту
-        (?=\n\s*Підстава:|\n\s*\d+\.\s*|\Z)
-    """
-    list_pattern = re.compile(list_pattern_text, re.DOTALL | re.IGNORECASE | re.VERBOSE)
-    
-    # Додаємо новий патерн для формату "до військової частини АXXXX:"
-    destination_unit_pattern = r"""
-        (?:до|у)\s+військов(?:ої|у)\s+частин(?:и|у)\s+([АA][-]?\d{4})\s*:\s* # Група 1: ВЧ призначення
-        (.*?) # Група 2: Текст нумерованого списку
-        (?=\n\s*Видати|\n\s*Підстава:|\n\s*\d+\.\d+\.\d+|\Z) # Кінець списку
-    """
-    destination_unit_pattern_compiled = re.compile(destination_unit_pattern, re.DOTALL | re.IGNORECASE | re.VERBOSE)
-
     print("--- Пошук пріоритетних блоків списків ---")
-    list_matches = list(list_pattern.finditer(section_text))
+    list_matches = list(LIST_PATTERN.finditer(section_text))
     print(f"Знайдено {len(list_matches)} потенційних блоків списків.")
     
     # Додаємо пошук за новим патерном "до військової частини АXXXX:"
-    destination_matches = list(destination_unit_pattern_compiled.finditer(section_text))
+    destination_matches = list(DESTINATION_UNIT_PATTERN.finditer(section_text))
     if destination_matches:
         print(f"Знайдено {len(destination_matches)} списків у форматі 'до військової частини АXXXX'")
         for dest_match in destination_matches:
@@ -180,8 +272,7 @@ def extract_military_personnel(section_text, rank_map):
                 list_matches.append(SyntheticMatch(vch, list_text, list_start, list_end))
 
     # Додатковий патерн для пошуку списків у форматі "у кількості X осіб:" без явного закінчення
-    extended_list_pattern = r"у\s+кількості\s+(\d+)\s+осіб:?\s*(.*?)(?=\n\s*Підстава:|\n\s*\d+\.\d+|\n\s*зарахувати|\n\s*військов|\Z)"
-    extended_matches = list(re.finditer(extended_list_pattern, section_text, re.DOTALL | re.IGNORECASE))
+    extended_matches = list(EXTENDED_LIST_PATTERN.finditer(section_text))
     if extended_matches:
         print(f"Знайдено {len(extended_matches)} розширених блоків списків.")
         for match in extended_matches:
@@ -240,8 +331,7 @@ def extract_military_personnel(section_text, rank_map):
         found_in_block = 0
         
         # Спочатку перевіряємо, чи це нумерований список у форматі "1. солдат ПІБ, номер"
-        numbered_list_pattern = r'^\s*\d+\.\s+(' + rank_names + r')\s+([А-ЯІЇЄҐ][а-яіїєґ\'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+){1,2})'
-        numbered_matches = list(re.finditer(numbered_list_pattern, list_text, re.MULTILINE | re.IGNORECASE))
+        numbered_matches = list(patterns['numbered_list'].finditer(list_text))
         
         if numbered_matches:
             print(f"  Знайдено {len(numbered_matches)} записів у нумерованому списку")
@@ -268,8 +358,7 @@ def extract_military_personnel(section_text, rank_map):
         # Якщо нумерованого списку немає, перевіряємо список з новими рядками (кожен рядок = звання + ПІБ)
         if not numbered_matches:
             # Патерн для списку, де кожен рядок починається зі звання
-            line_by_line_pattern = r'^(' + rank_names + r')\s+([А-ЯІЇЄҐ][а-яіїєґ\'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+){1,2})'
-            line_matches = list(re.finditer(line_by_line_pattern, list_text, re.MULTILINE | re.IGNORECASE))
+            line_matches = list(patterns['line_by_line'].finditer(list_text))
             
             if line_matches:
                 print(f"  Знайдено {len(line_matches)} записів у списку по рядках (без нумерації)")
@@ -295,10 +384,8 @@ def extract_military_personnel(section_text, rank_map):
         
         # Удосконалений патерн для випадку, коли є великий список імен після "у кількості X осіб:"
         # Покращений патерн для пошуку за "звання + ім'я" форматом, більш гнучкий до можливих перенесень рядків
-        large_list_pattern = r'(?i)(?:^|\s*,\s*|(?<=:)\s*)(' + rank_names + r')\s+([А-ЯІЇЄҐ][а-яіїєґ\'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+){1,2})'
-        
         # Шукаємо всі звання+імена у списку
-        large_list_matches = list(re.finditer(large_list_pattern, list_text))
+        large_list_matches = list(patterns['large_list'].finditer(list_text))
         
         if large_list_matches:
             print(f"  Знайдено {len(large_list_matches)} записів у форматі 'звання ім'я'")
@@ -327,7 +414,7 @@ def extract_military_personnel(section_text, rank_map):
             print(f"  Пошук додаткових записів через розбір по комам (знайдено {found_in_block}, очікується {expected_count})...")
             
             # Спробуємо спочатку знайти провідне звання на початку списку
-            leading_rank_match = re.match(rf"(?i)\s*({rank_names})\b", list_text)
+            leading_rank_match = patterns['leading_rank'].match(list_text)
             if leading_rank_match:
                 current_rank = rank_map.get(leading_rank_match.group(1).lower())
                 print(f"  Знайдено провідне звання: {current_rank}")
@@ -337,7 +424,7 @@ def extract_military_personnel(section_text, rank_map):
             for item in comma_items:
                 # Перевіряємо, чи є в елементі вже звання+ім'я
                 item_personnel = []
-                rank_name_match = re.search(rf"(?i)({rank_names})\s+([А-ЯІЇЄҐ][а-яіїєґ\'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+){{1,2}})", item)
+                rank_name_match = patterns['rank_name'].search(item)
                 
                 if rank_name_match:
                     # Знайдено звання та ім'я разом
@@ -418,8 +505,7 @@ def extract_military_personnel(section_text, rank_map):
     
     # Додаємо новий, більш загальний патерн для військовослужбовців за призовом по мобілізації
     # Цей патерн враховує, що між званням та іменем може бути фраза "за призовом по мобілізації"
-    mobilization_pattern = rf"(?i)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)"
-    mobilization_matches = list(re.finditer(mobilization_pattern, section_text))
+    mobilization_matches = list(patterns['mobilization'].finditer(section_text))
     
     if mobilization_matches:
         print(f"  Знайдено {len(mobilization_matches)} збігів для 'Mobilization Pattern'")
@@ -454,21 +540,12 @@ def extract_military_personnel(section_text, rank_map):
                     personnel.append(personnel_record)
                     print(f"    ✅ Додано (мобілізаційний патерн): {rank} {name} (моб.)")
     
-    patterns_ordered = [
-        ("Mobilization Full", rf"(?i)\b({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}"),
-        ("Numbered Mobilization", rf"(?i)\d+\.\s+({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}"),
-        ("Before Zarachuvaty", rf"(?i)\b({rank_names})\s+{name_pattern},?\s+зарахувати"),
-        ("Numbered Standard", rf"(?i)(?<!мобілізації\s)\d+\.\s+({rank_names})\s+{name_pattern}"),
-        ("Comma Separated", rf"(?i)(?<!мобілізації\s),\s*({rank_names})\s+{name_pattern}"), # Додано \s* після коми
-        ("Standard", rf"(?i)(?<!за\sпризовом\sпо\sмобілізації\s)\b({rank_names})\b\s+{name_pattern}"),
-    ]
-
-    for pattern_name, pattern_regex in patterns_ordered:
-        # print(f"Шукаємо за патерном '{pattern_name}': {pattern_regex[:60]}...")
-        matches = list(re.finditer(pattern_regex, section_text))
-        if matches: print(f"  Знайдено {len(matches)} збігів для '{pattern_name}'")
-
-        for match in matches:
+    for pattern_name, pattern_regex in patterns['ordered']:
+        # print(f"Шукаємо за патерном '{pattern_name}': {pattern_regex.pattern[:60]}...")
+        # Збіги обробляються по одному, без проміжного списку; кількість виводимо після проходу
+        match_count = 0
+        for match in pattern_regex.finditer(section_text):
+            match_count += 1
             match_start, match_end = match.span()
 
             # --- Крок 3: Перевірка на перетин з обробленими діапазонами ---
@@ -521,6 +598,8 @@ def extract_military_personnel(section_text, rank_map):
                     personnel.append(personnel_record)
                     print(f"    ✅ Додано (стандартний пошук '{pattern_name}'): {rank} {name}{' (моб.)' if mobilized else ''}")
 
+        if match_count: print(f"  Знайдено {match_count} збігів для '{pattern_name}'")
+
     print(f"\nЗагалом знайдено {len(personnel)} унікальних військовослужбовців")
     print(f"=== Кінець extract_military_personnel ===\n")
     return personnel
@@ -537,9 +616,7 @@ def extract_rank_and_name(text, rank_map):
     Returns:
         tuple: (звання, ім'я) або (None, None) якщо не знайдено
     """
-    rank_names = "|".join(map(re.escape, rank_map.keys()))
-    # Use the refined name pattern with negative lookahead to exclude "з матеріального забезпечення"
-    name_pattern = r"([А-ЯІЇЄҐ][а-яіїєґ'-]+(?:\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+){2})(?!\s+забезпечення|\s+з\s+матеріального)"
+    patterns = _build_rank_patterns(tuple(rank_map))
 
     # Спеціальний випадок для прямого тесту - для налагодження
     # Цей варіант має найвищий пріоритет для тексту, який ми зараз обробляємо
@@ -553,8 +630,7 @@ def extract_rank_and_name(text, rank_map):
         return (rank, name)
     
     # Покращений шаблон для мобілізованих - спочатку спробуємо прямий варіант з ПІБ
-    mobilization_pattern = rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)"
-    match = re.search(mobilization_pattern, text)
+    match = patterns['single_mob_direct'].search(text)
     if match:
         rank_raw = match.group(1).strip()
         name = match.group(2).strip()
@@ -569,8 +645,7 @@ def extract_rank_and_name(text, rank_map):
         return (rank, name)
     
     # Стандартний шаблон для мобілізованих
-    standard_mobilization_pattern = rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\s+за\s+призовом\s+по\s+мобілізації\s+{name_pattern}"
-    match = re.search(standard_mobilization_pattern, text)
+    match = patterns['single_mob'].search(text)
     if match:
         rank_raw = match.group(1).strip()
         name = match.group(2).strip()
@@ -585,8 +660,7 @@ def extract_rank_and_name(text, rank_map):
         return (rank, name)
 
     # Базовий шаблон для пошуку (non-mobilized)
-    pattern = rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\b\s+{name_pattern}"
-    match = re.search(pattern, text)
+    match = patterns['single_std'].search(text)
     if match:
         rank_raw = match.group(1).strip()
         name = match.group(2).strip()
@@ -601,9 +675,7 @@ def extract_rank_and_name(text, rank_map):
         return (rank, name)
     
     # Додатковий шаблон для пошуку ПІБ
-    basic_name_pattern = r"([А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ'-]+)(?!\s+забезпечення|\s+з\s+матеріального)"
-    rank_name_pattern = rf"(?i)(?:^|\b|[0-9.]\s+)({rank_names})\b\s+{basic_name_pattern}"
-    match = re.search(rank_name_pattern, text)
+    match = patterns['single_basic'].search(text)
     if match:
         rank_raw = match.group(1).strip()
         name = match.group(2).strip()
@@ -704,7 +776,11 @@ def extract_military_unit(text):
     return None
 
 
-def create_personnel_record(rank, name, vch, location, os_type, date_k, meal, cause):
+# Значення за замовчуванням для записів секції, обчислюються один раз до циклу по абзацах
+RecordDefaults = namedtuple("RecordDefaults", "date meal vch location")
+
+
+def create_personnel_record(rank, name, vch, location, os_type, date_k, meal, cause, action=None):
     """
     Створює запис про військовослужбовця у стандартному форматі.
     
@@ -717,14 +793,18 @@ def create_personnel_record(rank, name, vch, location, os_type, date_k, meal, ca
         date_k (str): Дата
         meal (str): Інформація про харчування
         cause (str): Причина
+        action (str, optional): Дія ("виключити"/"зарахувати"). Якщо не вказана,
+            поле 'action' не додається (main.py проставляє його пізніше).
         
     Returns:
-        dict: Запис військовослужбовця у форматі словника
+        dict: Запис військовослужбовця у форматі словника. Залишається словником,
+        бо main.py доповнює та змінює поля запису, перевіряє наявність 'action',
+        а порядок ключів задає порядок колонок у pd.DataFrame(results).
     """
     # Встановлюємо стандартне значення для VCH, якщо воно не вказано або 'Невідомо' або None
-    effective_vch = vch if vch and vch.lower() not in ['невідомо', 'не визначено', None] else 'А1890'
+    effective_vch = vch if vch and vch.lower() not in _UNKNOWN_VCH_VALUES else _DEFAULT_VCH
     
-    return {
+    record = {
         "rank": rank,
         "name": name,
         "name_normal": "",  # Додаємо поле name_normal одразу після name
@@ -735,6 +815,9 @@ def create_personnel_record(rank, name, vch, location, os_type, date_k, meal, ca
         "meal": meal,
         "cause": cause
     }
+    if action is not None:
+        record["action"] = action
+    return record
 
 
 def is_person_duplicate(person_id, processed_persons, action=None, date=None):
@@ -750,12 +833,13 @@ def is_person_duplicate(person_id, processed_persons, action=None, date=None):
     Returns:
         bool: True, якщо дублікат (та сама особа з тією ж дією в той самий день), інакше False.
     """
+    person_key = person_id.lower() # Ключі зберігаються в нижньому регістрі
     if not isinstance(processed_persons, dict):
         # Для зворотної сумісності, якщо processed_persons - це просто множина
-        return person_id.lower() in processed_persons
+        return person_key in processed_persons
     
     # Перевіряємо, чи є цей person_id у словнику
-    if person_id.lower() not in processed_persons:
+    if person_key not in processed_persons:
         return False
     
     # Якщо запис існує, але action не вказано, вважаємо дублікатом 
@@ -764,7 +848,7 @@ def is_person_duplicate(person_id, processed_persons, action=None, date=None):
         return True
     
     # Отримуємо збережені дані для цієї особи
-    person_info = processed_persons[person_id.lower()]
+    person_info = processed_persons[person_key]
     
     # Якщо у збереженому записі немає action, але вказано у перевірці,
     # або навпаки, вважаємо не дублікатом
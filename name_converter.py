@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 import pymorphy3
 from utils import convert_surnames_to_nominative
 import argparse
@@ -68,12 +69,17 @@ def convert_full_name_to_nominative(full_name):
         surname_nom = surname_nom.upper()
     return f"{surname_nom} {name_nom} {patronymic_nom}"
 
+@lru_cache(maxsize=4096)
+def _convert_clean_name(clean_name):
+    """Кешує перетворення вже очищеного ПІБ: одна особа часто має кілька записів (виключення/зарахування)."""
+    return convert_full_name_to_nominative(clean_name)
+
 def process_full_name(full_name_genitive):
     """Обробляє повне ПІБ з родового відмінка в називний у форматі ПРІЗВИЩЕ Ім'я По-батькові."""
     if not isinstance(full_name_genitive, str):
         return ""
     clean_name = re.sub(r'\s+', ' ', full_name_genitive.strip())
-    return convert_full_name_to_nominative(clean_name)
+    return _convert_clean_name(clean_name)
 
 def convert_names_in_excel(input_file, output_file, column_name_genitive, new_column_name_nominative):
     """
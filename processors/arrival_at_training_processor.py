@@ -14,7 +14,7 @@ def process_arrival_at_training(section_text, rank_map, location_triggers, proce
     import re
     from text_processing import normalize_text
     from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
-    from military_personnel import extract_military_personnel, extract_military_unit, create_personnel_record, is_person_duplicate, determine_personnel_type
+    from military_personnel import extract_military_personnel, extract_military_unit, create_personnel_record, is_person_duplicate, determine_personnel_type, find_known_rank
     from utils import extract_location
 
     print("\n*** ENTERING process_arrival_at_training ***\n")
@@ -105,11 +105,7 @@ def process_arrival_at_training(section_text, rank_map, location_triggers, proce
                     # Якщо extract_military_personnel не знайшов осіб, пробуємо прямий пошук звання та імені
                     if not military_persons:
                         # Шукаємо звання серед відомих
-                        found_rank = None
-                        for rank in rank_map.keys():
-                            if rank.lower() in item.lower():
-                                found_rank = rank_map[rank]
-                                break
+                        found_rank = find_known_rank(item, rank_map)
                         
                         # Шукаємо ім'я (прізвище, ім'я та по-батькові)
                         name_match = re.search(r'([А-ЯІЇЄҐ][А-ЯІЇЄҐа-яіїєґ\'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+\s+[А-ЯІЇЄҐ][а-яіїєґ\'-]+)', item)
@@ -131,7 +131,7 @@ def process_arrival_at_assignment(section_text, rank_map, location_triggers, def
                 print(f"         Визначено тип ОС для {rank} {name}: {os_type}")
 
                 # Перевірка дублікатів (використовуємо загальний processed_persons)
-                person_id = f"{rank}_{name}"
+                person_id = (rank, name)
                 if person_id in processed_persons:
                     print(f"      ⚠️ Виявлено дублікат (Assignment): {rank} {name} - пропускаємо!")
                     continue
@@ -259,7 +259,7 @@ def process_arrival_at_training(section_text, rank_map, location_triggers, defau
                 print(f"         Визначено тип ОС для {rank} {name}: {os_type}")
 
                 # Перевірка дублікатів
-                person_id = f"{rank}_{name}"
+                person_id = (rank, name)
                 if person_id in processed_persons:
                     print(f"      ⚠️ Виявлено дублікат (Training): {rank} {name} - пропускаємо!")
                     continue
@@ -281,12 +281,10 @@ def process_departure_for_further_service(section_text, rank_map, location_trigg
             os_type="Постійний склад",
             date_k=departure_date,
             meal="зі сніданку",  # За замовчуванням
-            cause="Вибув для подальшого"
+            cause="Вибув для подальшого",
+            action="виключити"
         )
         
-        # Додаємо поле action
-        record["action"] = "виключити"
-        
         person_id = f"{rank}_{name}"
         results.append(record)
         processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
@@ -343,12 +341,10 @@ def process_departure_for_further_service(section_text, rank_map, location_trigg
                 os_type="Постійний склад",
                 date_k=departure_date,
                 meal="зі сніданку",  # За замовчуванням
-                cause="Вибув для подальшого"
+                cause="Вибув для подальшого",
+                action="виключити"
             )
             
-            # Додаємо поле action
-            record["action"] = "виключити"
-            
             results.append(record)
             processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
             print(f"✅ Додано з прямого пошуку: {rank} {name}, ВЧ: {record['VCH']}, причина: {record['cause']}")
@@ -457,12 +453,10 @@ def process_departure_for_further_service(section_text, rank_map, location_trigg
                 os_type=os_type,
                 date_k=departure_date or meal_date,
                 meal=meal_type,
-                cause="Вибув для подальшого"
+                cause="Вибув для подальшого",
+                action="виключити"
             )
             
-            # Додаємо поле action
-            record["action"] = "виключити"
-            
             results.append(record)
             processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
             total_found += 1
@@ -501,6 +495,12 @@ def process_departure_to_reserve(section_text, rank_map, location_triggers, proc
         # Конвертуємо set у dict, якщо потрібно (для зворотної сумісності)
         processed_persons = {p: {'action': None, 'date': None} for p in processed_persons}
     
+    # Нормалізовані тригери (без зайвих пробілів, у нижньому регістрі) - один раз на виклик,
+    # а не для кожного абзацу
+    normalized_triggers = [(trigger.strip().lower(), trigger, loc_key)
+                           for loc_key, triggers in location_triggers.items()
+                           for trigger in triggers]
+
     # Функція для визначення правильної локації з location_triggers
     def get_location_from_config(text):
         # Спочатку використовуємо стандартну функцію для пошуку тригерів локацій
@@ -510,17 +510,15 @@ def process_departure_to_reserve(section_text, rank_map, location_triggers, proc
             return location
             
         # Шукаємо прямі згадки про підрозділи, які можуть бути в location_triggers
-        for loc_key, triggers in location_triggers.items():
-            for trigger in triggers:
-                # Нормалізуємо тригер для пошуку (видаляємо зайві пробіли, переводимо в нижній регістр)
-                normalized_trigger = trigger.strip().lower()
-                # Шукаємо тригер в тексті
-                if normalized_trigger in text.lower():
-                    print(f"Знайдено пряму згадку тригера '{trigger}' для локації '{loc_key}'")
-                    return loc_key
+        text_lower = text.lower()
+        for normalized_trigger, trigger, loc_key in normalized_triggers:
+            # Шукаємо тригер в тексті
+            if normalized_trigger in text_lower:
+                print(f"Знайдено пряму згадку тригера '{trigger}' для локації '{loc_key}'")
+                return loc_key
         
         # Якщо не знайдено жодного тригера, перевіряємо наявність ключових слів навчальних підрозділів
-        if "навчальн" in text.lower() and "батальйон" in text.lower():
+        if "навчальн" in text_lower and "батальйон" in text_lower:
             # Шукаємо номер навчального батальйону
             batallion_match = re.search(r'(\d+)[-\s]*(?:[а-яіїєґ]+\s+)?навчальн(?:ого|ий)\s+батальйон', text, re.IGNORECASE)
             if batallion_match:
@@ -592,12 +590,10 @@ def process_departure_to_reserve(section_text, rank_map, location_triggers, proc
             os_type="Постійний склад",
             date_k=departure_date,
             meal="зі сніданку",  # За замовчуванням
-            cause="Звільнення в запас"
+            cause="Звільнення в запас",
+            action="виключити"
         )
         
-        # Додаємо поле action
-        record["action"] = "виключити"
-        
         results.append(record)
         person_id = f"{rank}_{name}"
         processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
@@ -723,12 +719,10 @@ def process_departure_to_reserve(section_text, rank_map, location_triggers, proc
                     os_type=os_type,
                     date_k=departure_date,
                     meal=meal_type,
-                    cause="Звільнення в запас"
+                    cause="Звільнення в запас",
+                    action="виключити"
                 )
                 
-                # Додаємо поле action
-                record["action"] = "виключити"
-                
                 results.append(record)
                 processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
                 print(f"✅ Додано запис зі складного абзацу: {rank} {name}, локація: {location}, дата: {departure_date}, причина: {record['cause']}")
@@ -874,12 +868,10 @@ def process_departure_to_reserve(section_text, rank_map, location_triggers, proc
                 os_type=os_type,
                 date_k=departure_date or meal_date,
                 meal=meal_type or "зі сніданку",
-                cause="Звільнення в запас"
+                cause="Звільнення в запас",
+                action="виключити"
             )
             
-            # Додаємо поле action
-            record["action"] = "виключити"
-            
             results.append(record)
             processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
             total_found += 1
@@ -969,12 +961,10 @@ def process_departure_to_assignment(section_text, rank_map, location_triggers, p
                     os_type=os_type,
                     date_k=departure_date or meal_date,
                     meal=meal_type or "зі сніданку",
-                    cause=cause
+                    cause=cause,
+                    action="виключити"
                 )
                 
-                # Додаємо поле action
-                record["action"] = "виключити"
-                
                 results.append(record)
                 processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
                 total_found += 1
@@ -1089,12 +1079,10 @@ def process_departure_to_vacation(section_text, rank_map, location_triggers, pro
                     os_type=os_type,
                     date_k=departure_date or meal_date,
                     meal=meal_type or "зі сніданку",
-                    cause=cause
+                    cause=cause,
+                    action="виключити"
                 )
                 
-                # Додаємо поле action
-                record["action"] = "виключити"
-                
                 results.append(record)
                 processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
                 total_found += 1
@@ -1188,15 +1176,13 @@ def process_departure_to_hospital(section_text, rank_map, location_triggers, pro
                     os_type=os_type,
                     date_k=departure_date or meal_date,
                     meal=meal_type or "зі сніданку",
-                    cause="Шпиталь"
+                    cause="Шпиталь",
+                    action="виключити"
                 )
                 
                 # Для логування знайденої локації
                 print(f"Використано локацію: {record['location']}")
                 
-                # Додаємо поле action
-                record["action"] = "виключити"
-                
                 results.append(record)
                 processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
                 total_found += 1
@@ -1326,12 +1312,10 @@ def process_direct_departure_entries(section_text, rank_map, location_triggers,
                 os_type=os_type,
                 date_k=departure_date,
                 meal="зі сніданку",  # За замовчуванням
-                cause=cause
+                cause=cause,
+                action="виключити"
             )
             
-            # Додаємо поле action
-            record["action"] = "виключити"
-            
             results.append(record)
             processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
             total_found += 1
@@ -1498,9 +1482,9 @@ def process_personnel_on_assignment_a1890(section_text, rank_map, location_trigg
                         os_type="Постійний склад",
                         date_k=departure_date,
                         meal=meal,
-                        cause="перебували у відрядженні 1890"
+                        cause="перебували у відрядженні 1890",
+                        action="виключити"
                     )
-                    record["action"] = "виключити"
                     results.append(record)
                     processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
                     print(f"✅ Додано запис про вибуття: {rank} {name}, ВЧ: {record['VCH']}, причина: {record['cause']}")
@@ -1586,9 +1570,9 @@ def process_personnel_on_assignment_a1890(section_text, rank_map, location_trigg
                 os_type="Постійний склад",
                 date_k=departure_date,
                 meal=meal,
-                cause="перебували у відрядженні 1890"
+                cause="перебували у відрядженні 1890",
+                action="виключити"
             )
-            record["action"] = "виключити"
             results.append(record)
             processed_persons[person_id.lower()] = {'action': "виключити", 'date': departure_date}
             print(f"✅ Додано запис про вибуття: {rank} {name}, ВЧ: {record['VCH']}, причина: {record['cause']}")
@@ -121,7 +121,7 @@ def process_hospital_return(section_text, rank_map, location_triggers, processed
                 print(f"         ВЧ для {rank} {name}: {current_vch_for_person} (з абзацу: {vch_in_para})")
 
                 # Перевірка дублікатів
-                person_id = f"{rank}_{name}"
+                person_id = (rank, name)
                 if person_id in processed_persons:
                     print(f"      ⚠️ Виявлено дублікат (Hospital): {rank} {name} - пропускаємо!")
                     continue
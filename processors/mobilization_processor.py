@@ -5,12 +5,188 @@
 - search_mob: Пошук записів про мобілізованих військовослужбовців
 """
 
+import logging
 import re
 from text_processing import normalize_text
 from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
-from military_personnel import extract_military_personnel, extract_military_unit, create_personnel_record, is_person_duplicate, determine_personnel_type
+from military_personnel import extract_military_personnel, may_contain_personnel, extract_military_unit, create_personnel_record, RecordDefaults, is_person_duplicate
 from utils import extract_location, determine_paragraph_location
 
+logger = logging.getLogger(__name__)
+
+# Преамбула секції та межі нумерованих записів
+_NB_PREAMBLE_RE = re.compile(r'(\d+)\s+навчального\s+батальйону', re.IGNORECASE)
+_ENTRY_START_RE = re.compile(r'^\s*\d+\.(\s+)', re.MULTILINE) # Початок нумерованого запису
+_NEXT_ENTRY_RE = re.compile(r'\n\s*\d+\.\s+') # Перенос рядка перед наступним номером
+_ORIGIN_RE = re.compile(r'який\s+прибув\s+з\s+(.*?)(?:;|\n|Підстава:|\Z)', re.IGNORECASE)
+
+_BASIS_MARKER = '\nПідстава:'
+
+# Значення полів, що повторюються в кожному записі
+_OS_KURSANT = "Курсант"
+_OS_MOB = "Мобілізований"
+_OS_PERMANENT = "Постійний склад"
+_DEFAULT_VCH = "А1890"
+_DEFAULT_LOCATION = "НЦ"
+_DEFAULT_MEAL = "зі сніданку"
+_UNKNOWN_ORIGIN = "Не вказано"
+_FIRST_ENTRY_MARKER = '1.'
+
+
+def _find_first_entry(text):
+    """
+    Знаходить перший запис "1. " на початку рядка (з можливими пробілами перед ним).
+    Еквівалент re.search(r'^\s*1\.\s+', text, re.MULTILINE), але через str.find.
+
+    Args:
+        text (str): Текст секції
+
+    Returns:
+        int: Позиція "1." або -1, якщо нумерованого списку немає
+    """
+    text_len = len(text)
+    idx = text.find(_FIRST_ENTRY_MARKER)
+    while idx != -1:
+        line_start = text.rfind('\n', 0, idx) + 1
+        after = idx + len(_FIRST_ENTRY_MARKER)
+        if (after < text_len and text[after].isspace()
+                and (line_start == idx or text[line_start:idx].isspace())):
+            return idx
+        idx = text.find(_FIRST_ENTRY_MARKER, idx + 1)
+    return -1
+
+
+def _iter_entries(text):
+    """
+    Послідовно повертає нумеровані записи ("1. ...", "2. ...") з тексту.
+    Записи нарізаються по одному, без проміжного списку всіх записів.
+    Для кожного запису окремо шукаються початок і межа (наступний номер
+    або рядок "Підстава:"), тож текст проходиться лінійно, без лінивого
+    `.+?` з lookahead по всьому запису.
+
+    Args:
+        text (str): Текст зі списком нумерованих записів
+
+    Yields:
+        str: Текст чергового запису
+    """
+    text_len = len(text)
+    pos = 0
+    while True:
+        start_match = _ENTRY_START_RE.search(text, pos)
+        if not start_match:
+            break
+        body_start = start_match.end()
+        if body_start == text_len and len(start_match.group(1)) < 2:
+            # Номер без тексту запису в самому кінці не вважається записом
+            pos = start_match.start() + 1
+            continue
+        # Запис закінчується перед наступним номером або рядком "Підстава:"
+        next_match = _NEXT_ENTRY_RE.search(text, body_start + 1)
+        end = next_match.start() if next_match else text_len
+        basis_pos = text.find(_BASIS_MARKER, body_start + 1, end)
+        if basis_pos != -1:
+            end = basis_pos
+        yield text[start_match.start():end]
+        pos = end
+
+
+def _scan_paragraph_features(paragraph_norm):
+    """
+    Визначає тип ОС та місце прибуття для нормалізованого абзацу (один раз на абзац).
+
+    Args:
+        paragraph_norm (str): Нормалізований текст абзацу
+
+    Returns:
+        tuple: (тип_ОС, місце_прибуття або None)
+    """
+    paragraph_lower = paragraph_norm.lower()
+    origin_match = _ORIGIN_RE.search(paragraph_norm)
+    origin_location = origin_match.group(1).strip() if origin_match else None
+
+    # Пріоритет Курсант > Мобілізований
+    if "курсант" in paragraph_lower:
+        os_type = _OS_KURSANT
+    elif "мобілізації" in paragraph_lower:
+        os_type = _OS_MOB
+    else:
+        os_type = _OS_PERMANENT
+    return os_type, origin_location
+
+
+def _entry_records(para_idx, paragraph_text, rank_map, location_triggers, defaults):
+    """
+    Будує записи для одного нумерованого запису без перевірки дублікатів.
+
+    Args:
+        para_idx (int): Номер запису в секції
+        paragraph_text (str): Текст запису (сирий)
+        rank_map (dict): Словник відповідності звань
+        location_triggers (dict): Словник тригерів локацій
+        defaults (RecordDefaults): Дата, харчування, ВЧ та локація з преамбули
+
+    Returns:
+        list: [(person_id, запис)] у порядку появи в записі
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("--- Абзац/Запис %d ---", para_idx)
+        logger.debug("Текст (перші 100): %s...", paragraph_text[:100])
+
+    # Записи без жодного звання відкидаємо до нормалізації та розбору
+    if not may_contain_personnel(paragraph_text, rank_map):
+        logger.warning("Не знайдено військовослужбовців у записі %d. Текст: %s...", para_idx, paragraph_text[:150])
+        return []
+
+    paragraph_norm = normalize_text(paragraph_text) # Нормалізуємо абзац
+
+    # Витягуємо військовослужбовців ТІЛЬКИ з цього абзацу
+    military_persons_in_para = extract_military_personnel(paragraph_text, rank_map)
+    logger.debug("Знайдено %d військовослужбовців в абзаці", len(military_persons_in_para))
+
+    if not military_persons_in_para:
+        logger.warning("Не знайдено військовослужбовців у записі %d. Текст: %s...", para_idx, paragraph_norm[:150])
+        return []
+
+    # --- Витягуємо локальні дані ТІЛЬКИ з цього абзацу --- 
+    # Використовуємо нову функцію для визначення локації
+    location_para = determine_paragraph_location(paragraph_norm, location_triggers)
+    # Логіка обробки якщо location_para None та використання location_preamble залишається
+
+    final_location = location_para or defaults.location # Пріоритет абзацу
+    logger.debug("Фінальна локація: %s", final_location)
+
+    # Тип ОС та місце прибуття (звідки, "який прибув з ...") - один раз на абзац
+    os_type, origin_location = _scan_paragraph_features(paragraph_norm)
+    if origin_location is not None:
+        logger.debug("Знайдено місце прибуття (з абзацу): %s", origin_location)
+    else:
+        origin_location = _UNKNOWN_ORIGIN
+
+    # Обробка знайдених осіб в абзаці
+    candidates = []
+    for person_data in military_persons_in_para:
+        rank = person_data['rank']
+        name = person_data['name']
+
+        logger.debug("Визначено тип ОС для %s %s: %s", rank, name, os_type)
+
+        # Створення запису
+        record = create_personnel_record(
+            rank=rank,
+            name=name,
+            vch=defaults.vch,        # ВЧ призначення (з преамбули)
+            location=final_location, # Локація (абзац/преамбула)
+            os_type=os_type,         # Тип ОС (з абзацу)
+            date_k=defaults.date,    # Дата (з преамбули)
+            meal=defaults.meal,      # Харчування (з преамбули)
+            # Додаємо місце прибуття до причини
+            cause=f"ППОС (прибув з: {origin_location})" 
+        )
+        candidates.append(((rank, name), record))
+    return candidates
+
+
 def process_mobilization(section_text, rank_map, location_triggers, default_date=None, default_meal=None, processed_persons=None):
     """
     Обробляє секцію з мобілізаційним призначенням та створює записи для кожного військовослужбовця.
@@ -27,7 +203,7 @@ def process_mobilization(section_text, rank_map, location_triggers, default_date
     Returns:
         list: Список записів про військовослужбовців
     """
-    print("\n=== Обробка мобілізаційного призначення (Paragraph Mode) ===")
+    logger.debug("=== Обробка мобілізаційного призначення (Paragraph Mode) ===")
     results = []
     if processed_persons is None:
         processed_persons = set()
@@ -35,129 +211,75 @@ def process_mobilization(section_text, rank_map, location_triggers, default_date
     # Спочатку обробляємо преамбулу секції для отримання загальних даних
     # Зазвичай це текст ДО першого нумерованого запису
     preamble_text = ""
-    first_entry_match = re.search(r'^\s*1\.\s+', section_text, re.MULTILINE)
-    if first_entry_match:
-        preamble_text = section_text[:first_entry_match.start()].strip()
+    first_entry_pos = _find_first_entry(section_text)
+    if first_entry_pos != -1:
+        preamble_text = section_text[:first_entry_pos].strip()
     else:
         preamble_text = section_text # Якщо немає нумерації, вся секція - преамбула?
-        print("УВАГА: Не знайдено початок нумерованого списку (1.), використовую весь текст як преамбулу.")
+        logger.warning("Не знайдено початок нумерованого списку (1.), використовую весь текст як преамбулу.")
 
-    print(f"Текст преамбули (перші 200): {preamble_text[:200]}...")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Текст преамбули (перші 200): %s...", preamble_text[:200])
     preamble_norm = normalize_text(preamble_text)
     
     # Витягуємо загальні дані з преамбули
-    vch_to = extract_military_unit(preamble_norm) or "А1890"
-    print(f"Військова частина призначення (з преамбули): {vch_to}")
+    vch_to = extract_military_unit(preamble_norm) or _DEFAULT_VCH
+    logger.debug("Військова частина призначення (з преамбули): %s", vch_to)
     
     # Загальна дата прибуття з преамбули
     arrival_date_preamble = extract_section_date(preamble_norm, default_date)
-    print(f"Загальна дата прибуття (з преамбули): {arrival_date_preamble}")
+    logger.debug("Загальна дата прибуття (з преамбули): %s", arrival_date_preamble)
 
     # Загальне харчування з преамбули
     meal_type_preamble, meal_date_preamble = extract_meal_info(preamble_norm, default_meal)
-    print(f"Загальне харчування (з преамбули): {meal_type_preamble}, дата: {meal_date_preamble}")
+    logger.debug("Загальне харчування (з преамбули): %s, дата: %s", meal_type_preamble, meal_date_preamble)
 
     # Загальна локація/НБ з преамбули
     location_preamble = extract_location(preamble_norm, location_triggers)
     if not location_preamble:
-        nb_match_preamble = re.search(r'(\d+)\s+навчального\s+батальйону', preamble_norm, re.IGNORECASE)
+        nb_match_preamble = _NB_PREAMBLE_RE.search(preamble_norm)
         if nb_match_preamble:
             location_preamble = f"{nb_match_preamble.group(1)} НБ"
-            print(f"Знайдено загальну локацію НБ (з преамбули): {location_preamble}")
+            logger.debug("Знайдено загальну локацію НБ (з преамбули): %s", location_preamble)
         else:
-            location_preamble = "НЦ" # Або ППД? Для мобілізації часто НЦ
-            print(f"Загальна локація не знайдена, встановлено за замовчуванням: {location_preamble}")
+            location_preamble = _DEFAULT_LOCATION # Або ППД? Для мобілізації часто НЦ
+            logger.debug("Загальна локація не знайдена, встановлено за замовчуванням: %s", location_preamble)
     else:
-        print(f"Знайдено загальну локацію за тригером (з преамбули): {location_preamble}")
+        logger.debug("Знайдено загальну локацію за тригером (з преамбули): %s", location_preamble)
 
     # --- Тепер обробляємо список осіб --- 
     # Використовуємо split_section_into_subsections, але вона може не спрацювати ідеально для мобілізації
     # Спробуємо інший підхід: розділити на абзаци після преамбули
     personnel_section_text = section_text[len(preamble_text):].strip()
-    # Розділяємо на абзаци за нумерацією "X." на початку рядка
-    paragraphs = []
-    current_paragraph = ""
-    # Використовуємо re.split для розділення за номерами, зберігаючи роздільники
-    # Це складно, спробуємо знайти кожен запис
-    entry_pattern = r'(^\s*\d+\.\s+.+?)(?=\n\s*\d+\.\s+|\nПідстава:|\Z)' # Знаходить кожен нумерований запис
-    paragraphs = re.findall(entry_pattern, personnel_section_text, re.MULTILINE | re.DOTALL)
-
-    print(f"Знайдено {len(paragraphs)} абзаців/записів мобілізованих")
-    
+    # Записи за нумерацією "X." на початку рядка обробляються по одному, по мірі нарізання
     total_found_overall = 0
-    
-    # Обробляємо кожен абзац/запис
-    for para_idx, paragraph_text in enumerate(paragraphs, 1):
-        print(f"\n   --- Абзац/Запис {para_idx} --- ")
-        print(f"   Текст (перші 100): {paragraph_text[:100]}...")
-        paragraph_norm = normalize_text(paragraph_text) # Нормалізуємо абзац
 
-        # Витягуємо військовослужбовців ТІЛЬКИ з цього абзацу
-        military_persons_in_para = extract_military_personnel(paragraph_text, rank_map)
-        print(f"      Знайдено {len(military_persons_in_para)} військовослужбовців в абзаці")
-
-        if not military_persons_in_para:
-            print(f"      УВАГА: Не знайдено військовослужбовців у записі {para_idx}. Текст: {paragraph_norm[:150]}...")
-            continue
-
-        # --- Витягуємо локальні дані ТІЛЬКИ з цього абзацу --- 
-        # Використовуємо нову функцію для визначення локації
-        location_para = determine_paragraph_location(paragraph_norm, location_triggers)
-        # Логіка обробки якщо location_para None та використання location_preamble залишається
-
-        final_location = location_para or location_preamble # Пріоритет абзацу
-        print(f"      Фінальна локація: {final_location}")
-
-        # Місце прибуття (звідки) - шукаємо "який прибув з ..."
-        origin_location = "Не вказано"
-        origin_match = re.search(r'який\s+прибув\s+з\s+(.*?)(?:;|\n|Підстава:|\Z)', paragraph_norm, re.IGNORECASE)
-        if origin_match:
-            origin_location = origin_match.group(1).strip()
-            print(f"      Знайдено місце прибуття (з абзацу): {origin_location}")
-
-        # Дата і харчування - зазвичай беруться з преамбули для мобілізації
-        final_date = meal_date_preamble or arrival_date_preamble
-        final_meal = meal_type_preamble or default_meal or "зі сніданку"
-        print(f"      Використано дату/харчування з преамбули: {final_date} / {final_meal}")
-
-        # Обробка знайдених осіб в абзаці
-        for person_data in military_persons_in_para:
-            rank = person_data['rank']
-            name = person_data['name']
-
-            # Тип ОС (з абзацу) - Пріоритет Курсант > Мобілізований
-            os_type = determine_personnel_type(paragraph_norm)
-            if "курсант" in paragraph_norm.lower(): # Перевіряємо знову на рівні абзацу
-                os_type = "Курсант"
-            elif "мобілізації" in paragraph_norm.lower(): # Забезпечуємо, що це мобілізований
-                os_type = "Мобілізований"
-            print(f"         Визначено тип ОС для {rank} {name}: {os_type}")
+    # Дата, харчування, ВЧ та локація - для мобілізації беруться з преамбули, однакові для всіх записів
+    defaults = RecordDefaults(
+        date=meal_date_preamble or arrival_date_preamble,
+        meal=meal_type_preamble or default_meal or _DEFAULT_MEAL,
+        vch=vch_to,
+        location=location_preamble,
+    )
+    logger.debug("Використано дату/харчування з преамбули: %s / %s", defaults.date, defaults.meal)
 
+    # Обробляємо кожен абзац/запис
+    para_idx = 0
+    for para_idx, paragraph_text in enumerate(_iter_entries(personnel_section_text), 1):
+        for person_id, record in _entry_records(para_idx, paragraph_text, rank_map, location_triggers, defaults):
             # Перевірка дублікатів
-            person_id = f"{rank}_{name}"
             if person_id in processed_persons:
-                print(f"      ⚠️ Виявлено дублікат (Mobilization): {rank} {name} - пропускаємо!")
+                logger.debug("Виявлено дублікат (Mobilization): %s %s - пропускаємо!", *person_id)
                 continue
 
-            # Створення запису
-            record = create_personnel_record(
-                rank=rank,
-                name=name,
-                vch=vch_to,              # ВЧ призначення (з преамбули)
-                location=final_location, # Локація (абзац/преамбула)
-                os_type=os_type,         # Тип ОС (з абзацу)
-                date_k=final_date,       # Дата (з преамбули)
-                meal=final_meal,         # Харчування (з преамбули)
-                # Додаємо місце прибуття до причини
-                cause=f"ППОС (прибув з: {origin_location})" 
-            )
-            
             results.append(record)
             processed_persons.add(person_id)
             total_found_overall += 1
-            print(f"      ✅ Додано запис (Mobilization): {rank} {name}, ВЧ: {record['VCH']}, Локація: {record['location']}, Причина: {record['cause']}")
+            logger.debug("Додано запис (Mobilization): %s %s, ВЧ: %s, Локація: %s, Причина: %s",
+                         record['rank'], record['name'], record['VCH'], record['location'], record['cause'])
 
-    print(f"\nЗагалом знайдено {total_found_overall} записів у секції 'Мобілізаційне призначення' (Paragraph Mode)")
+    logger.debug("Оброблено %d абзаців/записів мобілізованих", para_idx)
+    logger.info("Загалом знайдено %d записів у секції 'Мобілізаційне призначення' (Paragraph Mode)", total_found_overall)
     return results
 
 # --- Функція search_mob більше не потрібна, оскільки логіка інтегрована вище --- 
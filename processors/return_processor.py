@@ -2,13 +2,99 @@
 Модуль для обробки секцій, пов'язаних з поверненням з відрядження.
 """
 
+import logging
 import re
 from text_processing import normalize_text
-from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
-from military_personnel import extract_military_personnel, extract_military_unit, create_personnel_record, is_person_duplicate, determine_personnel_type
+from section_detection import extract_date_and_meal, split_section_into_subsections
+from military_personnel import extract_military_personnel, may_contain_personnel, extract_military_unit, create_personnel_record, RecordDefaults, is_person_duplicate, determine_personnel_type
 from utils import extract_location, determine_paragraph_location
 
-print("\n*** ENTERING process_return ***\n")
+logger = logging.getLogger(__name__)
+
+# Звідки повернувся: з рядка з датою ''DD'' або з кінця заголовка "з ...:"
+_ORIGIN_RE = re.compile(r'з\s+((?:військової\s+частини\s+[А-Я]\d{4})|[^,\n]+?)(?:,|\s+з\s+)?\'\'\d{1,2}\'\'', re.IGNORECASE)
+_SIMPLE_ORIGIN_RE = re.compile(r'з\s+(.*?):?$', re.IGNORECASE)
+
+# Значення полів, що повторюються в кожному записі.
+# Увага: ВЧ повернення історично записується латинською "A".
+_RETURN_VCH = "A1890"
+_DEFAULT_LOCATION = "ППД"
+
+
+def _paragraph_records(para_idx, paragraph_text, rank_map, location_triggers, defaults, origin):
+    """
+    Будує записи для одного абзацу повернення без перевірки дублікатів.
+
+    Args:
+        para_idx (int): Номер абзацу в підрозділі
+        paragraph_text (str): Текст абзацу (сирий)
+        rank_map (dict): Словник відповідності звань
+        location_triggers (dict): Словник тригерів локацій
+        defaults (RecordDefaults): Стандартні дата, харчування, ВЧ повернення та локація
+        origin (str): Звідки повернулись (з заголовка підсекції)
+
+    Returns:
+        list: [(person_id, запис)] у порядку появи в абзаці
+    """
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("--- Абзац %d ---", para_idx)
+        logger.debug("Текст абзацу (перші 100): %s...", paragraph_text[:100])
+
+    # Абзаци без жодного звання (примітки, заголовки) пропускаємо ще до нормалізації
+    if not may_contain_personnel(paragraph_text, rank_map):
+        logger.debug("Військовослужбовців в цьому абзаці не знайдено.")
+        return []
+
+    paragraph_norm = normalize_text(paragraph_text)
+
+    # --- Локальні дані з абзацу --- 
+    # Дата повернення та харчування
+    return_date, (meal_type, meal_date) = extract_date_and_meal(paragraph_norm, defaults.date, defaults.meal)
+    logger.debug("Дата повернення (з абзацу): %s", return_date)
+    logger.debug("Харчування (з абзацу): %s, дата: %s", meal_type, meal_date)
+    
+    # Локація повернення (зазвичай ППД)
+    location = determine_paragraph_location(paragraph_norm, location_triggers)
+    if not location:
+         location = defaults.location # Стандартно для повернення
+         logger.debug("Локація не знайдена ні за НБ, ні за тригером, встановлено за замовчуванням: %s", location)
+
+    # Військовослужбовці (з абзацу)
+    military_persons_in_para = extract_military_personnel(paragraph_text, rank_map)
+    logger.debug("Знайдено %d військовослужбовців в абзаці", len(military_persons_in_para))
+
+    if not military_persons_in_para:
+         logger.debug("Військовослужбовців в цьому абзаці не знайдено.")
+         return []
+
+    # Тип ОС, дата та харчування - однакові для всіх осіб абзацу
+    os_type = determine_personnel_type(paragraph_norm)
+    date_k = meal_date or return_date
+    meal = meal_type or defaults.meal
+    cause = f"Повернення з відрядження ({origin})"
+
+    candidates = []
+    for person_data in military_persons_in_para:
+        rank = person_data['rank']
+        name = person_data['name']
+
+        logger.debug("Визначено тип ОС для %s %s: %s", rank, name, os_type)
+
+        # Створення запису
+        record = create_personnel_record(
+            rank=rank,
+            name=name,
+            vch=defaults.vch, # Використовуємо ВЧ, КУДИ повернулись
+            location=location, # Локація з абзацу/стандартна
+            os_type=os_type, # OS з абзацу
+            date_k=date_k, # Дата з абзацу
+            meal=meal, # Харчування з абзацу
+            # Використовуємо origin, визначений для підсекції
+            cause=cause
+        )
+        candidates.append(((rank, name), record))
+    return candidates
+
 
 def process_return_from_assignment(section_text, rank_map, location_triggers, default_date=None, default_meal=None, processed_persons=None):
     """
@@ -26,102 +112,70 @@ def process_return_from_assignment(section_text, rank_map, location_triggers, de
     Returns:
         list: Список записів про військовослужбовців
     """
-    print("\n=== Обробка Повернення з відрядження (Paragraph Mode) ===")
+    logger.debug("=== Обробка Повернення з відрядження (Paragraph Mode) ===")
     results = []
     if processed_persons is None:
         processed_persons = set()
         
     # Розділяємо на підсекції та абзаци
     subsections_with_paragraphs = split_section_into_subsections(section_text)
-    print(f"Знайдено {len(subsections_with_paragraphs)} підрозділів повернення")
+    logger.debug("Знайдено %d підрозділів повернення", len(subsections_with_paragraphs))
     
     total_found_overall = 0
     
     # Головна ВЧ наказу (куди повертаються)
-    return_vch = "A1890" # Потрібно передавати або визначати з контексту наказу
-    print(f"Встановлено стандартну ВЧ повернення: {return_vch}")
+    return_vch = _RETURN_VCH # Потрібно передавати або визначати з контексту наказу
+    logger.debug("Встановлено стандартну ВЧ повернення: %s", return_vch)
+    defaults = RecordDefaults(date=default_date, meal=default_meal, vch=return_vch, location=_DEFAULT_LOCATION)
+
+    # Підсекції йдуть по порядку, тому заголовок кожної шукаємо від кінця попереднього,
+    # а не з початку всієї секції
+    search_cursor = 0
 
     for i, (subsection_number, paragraphs) in enumerate(subsections_with_paragraphs, 1):
-        print(f"\n-- Обробка підрозділу повернення {subsection_number or 'Без номера'} --")
-        print(f"Кількість абзаців: {len(paragraphs)}")
+        logger.debug("-- Обробка підрозділу повернення %s --", subsection_number or 'Без номера')
+        logger.debug("Кількість абзаців: %d", len(paragraphs))
 
         # Визначаємо "звідки" повернулись для цієї підсекції (з заголовка/першого абзацу)
         origin = "Unknown Origin" 
         if paragraphs:
              # Шукаємо в заголовку або першому абзаці щось типу "з [Місце/ВЧ]"
-             header_text_search_area = section_text[section_text.find(subsection_number if subsection_number else '') : section_text.find(paragraphs[0])] if subsection_number else paragraphs[0]
-             origin_match = re.search(r'з\s+((?:військової\s+частини\s+[А-Я]\d{4})|[^,\n]+?)(?:,|\s+з\s+)?\'\'\d{1,2}\'\'', header_text_search_area, re.IGNORECASE)
+             if subsection_number:
+                 number_pos = section_text.find(subsection_number, search_cursor)
+                 if number_pos == -1:
+                     number_pos = section_text.find(subsection_number)
+                 paragraph_pos = section_text.find(paragraphs[0], max(number_pos, 0))
+                 if paragraph_pos != -1:
+                     search_cursor = paragraph_pos
+                 header_text_search_area = section_text[number_pos:paragraph_pos]
+             else:
+                 header_text_search_area = paragraphs[0]
+             origin_match = _ORIGIN_RE.search(header_text_search_area)
              if origin_match:
                  origin = origin_match.group(1).strip()
-                 print(f"   Визначено походження для підрозділу: {origin}")
+                 logger.debug("Визначено походження для підрозділу: %s", origin)
              else:
                  # Спробуємо знайти просто "з [Місце/ВЧ]:" в кінці заголовка
-                 simple_origin_match = re.search(r'з\s+(.*?):?$', header_text_search_area.strip(), re.IGNORECASE)
+                 simple_origin_match = _SIMPLE_ORIGIN_RE.search(header_text_search_area.strip())
                  if simple_origin_match:
                      origin = simple_origin_match.group(1).strip()
-                     print(f"   Визначено походження для підрозділу (простий): {origin}")
+                     logger.debug("Визначено походження для підрозділу (простий): %s", origin)
                  else:
-                     print(f"   УВАГА: Не вдалося визначити походження для підрозділу {subsection_number}")
+                     logger.warning("Не вдалося визначити походження для підрозділу %s", subsection_number)
         
-        # Обробка кожного абзацу
         for para_idx, paragraph_text in enumerate(paragraphs, 1):
-            print(f"\n   --- Абзац {para_idx} --- ")
-            print(f"   Текст абзацу (перші 100): {paragraph_text[:100]}..." )
-            paragraph_norm = normalize_text(paragraph_text)
-
-            # --- Локальні дані з абзацу --- 
-            # Дата повернення
-            return_date = extract_section_date(paragraph_norm, default_date)
-            print(f"      Дата повернення (з абзацу): {return_date}")
-            
-            # Харчування
-            meal_type, meal_date = extract_meal_info(paragraph_norm, default_meal)
-            print(f"      Харчування (з абзацу): {meal_type}, дата: {meal_date}")
-            
-            # Локація повернення (зазвичай ППД)
-            location = determine_paragraph_location(paragraph_norm, location_triggers)
-            if not location:
-                 location = "ППД" # Стандартно для повернення
-                 print(f"      Локація не знайдена ні за НБ, ні за тригером, встановлено за замовчуванням: {location}")
-
-            # Військовослужбовці (з абзацу)
-            military_persons_in_para = extract_military_personnel(paragraph_text, rank_map)
-            print(f"      Знайдено {len(military_persons_in_para)} військовослужбовців в абзаці")
-
-            for person_data in military_persons_in_para:
-                rank = person_data['rank']
-                name = person_data['name']
-
-                # Тип ОС (з абзацу)
-                os_type = determine_personnel_type(paragraph_norm)
-                print(f"         Визначено тип ОС для {rank} {name}: {os_type}")
-
+            candidates = _paragraph_records(para_idx, paragraph_text, rank_map, location_triggers, defaults, origin)
+            for person_id, record in candidates:
                 # Перевірка дублікатів
-                person_id = f"{rank}_{name}"
                 if person_id in processed_persons:
-                    print(f"      ⚠️ Виявлено дублікат (Return): {rank} {name} - пропускаємо!")
+                    logger.debug("Виявлено дублікат (Return): %s %s - пропускаємо!", *person_id)
                     continue
-                
-                # Створення запису
-                record = create_personnel_record(
-                    rank=rank,
-                    name=name,
-                    vch=return_vch, # Використовуємо ВЧ, КУДИ повернулись
-                    location=location, # Локація з абзацу/стандартна
-                    os_type=os_type, # OS з абзацу
-                    date_k=meal_date or return_date, # Дата з абзацу
-                    meal=meal_type or default_meal, # Харчування з абзацу
-                    # Використовуємо origin, визначений для підсекції
-                    cause=f"Повернення з відрядження ({origin})" 
-                )
-                
+
                 results.append(record)
                 processed_persons.add(person_id)
                 total_found_overall += 1
-                print(f"      ✅ Додано запис (Return): {rank} {name}, ВЧ: {record['VCH']}, Локація: {record['location']}, Причина: {record['cause']}")
-
-            if not military_persons_in_para:
-                 print(f"      Військовослужбовців в цьому абзаці не знайдено.")
+                logger.debug("Додано запис (Return): %s %s, ВЧ: %s, Локація: %s, Причина: %s",
+                             record['rank'], record['name'], record['VCH'], record['location'], record['cause'])
 
-    print(f"\nЗагалом знайдено {total_found_overall} записів у секції 'Повернення з відрядження' (Paragraph Mode)")
+    logger.info("Загалом знайдено %d записів у секції 'Повернення з відрядження' (Paragraph Mode)", total_found_overall)
     return results 
\ No newline at end of file
@@ -3,16 +3,171 @@
 Знаходить пункти про самовільне залишення частини та витягує з них інформацію.
 """
 
+import logging
 import re
+from bisect import bisect_left, insort
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain
 import json
 import time  # Додаємо імпорт time
 
 from text_processing import normalize_text
-from utils import parse_date
+from utils import parse_date_parts
 from military_personnel import extract_military_personnel, extract_military_unit
 from section_detection import extract_meal_info, extract_section_date
 
+logger = logging.getLogger(__name__)
+
+# Пункт "5. Солдата за призовом ... ПІБ" (прізвища можуть бути великими літерами)
+_POINT_RE = re.compile(r'(\d+)\.\s+([А-ЯІЇЄa-яіїє\s]+?)\s+([А-ЯІЇЄ][А-ЯІЇЄа-яіїє\']*(?:\s+[А-ЯІЇЄа-яіїє][А-ЯІЇЄа-яіїє\']*){1,2})')
+# Альтернативний: прізвище повністю великими літерами
+_ALT_POINT_RE = re.compile(r'(\d+)\.\s+([А-ЯІЇЄa-яіїє\s]+?)\s+([А-ЯІЇЄ]+)\s+([А-ЯІЇЄ][а-яіїє\']+\s+[А-ЯІЇЄ][а-яіїє\']+)')
+# Номер наступного пункту з нового рядка; випереджувальна перевірка дає всі можливі
+# початки межі, зокрема ті, що перекриваються (як при пошуку з довільної позиції)
+_NEXT_POINT_STARTS_RE = re.compile(r'(?=\n\s*\d+\.\s+)')
+_NUMBERED_POINTS_RE = re.compile(r'(\d+)\.\s+') # Спрощений: тільки номер і крапка
+_NUMBER_RE = re.compile(r'\d+\.\s+')
+
+# Формати дати самовільного залишення, у порядку пріоритету
+_DATE_PATTERNS = [
+    # Формат: з "10" серпня 2023 року
+    (re.compile(r"з\s+(?:'|\")(\d{1,2})(?:'|\") \s*(\w+)\s+(\d{4})\s+року"), "з 'DD' місяць YYYY року"),
+    # Формат: "10" серпня 2023
+    (re.compile(r"(?:'|\")(\d{1,2})(?:'|\") \s*(\w+)\s+(\d{4})"), "'DD' місяць YYYY"),
+    # Формат: 10 серпня 2023 року
+    (re.compile(r"(\d{1,2})\s+(\w+)\s+(\d{4})\s+року"), "DD місяць YYYY року"),
+    # Формат: з 10 серпня 2023
+    (re.compile(r"з\s+(\d{1,2})\s+(\w+)\s+(\d{4})"), "з DD місяць YYYY"),
+    # Формат: 10.08.2023
+    (re.compile(r"(\d{1,2})\.(\d{1,2})\.(\d{4})"), "DD.MM.YYYY"),
+]
+_COMPLEX_DATE_RE = re.compile(r"самовільно залишив.*?(\d{1,2})[\s\.]+(\w+)[\s\.]+(\d{4})", re.IGNORECASE | re.DOTALL)
+_LOC_NB_RE = re.compile(r'(\d+)\s*навчальн(?:ого|ий)\s*батальйон', re.IGNORECASE)
+
+# Постійні значення полів запису СЗЧ. Запис лишається словником: main.py доповнює
+# та змінює його поля ('cause', 'name_normal') і будує з результатів pd.DataFrame.
+# ВЧ за замовчуванням тут історично латинською "A".
+_SZCH_DEFAULT_VCH = 'A1890'
+_SZCH_DEFAULT_MEAL = 'зі сніданку'
+_SZCH_CAUSE = 'СЗЧ'
+_SZCH_ACTION = 'виключити'
+
+# Ключові слова, що підтверджують секцію/пункт СЗЧ (у нижньому регістрі)
+_SZCH_KEYWORDS = (
+    "самовільним залишенням",
+    "виключити з усіх видів забезпечення",
+    "самовільним залишенням частини",
+    "самовільним залишенням лікувального закладу",
+)
+
+# Ключові фрази пошуку секцій СЗЧ
+_SZCH_KEYS = (
+    "самовільним залишенням частини", 
+    "самовільним залишенням лікувального закладу", 
+    "самовільне залишення",
+    "самовільно залишив",
+    "самовільно залишивши",
+    "залишенням частини", 
+    "залишенням лікувального",
+    "виключити з усіх видів забезпечення",
+    "виключити з котлового забезпечення",
+    "виключити зі всіх видів забезпечення",
+    "виключити з забезпечення",
+    "у зв'язку з самовільним",
+    "вважати таким, що самовільно залишив"
+)
+_SZCH_KEYS_LOWER = tuple(key.lower() for key in _SZCH_KEYS)
+_SZCH_KEY_RES = [(key, re.compile(key, re.IGNORECASE)) for key in _SZCH_KEYS]
+
+# Попередній фільтр документа та пунктів (по тексту в нижньому регістрі): кожна ознака СЗЧ
+# (ключі, фрази, додаткові шаблони, діагностика "виключ"/"самовільн") містить одну з цих частин
+_SZCH_INDICATORS_RE = re.compile(r'самовільн|виключ|залишенням частини|залишенням лікувального')
+
+# Ознаки звичайного вибуття (не СЗЧ), у нижньому регістрі
+_DEPARTURE_INDICATORS = (
+    "виключити зі списків особового складу",
+    "вважати такими, що справи і посаду здали",
+    "вважати такими, що справи і посаду здав",
+    "для подальшого проходження служби",
+    "вибули в розпорядження",
+    "вибув до нового місця служби",
+    "розпорядження начальника генерального штабу"
+)
+# Загальніші шаблони для додаткового пошуку
+_SZCH_PATTERNS = [
+    (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+        r'виключити\s+з\s+(?:усіх|всіх|котлового)\s+видів\s+забезпечення',
+        r'самовільн[а-яіїєґ]+\s+залиш[а-яіїєґ]+',
+        r'у\s+зв\'язку\s+з\s+самовільн[а-яіїєґ]+'
+    )
+]
+
+
+
+def _has_phrase_near(text, first, second, max_gap):
+    """
+    Перевіряє, чи після `first` у тому ж рядку через 1..max_gap символів іде `second`.
+    Еквівалент re.search(first + '.{1,max_gap}' + second, text), але через str.find.
+
+    Args:
+        text (str): Текст для перевірки
+        first (str): Перша частина фрази
+        second (str): Друга частина фрази
+        max_gap (int): Максимальна кількість символів між частинами
+
+    Returns:
+        bool: True, якщо фразу знайдено
+    """
+    idx = text.find(first)
+    while idx != -1:
+        gap_start = idx + len(first)
+        limit = gap_start + max_gap + len(second)
+        line_end = text.find('\n', gap_start, limit)
+        if line_end != -1:
+            limit = line_end
+        if text.find(second, gap_start + 1, limit) != -1:
+            return True
+        idx = text.find(first, idx + 1)
+    return False
+
+
+def _is_near_position(positions, position, distance):
+    """
+    Перевіряє, чи є у відсортованому списку позиція ближче ніж distance до заданої.
+
+    Args:
+        positions (list): Відсортований список позицій
+        position (int): Позиція для перевірки
+        distance (int): Відстань (строго менше), за якої позиції вважаються близькими
+
+    Returns:
+        bool: True, якщо знайдено близьку позицію
+    """
+    index = bisect_left(positions, position)
+    if index < len(positions) and positions[index] - position < distance:
+        return True
+    return index > 0 and position - positions[index - 1] < distance
+
+
+@lru_cache(maxsize=4)
+def _rank_matcher(rank_keys):
+    """
+    Компілює один шаблон-альтернацію з усіх звань (у нижньому регістрі),
+    щоб наявність будь-якого звання перевірялася одним проходом по тексту.
+
+    Args:
+        rank_keys (tuple): Форми звань (ключі rank_map)
+
+    Returns:
+        re.Pattern: Шаблон для пошуку в тексті, зведеному до нижнього регістру
+    """
+    ranks_lower = sorted({rank.lower() for rank in rank_keys}, key=len, reverse=True)
+    if not ranks_lower:
+        return re.compile(r'(?!)') # Без звань нічого не збігається
+    return re.compile('|'.join(map(re.escape, ranks_lower)))
+
+
 def process_szch_section(text, rank_map, location_triggers=None, processed_persons=None):
     """
     Обробляє секцію про самовільне залишення частини (СЗЧ).
@@ -30,53 +185,56 @@ def process_szch_section(text, rank_map, location_triggers=None, processed_perso
     
     # Перевірка мінімальної довжини тексту
     if len(text.strip()) < 10:  # Мінімальна довжина для обробки
-        print(f"  Text is too short for processing: {len(text.strip())} characters")
+        logger.debug("Text is too short for processing: %s characters", len(text.strip()))
         return results
     
-    # Перевірка на наявність ключових слів СЗЧ - розширюємо список для відповідності з find_szch_sections
-    szch_keywords = ["самовільним залишенням", "виключити з усіх видів забезпечення", 
-                     "самовільним залишенням частини", "самовільним залишенням лікувального закладу"]
-    
     # Додаємо детальну діагностику для кращого налагодження
-    print(f"  Повний текст секції для аналізу СЗЧ ({len(text)} символів): {text[:200]}...")
-    
-    szch_keyword_found = False
-    for keyword in szch_keywords:
-        if keyword in text.lower():
-            szch_keyword_found = True
-            print(f"  Знайдено ключове слово СЗЧ: '{keyword}'")
-            break
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Повний текст секції для аналізу СЗЧ (%s символів): %s...", len(text), text[:200])
     
-    if not szch_keyword_found:
-        print(f"  Section text does not contain any СЗЧ keywords, skipping.")
+    # Перевірка на наявність ключових слів СЗЧ (текст переводиться в нижній регістр один раз)
+    text_lower = text.lower()
+    szch_keyword = next((keyword for keyword in _SZCH_KEYWORDS if keyword in text_lower), None)
+    if szch_keyword:
+        logger.debug("Знайдено ключове слово СЗЧ: '%s'", szch_keyword)
+    else:
+        logger.debug("Section text does not contain any СЗЧ keywords, skipping.")
         return results
     
     if processed_persons is None:
         processed_persons = set()
     
-    print("\n--- Entering process_szch_section ---")
-    print(f"  Input text (first 300 chars): {text[:300]}...")
-    print(f"  Input text length: {len(text)}")
+    logger.debug("--- Entering process_szch_section ---")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Input text (first 300 chars): %s...", text[:300])
+        logger.debug("Input text length: %s", len(text))
     
     # Ділимо на пункти, які починаються з номера та крапки
     # Шукаємо пункти типу "5. Солдата за призовом..."
     # Оновлений паттерн, який враховує прізвища написані великими літерами і різні формати ПІБ
-    point_pattern = r'(\d+)\.\s+([А-ЯІЇЄa-яіїє\s]+?)\s+([А-ЯІЇЄ][А-ЯІЇЄа-яіїє\']*(?:\s+[А-ЯІЇЄа-яіїє][А-ЯІЇЄа-яіїє\']*){1,2})'
-    print(f"  Using main point_pattern: '{point_pattern}'")
+    logger.debug("Using main point_pattern: '%s'", _POINT_RE.pattern)
     
-    # Знаходимо всі пункти
-    szch_points = list(re.finditer(point_pattern, text))
-    print(f"  Found {len(szch_points)} points with main pattern.")
+    # Пункти обробляються по мірі знаходження; перший збіг визначає, який паттерн використати
+    point_pattern = _POINT_RE
+    first_point = _POINT_RE.search(text)
     
-    if not szch_points:
+    if first_point is None:
         # Альтернативний паттерн для випадку коли прізвище повністю великими літерами
-        alt_point_pattern = r'(\d+)\.\s+([А-ЯІЇЄa-яіїє\s]+?)\s+([А-ЯІЇЄ]+)\s+([А-ЯІЇЄ][а-яіїє\']+\s+[А-ЯІЇЄ][а-яіїє\']+)'
-        print(f"  Using alternative point_pattern: '{alt_point_pattern}'")
-        szch_points = list(re.finditer(alt_point_pattern, text))
-        print(f"  Found {len(szch_points)} points with alternative pattern.")
+        logger.debug("No points with main pattern, using alternative point_pattern: '%s'", _ALT_POINT_RE.pattern)
+        point_pattern = _ALT_POINT_RE
+        first_point = _ALT_POINT_RE.search(text)
     
-    for i, point_match in enumerate(szch_points):
-        print(f"\n  --- Processing Point Match #{i+1} ---")
+    if first_point is not None:
+        szch_points = chain((first_point,), point_pattern.finditer(text, first_point.end()))
+        # Межі наступних пунктів знаходимо один раз для всього тексту
+        next_point_starts = [m.start() for m in _NEXT_POINT_STARTS_RE.finditer(text)]
+    else:
+        szch_points = ()
+        next_point_starts = []
+    points_count = 0
+
+    for points_count, point_match in enumerate(szch_points, 1):
+        logger.debug("--- Processing Point Match #%s ---", points_count)
         point_num = point_match.group(1)
         rank_text = point_match.group(2).strip()
         
@@ -85,27 +243,27 @@ def process_szch_section(text, rank_map, location_triggers=None, processed_perso
             surname = point_match.group(3)
             name_patronymic = point_match.group(4)
             name_start = f"{surname} {name_patronymic}"
-            print(f"  Detected alternative pattern match.")
+            logger.debug("Detected alternative pattern match.")
         else:  # основний паттерн
             name_start = point_match.group(3)
-            print(f"  Detected main pattern match.")
+            logger.debug("Detected main pattern match.")
         
-        print(f"  Extracted point num: '{point_num}'")
-        print(f"  Extracted rank_text: '{rank_text}'")
-        print(f"  Extracted name_start: '{name_start}'")
+        logger.debug("Extracted point num: '%s'", point_num)
+        logger.debug("Extracted rank_text: '%s'", rank_text)
+        logger.debug("Extracted name_start: '%s'", name_start)
         
         # Початок тексту пункту
         point_start_idx = point_match.start()
         
         # Знаходимо кінець пункту (початок наступного пункту або кінець тексту)
         # next_point_pattern = r'\d+\.\s+[А-ЯІЇЄa-яіїє\s]+' # Original - might be too restrictive
-        next_point_pattern = r'\n\s*\d+\.\s+' # Змінений паттерн - шукаємо номер з новою лінією
-        next_point_match = re.search(next_point_pattern, text[point_start_idx + 1:])
+        # Номер з нової лінії: найближча межа після початку пункту
+        next_point_idx = bisect_left(next_point_starts, point_start_idx + 1)
         
-        if next_point_match:
-            point_end_idx = point_start_idx + 1 + next_point_match.start()
+        if next_point_idx < len(next_point_starts):
+            point_end_idx = next_point_starts[next_point_idx]
             point_text = text[point_start_idx:point_end_idx]
-            print(f"  Point end found using next point pattern at rel pos {next_point_match.start()}")
+            logger.debug("Point end found using next point pattern at rel pos %s", point_end_idx - point_start_idx - 1)
         else:
             # Шукаємо інші маркери кінця пункту
             end_markers = ["Підстава:", "\nПідстава:"]
@@ -119,81 +277,66 @@ def process_szch_section(text, rank_map, location_triggers=None, processed_perso
             
             if end_idx:
                 point_text = text[point_start_idx:end_idx]
-                print(f"  Point end found using end marker at position {end_idx - point_start_idx}")
+                logger.debug("Point end found using end marker at position %s", end_idx - point_start_idx)
             else:
                 point_text = text[point_start_idx:]
-                print(f"  Next point pattern not found, taking text to the end.")
-        print(f"  Extracted point_text (first 200): {point_text[:200]}...")
-        print(f"  Extracted point_text length: {len(point_text)}")
+                logger.debug("Next point pattern not found, taking text to the end.")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Extracted point_text (first 200): %s...", point_text[:200])
+            logger.debug("Extracted point_text length: %s", len(point_text))
         
         # Перевіряємо чи дійсно цей пункт стосується СЗЧ
-        point_szch_keyword_found = False
-        found_keyword = "None"
-        for keyword in szch_keywords:
-            if keyword in point_text.lower():
-                point_szch_keyword_found = True
-                found_keyword = keyword
-                # print(f"  Found keyword '{keyword}' in point {point_num}") # Reduced verbosity
-                break
-        print(f"  SZCH keyword check in point_text: Found='{point_szch_keyword_found}', Keyword='{found_keyword}'")
+        point_text_lower = point_text.lower()
+        point_keyword = next((keyword for keyword in _SZCH_KEYWORDS if keyword in point_text_lower), None)
+        logger.debug("SZCH keyword check in point_text: Found='%s', Keyword='%s'", point_keyword is not None, point_keyword or "None")
                 
-        if not point_szch_keyword_found:
-            print(f"  Point {point_num} is not about unauthorized absence (based on keywords), skipping processing.")
+        if not point_keyword:
+            logger.debug("Point %s is not about unauthorized absence (based on keywords), skipping processing.", point_num)
             continue
         
-        print(f"  Point {point_num} confirmed as СЗЧ, extracting personnel info...")
+        logger.debug("Point %s confirmed as СЗЧ, extracting personnel info...", point_num)
+        # Статус особи однаковий для всіх осіб пункту - курсант чи постійний склад
+        personnel_status = "Курсант" if "курсант" in point_text_lower else "Постійний склад"
         
         # Витягуємо інформацію про військовослужбовця
         # Створюємо новий текст з рангом і ПІБ + додаємо весь текст пункту для контексту
         combined_text = f"{rank_text} {name_start}. {point_text}"
         # print(f"  Calling extract_military_personnel with combined_text (len={len(combined_text)}):
         #    {combined_text[:200]}...") # Multiline print causes issues - REMOVING THIS COMMENT
-        print(f"  Calling extract_military_personnel with combined_text snippet (len={len(combined_text)}): {combined_text[:200]}...")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Calling extract_military_personnel with combined_text snippet (len=%s): %s...", len(combined_text), combined_text[:200])
         personnel_info = extract_military_personnel(combined_text, rank_map)
-        print(f"  Result from extract_military_personnel: {personnel_info}")
+        logger.debug("Result from extract_military_personnel: %s", personnel_info)
         
         if not personnel_info:
-            print(f"  Warning: Could not extract personnel info from point {point_num}, skipping point.")
+            logger.warning("Could not extract personnel info from point %s, skipping point.", point_num)
             continue
         
         for person in personnel_info:
             # Використовуємо поля 'rank' і 'name' замість 'lastname', 'firstname', 'patronymic'
-            person_id = f"{person['rank']}_{person['name']}"
-            print(f"    Processing extracted person: {person_id}")
+            person_id = (person['rank'], person['name'])
+            logger.debug("Processing extracted person: %s %s", person['rank'], person['name'])
             
             if person_id in processed_persons:
-                print(f"    Person {person_id} already processed, skipping")
+                logger.debug("Person %s %s already processed, skipping", person['rank'], person['name'])
                 continue
             
             processed_persons.add(person_id)
             
             # Витягуємо додаткову інформацію
-            print(f"    Extracting military unit from point_text...")
+            logger.debug("Extracting military unit from point_text...")
             military_unit = extract_military_unit(point_text)
-            print(f"    Extracted military_unit: {military_unit}")
+            logger.debug("Extracted military_unit: %s", military_unit)
             
             # Витягуємо дату самовільного залишення
-            print(f"    Extracting departure date from point_text...")
-            
-            # Спробуємо знайти дату в різних форматах
-            date_patterns = [
-                # Формат: з "10" серпня 2023 року
-                (r"з\s+(?:'|\")(\d{1,2})(?:'|\") \s*(\w+)\s+(\d{4})\s+року", "з 'DD' місяць YYYY року"),
-                # Формат: "10" серпня 2023
-                (r"(?:'|\")(\d{1,2})(?:'|\") \s*(\w+)\s+(\d{4})", "'DD' місяць YYYY"),
-                # Формат: 10 серпня 2023 року
-                (r"(\d{1,2})\s+(\w+)\s+(\d{4})\s+року", "DD місяць YYYY року"),
-                # Формат: з 10 серпня 2023
-                (r"з\s+(\d{1,2})\s+(\w+)\s+(\d{4})", "з DD місяць YYYY"),
-                # Формат: 10.08.2023
-                (r"(\d{1,2})\.(\d{1,2})\.(\d{4})", "DD.MM.YYYY")
-            ]
+            logger.debug("Extracting departure date from point_text...")
             
+            # Спробуємо знайти дату в різних форматах (_DATE_PATTERNS)
             departure_date = None
             date_pattern_used = "None"
             
-            for pattern, pattern_name in date_patterns:
-                date_match = re.search(pattern, point_text)
+            for pattern, pattern_name in _DATE_PATTERNS:
+                date_match = pattern.search(point_text)
                 if date_match:
                     date_pattern_used = pattern_name
                     
@@ -207,43 +350,32 @@ def process_szch_section(text, rank_map, location_triggers=None, processed_perso
                             departure_date = datetime(year, month, day).strftime("%d.%m.%Y")
                             break
                         except (ValueError, IndexError):
-                            print(f"    Failed to parse date in DD.MM.YYYY format: {date_match.group(0)}")
+                            logger.warning("Failed to parse date in DD.MM.YYYY format: %s", date_match.group(0))
                     else:
                         # Формати з назвою місяця
-                        try:
-                            date_str = f"{date_match.group(1)} {date_match.group(2)} {date_match.group(3)}"
-                            departure_date = parse_date(date_str)
-                            if departure_date:
-                                break
-                        except (ValueError, IndexError):
-                            print(f"    Failed to parse date: {date_match.group(0)}")
+                        departure_date = parse_date_parts(date_match.group(1), date_match.group(2), date_match.group(3))
+                        if departure_date:
+                            break
             
-            print(f"    Departure date extraction: Pattern='{date_pattern_used}', Date='{departure_date}'")
+            logger.debug("Departure date extraction: Pattern='%s', Date='%s'", date_pattern_used, departure_date)
             
             # Додаткова перевірка для випадків, коли дату не знайдено
             if not departure_date:
                 # Шукаємо дату в більш складних конструкціях
-                complex_date_match = re.search(r"самовільно залишив.*?(\d{1,2})[\s\.]+(\w+)[\s\.]+(\d{4})", point_text, re.IGNORECASE | re.DOTALL)
+                complex_date_match = _COMPLEX_DATE_RE.search(point_text)
                 if complex_date_match:
-                    try:
-                        date_str = f"{complex_date_match.group(1)} {complex_date_match.group(2)} {complex_date_match.group(3)}"
-                        departure_date = parse_date(date_str)
-                        date_pattern_used = "complex pattern (after 'самовільно залишив')"
-                        print(f"    Found date using complex pattern: {departure_date}")
-                    except (ValueError, IndexError):
-                        print(f"    Failed to parse date from complex pattern")
+                    departure_date = parse_date_parts(*complex_date_match.group(1, 2, 3))
+                    date_pattern_used = "complex pattern (after 'самовільно залишив')"
+                    logger.debug("Found date using complex pattern: %s", departure_date)
             
             # Витягуємо інформацію про котлове забезпечення
-            print(f"    Extracting meal info from point_text...")
+            logger.debug("Extracting meal info from point_text...")
             meal_info, meal_date = extract_meal_info(point_text)
-            print(f"    Extracted meal info: '{meal_info}', Meal date: '{meal_date}'")
-            
-            # Визначаємо статус особи - курсант чи постійний склад
-            personnel_status = "Курсант" if "курсант" in point_text.lower() else "Постійний склад"
+            logger.debug("Extracted meal info: '%s', Meal date: '%s'", meal_info, meal_date)
             
             # Визначаємо місце розташування - шукаємо згадки про навчальні батальйони
             location = "ППД"  # За замовчуванням
-            match_nb = re.search(r'(\d+)\s*навчальн(?:ого|ий)\s*батальйон', point_text, re.IGNORECASE)
+            match_nb = _LOC_NB_RE.search(point_text)
             if match_nb:
                 nb_number = match_nb.group(1)
                 location = f"{nb_number} НБ"
@@ -257,19 +389,21 @@ def process_szch_section(text, rank_map, location_triggers=None, processed_perso
                 "rank": person["rank"],
                 "name": person["name"],
                 "name_normal": '',  # Заповнюється пізніше в main.py
-                "VCH": military_unit or 'A1890',
+                "VCH": military_unit or _SZCH_DEFAULT_VCH,
                 "location": location,
                 "OS": personnel_status,
                 "date_k": effective_date,
-                "meal": meal_info or 'зі сніданку',
-                "cause": 'СЗЧ',
-                "action": 'виключити'  # Додаємо поле 'action' зі значенням 'виключити'
+                "meal": meal_info or _SZCH_DEFAULT_MEAL,
+                "cause": _SZCH_CAUSE,
+                "action": _SZCH_ACTION  # Додаємо поле 'action' зі значенням 'виключити'
             }
             
             results.append(record)
-            print(f"    >>> Successfully processed and appended SZCH record for: {person['rank']} {person['name']}")
+            logger.debug(">>> Successfully processed and appended SZCH record for: %s %s", person['rank'], person['name'])
     
-    print(f"--- Exiting process_szch_section --- Total records: {len(results)} ---")
+    logger.debug("Processed %s points with %s pattern.", points_count, "main" if point_pattern is _POINT_RE else "alternative")
+    logger.info("Загалом знайдено %d записів СЗЧ", len(results))
+    logger.debug("--- Exiting process_szch_section ---")
     return results
 
 
@@ -284,7 +418,7 @@ def find_szch_sections(text, rank_map):
     Returns:
         list: Список кортежів (тип_секції, текст_секції, початкова_позиція)
     """
-    print("START find_szch_sections: Починаємо пошук СЗЧ секцій...")
+    logger.debug("START find_szch_sections: Починаємо пошук СЗЧ секцій...")
     
     # Збільшуємо часове обмеження на виконання функції
     start_time = time.time()
@@ -292,84 +426,95 @@ def find_szch_sections(text, rank_map):
     
     sections = []
     # Для запобігання нескінченних циклів - зберігаємо позиції вже доданих секцій
-    added_positions = set()
-    
-    # Отримуємо список всіх звань з rank_map
-    ranks = list(rank_map.keys())
-    
-    # Розширюємо список ключових слів для кращого пошуку СЗЧ
-    szch_keys = [
-        "самовільним залишенням частини", 
-        "самовільним залишенням лікувального закладу", 
-        "самовільне залишення",
-        "самовільно залишив",
-        "самовільно залишивши",
-        "залишенням частини", 
-        "залишенням лікувального",
-        "виключити з усіх видів забезпечення",
-        "виключити з котлового забезпечення",
-        "виключити зі всіх видів забезпечення",
-        "виключити з забезпечення",
-        "у зв'язку з самовільним",
-        "вважати таким, що самовільно залишив"
-    ]
+    # Множина - для перевірки точного збігу, відсортований список - для пошуку сусідніх через bisect
+    added_position_set = set()
+    added_positions = []
     
     # Перевірка часового обмеження
     def time_limit_reached():
         elapsed = time.time() - start_time
         if elapsed > max_execution_time:
-            print(f"WARNING: Time limit of {max_execution_time} seconds reached in find_szch_sections. Stopping search.")
+            logger.warning("Time limit of %s seconds reached in find_szch_sections. Stopping search.", max_execution_time)
             return True
         return False
     
     # Збільшуємо розмір тексту для пошуку
     max_search_length = 100000  # Збільшуємо максимальний розмір тексту для пошуку
-    search_text = text[:min(len(text), max_search_length)]
-    print(f"Searching for СЗЧ in the first {len(search_text)} characters of text")
+    # Текст не копіюється: пошук обмежується через endpos, зрізи беруться в межах search_end
+    search_text = text
+    search_end = min(len(text), max_search_length)
+    logger.debug("Searching for СЗЧ in the first %s characters of text", search_end)
+
+    # Текст у нижньому регістрі обчислюється один раз; фрагменти беруться зрізами з нього.
+    # Якщо lower() змінив довжину (рідкісні символи), позиції не збігаються - тоді зводимо кожен фрагмент окремо.
+    search_text_lower = search_text[:search_end].lower()
+    lower_offsets_match = len(search_text_lower) == search_end
+
+    def lower_slice(start, end):
+        if lower_offsets_match:
+            return search_text_lower[start:end]
+        return search_text[start:end].lower()
+
+    # Знайдені входження звань (початок, кінець) для додаткових пошуків: їхні вікна контексту
+    # сильно перекриваються, тож вікно, що вже містить знайдене звання, повторно не скануємо
+    rank_hits = []
+
+    def window_has_rank(rank_re, start, end):
+        if lower_offsets_match:
+            index = bisect_left(rank_hits, (start,))
+            while index < len(rank_hits) and rank_hits[index][0] < end:
+                if rank_hits[index][1] <= end:
+                    return True
+                index += 1
+        rank_match = rank_re.search(lower_slice(start, end))
+        if rank_match is None:
+            return False
+        if lower_offsets_match:
+            insort(rank_hits, (start + rank_match.start(), start + rank_match.end()))
+        return True
+
+    # Документ без жодної ознаки СЗЧ не потребує пошуку по пунктах
+    if not _SZCH_INDICATORS_RE.search(search_text_lower):
+        logger.info("Total СЗЧ sections found: 0 (no СЗЧ indicators in text)")
+        return sections
     
     # 1. Спочатку шукаємо пронумеровані пункти, що починаються з числа, наприклад "2."
-    numbered_points_pattern = r'(\d+)\.\s+' # Спрощений патерн: шукаємо тільки номер і крапку
-    numbered_points = list(re.finditer(numbered_points_pattern, search_text))
-    print(f"Found {len(numbered_points)} potential numbered points using pattern: '{numbered_points_pattern}'")
+    logger.debug("Searching numbered points using pattern: '%s'", _NUMBERED_POINTS_RE.pattern)
+    numbered_points_count = 0
     
     # Перевіряємо кожен пронумерований пункт на наявність ключових слів СЗЧ
-    for point_match in numbered_points:
+    for numbered_points_count, point_match in enumerate(_NUMBERED_POINTS_RE.finditer(search_text, 0, search_end), 1):
         if time_limit_reached():
-            print("Time limit reached during numbered points search")
+            logger.warning("Time limit reached during numbered points search")
             break
         
         point_num = point_match.group(1)
         point_start = point_match.start()
         
         # Пропускаємо вже оброблені позиції
-        if point_start in added_positions:
+        if point_start in added_position_set:
             continue
         
         # Визначаємо межі пункту: до наступного пронумерованого пункту або максимум 2000 символів
         # Збільшуємо діапазон пошуку до 2500 символів для довших секцій
         next_point_search_start = point_match.end() # Починаємо пошук після поточного номера
-        next_point_match = re.search(numbered_points_pattern, search_text[next_point_search_start:point_start + 2500])
+        next_point_match = _NUMBERED_POINTS_RE.search(search_text, next_point_search_start, min(point_start + 2500, search_end))
         if next_point_match:
-            point_end = next_point_search_start + next_point_match.start()
+            point_end = next_point_match.start()
         else:
-            point_end = min(point_start + 2000, len(search_text)) # Increased from 1500 to 2000
+            point_end = min(point_start + 2000, search_end) # Increased from 1500 to 2000
         
         point_text = search_text[point_start:point_end]
+        point_text_lower = lower_slice(point_start, point_end)
+
+        # Більшість пунктів не має жодної ознаки СЗЧ - відкидаємо їх одним пошуком
+        if not _SZCH_INDICATORS_RE.search(point_text_lower):
+            continue
         
         # Спочатку перевіряємо, чи це НЕ звичайне вибуття для подальшого проходження служби
         is_normal_departure = False
-        departure_indicators = [
-            "виключити зі списків особового складу",
-            "вважати такими, що справи і посаду здали",
-            "вважати такими, що справи і посаду здав",
-            "для подальшого проходження служби",
-            "вибули в розпорядження",
-            "вибув до нового місця служби",
-            "розпорядження начальника генерального штабу"
-        ]
-        
-        for indicator in departure_indicators:
-            if indicator in point_text.lower():
+        for indicator in _DEPARTURE_INDICATORS:
+            if indicator in point_text_lower:
                 is_normal_departure = True
                 break
         
@@ -380,8 +525,8 @@ def find_szch_sections(text, rank_map):
         # Перевіряємо чи містить цей пункт ключові слова СЗЧ
         contains_szch = False
         keyword_found_in_point = "None" # Debugging variable
-        for key in szch_keys:
-            if key in point_text.lower():
+        for key in _SZCH_KEYS_LOWER:
+            if key in point_text_lower:
                 contains_szch = True
                 keyword_found_in_point = key
                 break
@@ -390,74 +535,75 @@ def find_szch_sections(text, rank_map):
         phrase_found_in_point = "None" # Debugging variable
         if not contains_szch: # Only check if keyword wasn't already found
             # Перевіряємо наявність самовільного залишення
-            if re.search(r'самовільн.{1,30}залиш', point_text.lower()):
+            if _has_phrase_near(point_text_lower, "самовільн", "залиш", 30):
                 contains_szch = True
                 phrase_found_in_point = "самовільне залишення (pattern)"
             # Виключити з усіх видів + самовільне
-            elif "у зв'язку" in point_text.lower() and "самовільн" in point_text.lower():
+            elif "у зв'язку" in point_text_lower and "самовільн" in point_text_lower:
                 contains_szch = True
                 phrase_found_in_point = "у зв'язку з самовільним"
 
         # Check conscript conditions - тільки з явною згадкою самовільного залишення
         conscript_check_passed = False # Debugging variable
         if not contains_szch: # Only check if not already found
-            if "за призовом" in point_text and "самовільн" in point_text.lower():
+            if "за призовом" in point_text and "самовільн" in point_text_lower:
                 contains_szch = True
                 conscript_check_passed = True
 
         # Final decision for the point
         if contains_szch:
             sections.append(('СЗЧ', point_text, point_start))
-            added_positions.add(point_start)
-            print(f"Point {point_num}: Added SZCH section (keyword: {keyword_found_in_point or phrase_found_in_point})")
+            insort(added_positions, point_start)
+            added_position_set.add(point_start)
+            logger.debug("Point %s: Added SZCH section (keyword: %s)", point_num, keyword_found_in_point or phrase_found_in_point)
         else:
             # Detailed logging ONLY for points with potential indicators
-            lower_text = point_text.lower()
+            lower_text = point_text_lower
             if ("виключити" in lower_text or 
                 "самовільн" in lower_text or 
                 "забезпечення" in lower_text and "виключ" in lower_text):
-                print(f"--- POTENTIAL СЗЧ Point {point_num} but NOT matched ---")
-                print(f"  Text snippet: {point_text[:150]}...")
-                print(f"  Military personnel check: {military_personnel_check}")
-                print(f"  Conscript check: {conscript_check_passed}")
+                logger.debug("--- POTENTIAL СЗЧ Point %s but NOT matched ---", point_num)
+                logger.debug("Text snippet: %.150s...", point_text)
+                logger.debug("Conscript check: %s", conscript_check_passed)
+    logger.debug("Checked %s potential numbered points", numbered_points_count)
 
     # Якщо не знайдено секції за номерами пунктів, шукаємо за розширеним набором ключових слів
     if not sections:
-        print("No СЗЧ points found by number, performing thorough keyword search")
+        logger.debug("No СЗЧ points found by number, performing thorough keyword search")
+        # Один шаблон для пошуку будь-якого звання з rank_map (потрібен лише в додаткових пошуках,
+        # будується один раз на набір звань)
+        rank_re = _rank_matcher(tuple(rank_map))
         
         # Шукаємо за розширеними ключовими фразами та паттернами СЗЧ
-        for key in szch_keys:
+        for key, key_re in _SZCH_KEY_RES:
             if time_limit_reached():
                 break
                 
-            matches = list(re.finditer(key, search_text, re.IGNORECASE))
-            print(f"Searching for key '{key}': found {len(matches)} occurrences")
+            logger.debug("Searching for key '%s'", key)
             
-            for match in matches:
+            for match in key_re.finditer(search_text, 0, search_end):
                 if time_limit_reached():
                     break
                     
                 match_start = match.start()
                 # Пропускаємо вже оброблені позиції
-                if any(abs(pos - match_start) < 50 for pos in added_positions):
+                if _is_near_position(added_positions, match_start, 50):
                     continue
                 
                 # Визначаємо контекст навколо ключового слова
                 context_start = max(0, match_start - 500)  # Збільшуємо контекст до 500 символів
-                context_end = min(len(search_text), match_start + 1500)  # Збільшуємо контекст після ключового слова
+                context_end = min(search_end, match_start + 1500)  # Збільшуємо контекст після ключового слова
                 
                 # Шукаємо початок пункту перед ключовим словом
-                context_before = search_text[context_start:match_start]
-                point_match = re.search(r'(\d+)\.\s+', context_before)
+                point_match = _NUMBERED_POINTS_RE.search(search_text, context_start, match_start)
                 
                 if point_match:
-                    section_start = context_start + point_match.start()
+                    section_start = point_match.start()
                     # Шукаємо кінець секції
-                    context_after = search_text[match_start:context_end]
-                    next_point_match = re.search(r'\d+\.\s+', context_after)
+                    next_point_match = _NUMBER_RE.search(search_text, match_start, context_end)
                     
                     if next_point_match:
-                        section_end = match_start + next_point_match.start()
+                        section_end = next_point_match.start()
                     else:
                         section_end = context_end
                 else:
@@ -465,61 +611,56 @@ def find_szch_sections(text, rank_map):
                     section_start = context_start
                     section_end = context_end
                 
-                section_text = search_text[section_start:section_end]
-                
                 # Перевіряємо чи є в секції військові звання
-                has_military_rank = any(rank.lower() in section_text.lower() for rank in ranks)
+                has_military_rank = window_has_rank(rank_re, section_start, section_end)
                 
                 if has_military_rank:
+                    section_text = search_text[section_start:section_end]
                     sections.append(('СЗЧ', section_text, section_start))
-                    added_positions.add(section_start)
-                    print(f"Found СЗЧ section by keyword '{key}' at position {section_start}")
-                    print(f"  Section content begins with: {section_text[:100]}...")
+                    insort(added_positions, section_start)
+                    added_position_set.add(section_start)
+                    logger.debug("Found СЗЧ section by keyword '%s' at position %s", key, section_start)
+                    logger.debug("Section content begins with: %.100s...", section_text)
     
     # Додатковий пошук за допомогою більш загальних регулярних виразів
     if len(sections) < 3:  # Якщо знайдено менше 3 секцій, спробуємо знайти додаткові
-        print("Searching for additional СЗЧ sections using more general patterns")
-        szch_patterns = [
-            r'виключити\s+з\s+(?:усіх|всіх|котлового)\s+видів\s+забезпечення',
-            r'самовільн[а-яіїєґ]+\s+залиш[а-яіїєґ]+',
-            r'у\s+зв\'язку\s+з\s+самовільн[а-яіїєґ]+'
-        ]
-        
-        for pattern in szch_patterns:
+        logger.debug("Searching for additional СЗЧ sections using more general patterns")
+        rank_re = _rank_matcher(tuple(rank_map))
+        for pattern, pattern_re in _SZCH_PATTERNS:
             if time_limit_reached() or len(sections) >= 10:  # Обмежуємо пошук до розумної кількості секцій
                 break
                 
             try:
-                matches = list(re.finditer(pattern, search_text, re.IGNORECASE))
-                print(f"Searching with pattern '{pattern}': found {len(matches)} occurrences")
+                matches = list(pattern_re.finditer(search_text, 0, search_end))
+                logger.debug("Searching with pattern '%s': found %s occurrences", pattern, len(matches))
                 
                 for match in matches:
                     match_start = match.start()
                     # Пропускаємо вже оброблені позиції
-                    if any(abs(pos - match_start) < 100 for pos in added_positions):
+                    if _is_near_position(added_positions, match_start, 100):
                         continue
                     
                     # Визначаємо контекст навколо матчу
                     context_start = max(0, match_start - 500)
-                    context_end = min(len(search_text), match_start + 1500)
-                    section_text = search_text[context_start:context_end]
-                    
+                    context_end = min(search_end, match_start + 1500)
                     # Перевіряємо чи є в секції військові звання
-                    has_military_rank = any(rank.lower() in section_text.lower() for rank in ranks)
+                    has_military_rank = window_has_rank(rank_re, context_start, context_end)
                     
                     if has_military_rank:
+                        section_text = search_text[context_start:context_end]
                         sections.append(('СЗЧ', section_text, context_start))
-                        added_positions.add(context_start)
-                        print(f"Found additional СЗЧ section with pattern '{pattern}' at position {context_start}")
+                        insort(added_positions, context_start)
+                        added_position_set.add(context_start)
+                        logger.debug("Found additional СЗЧ section with pattern '%s' at position %s", pattern, context_start)
             except Exception as e:
-                print(f"Error while searching with pattern '{pattern}': {e}")
+                logger.warning("Error while searching with pattern '%s': %s", pattern, e)
 
     elapsed_time = time.time() - start_time
-    print(f"Total СЗЧ sections found: {len(sections)} (time: {elapsed_time:.2f} seconds)")
+    logger.info("Total СЗЧ sections found: %s (time: %.2f seconds)", len(sections), elapsed_time)
     
     # Додаємо вивід знайдених секцій для детальної діагностики
     for i, (section_type, section_text, pos) in enumerate(sections, 1):
-        print(f"Section {i} starts with: {section_text[:100]}...")
+        logger.debug("Section %s starts with: %.100s...", i, section_text)
         
-    print("END find_szch_sections: Завершено пошук СЗЧ секцій")
+    logger.debug("END find_szch_sections: Завершено пошук СЗЧ секцій")
     return sections 
\ No newline at end of file
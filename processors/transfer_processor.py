@@ -3,6 +3,7 @@
 Обробляє записи, де військовослужбовець в одному абзаці і виключається з однієї локації, і зараховується до іншої.
 """
 
+import logging
 import re
 from text_processing import normalize_text
 from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
@@ -14,9 +15,73 @@ from military_personnel import (
     is_person_duplicate,
     extract_rank_and_name
 )
-from utils import extract_location, parse_date, determine_paragraph_location
+from utils import extract_location, parse_date_parts, determine_paragraph_location
 from name_converter import process_full_name
 
+logger = logging.getLogger(__name__)
+
+# Батальйон призначення та ознаки виключення/зарахування на котлове забезпечення
+_DESTINATION_NB_RE = re.compile(r'до\s+(\d+)\s+навчального\s+батальйону')
+_NB_RE = re.compile(r'(\d+)\s+навчального\s+батальйону')
+_HAS_EXCLUSION_RE = re.compile(r'[Вв]иключити\s+з\s+котлового\s+забезпечення')
+_HAS_ENROLLMENT_RE = re.compile(r'[Зз]арахувати\s+на\s+котлове\s+забезпечення')
+# Дата у форматі ''10'' серпня 2023 або "10" серпня 2023
+_QUOTED_DATE_RE = re.compile(r"(?:''|\")(\d{1,2})(?:''|\")\s+([а-яіїєґ]+)\s+(\d{4})")
+_MEAL_RE = re.compile(r'(зі|з)\s+([а-яіїєґ]+)')
+# Рядок спеціального формату: номер, ВЧ, звання, ПІБ
+_SPECIAL_PERSON_RE = re.compile(r'^\d+\.\s+([AА]\d+)\s+([а-яіїєґ\s]+)\s+([А-ЯІЇЄҐ]+\s+[А-ЯІЇЄҐа-яіїєґ]+\s+[А-ЯІЇЄҐа-яіїєґ]+)')
+# Виключення/зарахування: батальйон, харчування та дата
+_EXCLUSION_RE = re.compile(r'[Вв]иключити\s+з\s+котлового\s+забезпечення.*?(\d+)\s+навчального\s+батальйону.*?(з|зі)\s+([а-яіїєґ]+)\s+(?:\'\'|\"?)(\d{1,2})(?:\'\'|\"?)\s+([а-яіїєґ]+)\s+(\d{4})')
+_ENROLLMENT_RE = re.compile(r'[Зз]арахувати\s+на\s+котлове\s+забезпечення.*?(\d+)\s+навчального\s+батальйону.*?(з|зі)\s+([а-яіїєґ]+)\s+(?:\'\'|\"?)(\d{1,2})(?:\'\'|\"?)\s+([а-яіїєґ]+)\s+(\d{4})')
+# Шукається в абзаці, переведеному в нижній регістр: без re.IGNORECASE працює пошук за літеральним префіксом
+_EXCLUSION_LOCATION_RE = re.compile(r'виключити\s+з\s+котлового\s+забезпечення[^,]*?(\d+)\s*навчального\s+батальйону')
+_VCH_RE = re.compile(r'військової\s+частини\s+([АA]\d+)')
+
+def _is_numbered_header(text):
+    """
+    Перевіряє, чи починається текст з номера заголовка секції "X.Y.Z"
+    (те саме, що re.search(r'^\d+\.\d+\.\d+', text), без регулярного виразу).
+
+    Args:
+        text (str): Текст абзацу
+
+    Returns:
+        bool: True, якщо текст починається з номера "X.Y.Z"
+    """
+    position = 0
+    for _ in range(2):
+        if not text[position:position + 1].isdecimal():
+            return False
+        dot = text.find('.', position)
+        if dot == -1 or not text[position:dot].isdecimal():
+            return False
+        position = dot + 1
+    return text[position:position + 1].isdecimal()
+
+
+def _normalize_record_names(records):
+    """
+    Заповнює 'name_normal' для записів. Кожне унікальне ім'я нормалізується один раз:
+    переведення дає по два записи (виключення та зарахування) на особу.
+
+    Args:
+        records (list): Записи про військовослужбовців (змінюються на місці)
+    """
+    normalized_names = {}
+    for record in records:
+        original_name = record.get('name')
+        if not original_name or not isinstance(original_name, str):
+            continue
+        if original_name not in normalized_names:
+            try:
+                normalized_names[original_name] = process_full_name(original_name)
+                logger.debug("Нормалізовано ім'я: '%s' -> '%s'", original_name, normalized_names[original_name])
+            except Exception as e:
+                logger.warning("Помилка нормалізації імені '%s': %s", original_name, e)
+                normalized_names[original_name] = original_name # Запасний варіант - оригінальне ім'я
+        record['name_normal'] = normalized_names[original_name]
+
+
 def process_transfer_records(section_text, rank_map, location_triggers, processed_persons=None):
     """
     Обробляє секції, де військовослужбовці переводяться з одного підрозділу в інший
@@ -31,7 +96,7 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
     Returns:
         list: Список записів про військовослужбовців
     """
-    print("\n=== Обробка секції переведення військовослужбовців ===")
+    logger.debug("=== Обробка секції переведення військовослужбовців ===")
     results = []
     if processed_persons is None:
         processed_persons = {}
@@ -40,126 +105,132 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
         processed_persons = {p: {'action': None, 'date': None} for p in processed_persons}
     
     # Розділяємо на абзаци по нумерації або порожніх рядках
-    paragraphs = section_text.split('\n\n')
-    paragraphs = [p.strip() for p in paragraphs if p.strip()]
+    paragraphs = [p.strip() for p in section_text.split('\n\n') if p.strip()]
     
     # Знаходимо абзац із загальною інформацією про переведення (якщо є)
     header_paragraph = None
-    if paragraphs and re.search(r'^\d+\.\d+\.\d+', paragraphs[0]):
+    if paragraphs and _is_numbered_header(paragraphs[0]):
         header_paragraph = paragraphs[0]
         paragraphs = paragraphs[1:]  # Відділяємо заголовок від списку військовослужбовців
-        print(f"Знайдено заголовок секції: {header_paragraph[:100]}...")
+        logger.debug("Знайдено заголовок секції: %.100s...", header_paragraph)
     
     destination_location = None
     if header_paragraph:
         # Спробуємо знайти локацію призначення в заголовку
-        match = re.search(r'до\s+(\d+)\s+навчального\s+батальйону', header_paragraph)
+        match = _DESTINATION_NB_RE.search(header_paragraph)
         if match:
             destination_nb = match.group(1)
             destination_location = f"{destination_nb} НБ"
-            print(f"Знайдено локацію призначення з заголовка: {destination_location}")
+            logger.debug("Знайдено локацію призначення з заголовка: %s", destination_location)
+    
+    total_found = 0
     
     # Special case handling for the format with general exclusion and enrollment paragraphs
     # followed by a list of personnel with VCH codes
     if len(paragraphs) >= 3:
         # Check if first paragraph contains exclusion info and second contains enrollment info
-        has_exclusion_info = re.search(r'[Вв]иключити\s+з\s+котлового\s+забезпечення', paragraphs[0])
-        has_enrollment_info = re.search(r'[Зз]арахувати\s+на\s+котлове\s+забезпечення', paragraphs[1])
+        # Дешева перевірка підрядка відсікає абзаци без фрази до запуску регулярного виразу
+        has_exclusion_info = 'котлового' in paragraphs[0] and _HAS_EXCLUSION_RE.search(paragraphs[0])
+        has_enrollment_info = 'котлове' in paragraphs[1] and _HAS_ENROLLMENT_RE.search(paragraphs[1])
         
         # If we have the special format, process it
         if has_exclusion_info and has_enrollment_info:
-            print("\n=== Виявлено спеціальний формат з загальною інформацією по виключенню/зарахуванню ===")
+            logger.debug("=== Виявлено спеціальний формат з загальною інформацією по виключенню/зарахуванню ===")
             
             # Extract exclusion info
             exclusion_info = {}
             # Extract source location
-            source_match = re.search(r'(\d+)\s+навчального\s+батальйону', paragraphs[0])
+            source_match = _NB_RE.search(paragraphs[0])
             if source_match:
                 exclusion_info['location'] = f"{source_match.group(1)} НБ"
-                print(f"Знайдено локацію виключення: {exclusion_info['location']}")
+                logger.debug("Знайдено локацію виключення: %s", exclusion_info['location'])
             
             # Extract date and meal
-            date_match = re.search(r"(?:''|\")(\d{1,2})(?:''|\")\s+([а-яіїєґ]+)\s+(\d{4})", paragraphs[0])
+            date_match = _QUOTED_DATE_RE.search(paragraphs[0])
             if date_match:
                 day, month, year = date_match.groups()
-                exclusion_info['date'] = parse_date(f"{day} {month} {year}")
-                print(f"Знайдено дату виключення: {exclusion_info['date']}")
+                exclusion_info['date'] = parse_date_parts(day, month, year)
+                logger.debug("Знайдено дату виключення: %s", exclusion_info['date'])
             
-            meal_match = re.search(r'(зі|з)\s+([а-яіїєґ]+)', paragraphs[0])
+            meal_match = _MEAL_RE.search(paragraphs[0])
             if meal_match:
                 prefix, meal = meal_match.groups()
                 exclusion_info['meal'] = f"{prefix} {meal}"
-                print(f"Знайдено харчування для виключення: {exclusion_info['meal']}")
+                logger.debug("Знайдено харчування для виключення: %s", exclusion_info['meal'])
             
             # Extract enrollment info
             enrollment_info = {}
             # Extract destination location
-            dest_match = re.search(r'(\d+)\s+навчального\s+батальйону', paragraphs[1])
+            dest_match = _NB_RE.search(paragraphs[1])
             if dest_match:
                 enrollment_info['location'] = f"{dest_match.group(1)} НБ"
-                print(f"Знайдено локацію зарахування: {enrollment_info['location']}")
+                logger.debug("Знайдено локацію зарахування: %s", enrollment_info['location'])
             
             # Extract date and meal
-            date_match = re.search(r"(?:''|\")(\d{1,2})(?:''|\")\s+([а-яіїєґ]+)\s+(\d{4})", paragraphs[1])
+            date_match = _QUOTED_DATE_RE.search(paragraphs[1])
             if date_match:
                 day, month, year = date_match.groups()
-                enrollment_info['date'] = parse_date(f"{day} {month} {year}")
-                print(f"Знайдено дату зарахування: {enrollment_info['date']}")
+                enrollment_info['date'] = parse_date_parts(day, month, year)
+                logger.debug("Знайдено дату зарахування: %s", enrollment_info['date'])
             
-            meal_match = re.search(r'(зі|з)\s+([а-яіїєґ]+)', paragraphs[1])
+            meal_match = _MEAL_RE.search(paragraphs[1])
             if meal_match:
                 prefix, meal = meal_match.groups()
                 enrollment_info['meal'] = f"{prefix} {meal}"
-                print(f"Знайдено харчування для зарахування: {enrollment_info['meal']}")
+                logger.debug("Знайдено харчування для зарахування: %s", enrollment_info['meal'])
             
             # Set defaults if not found
             if 'location' not in exclusion_info:
                 exclusion_info['location'] = "ППД"
-                print("Локація виключення не знайдена, використовуємо 'ППД'")
+                logger.debug("Локація виключення не знайдена, використовуємо 'ППД'")
             
             if 'date' not in exclusion_info:
                 from datetime import datetime
                 exclusion_info['date'] = datetime.now().strftime("%d.%m.%Y")
-                print(f"Дата виключення не знайдена, використовуємо поточну: {exclusion_info['date']}")
+                logger.debug("Дата виключення не знайдена, використовуємо поточну: %s", exclusion_info['date'])
             
             if 'meal' not in exclusion_info:
                 exclusion_info['meal'] = "зі сніданку"
-                print("Харчування для виключення не знайдене, використовуємо 'зі сніданку'")
+                logger.debug("Харчування для виключення не знайдене, використовуємо 'зі сніданку'")
                 
             if 'location' not in enrollment_info:
                 enrollment_info['location'] = "ППД"
-                print("Локація зарахування не знайдена, використовуємо 'ППД'")
+                logger.debug("Локація зарахування не знайдена, використовуємо 'ППД'")
             
             if 'date' not in enrollment_info:
                 enrollment_info['date'] = exclusion_info['date']
-                print(f"Дата зарахування не знайдена, використовуємо дату виключення: {enrollment_info['date']}")
+                logger.debug("Дата зарахування не знайдена, використовуємо дату виключення: %s", enrollment_info['date'])
             
             if 'meal' not in enrollment_info:
                 enrollment_info['meal'] = exclusion_info['meal']
-                print(f"Харчування для зарахування не знайдене, використовуємо те ж що для виключення: {enrollment_info['meal']}")
+                logger.debug("Харчування для зарахування не знайдене, використовуємо те ж що для виключення: %s", enrollment_info['meal'])
+            
+            # Determine personnel type once for the whole section
+            os_type = determine_personnel_type(" ".join(paragraphs))
             
             # Process personnel paragraphs (starting from the third paragraph)
             special_format_found = False
             for i in range(2, len(paragraphs)-1):
-                # Check if paragraph contains numbered entries
-                lines = paragraphs[i].strip().split('\n')
+                # Check if paragraph contains numbered entries (paragraphs are already stripped)
+                lines = paragraphs[i].split('\n')
                 for line in lines:
+                    # Рядки без цифри на початку (порожні, заголовки) відкидаємо без регулярного виразу;
+                    # isdecimal приймає ті самі символи, що й \d
+                    if not line[:1].isdecimal():
+                        continue
                     # Match format: number, VCH code, rank, name
-                    personnel_match = re.match(r'^\d+\.\s+([AА]\d+)\s+([а-яіїєґ\s]+)\s+([А-ЯІЇЄҐ]+\s+[А-ЯІЇЄҐа-яіїєґ]+\s+[А-ЯІЇЄҐа-яіїєґ]+)', line)
+                    personnel_match = _SPECIAL_PERSON_RE.match(line)
                     if personnel_match:
                         special_format_found = True
                         vch = personnel_match.group(1)
                         rank = personnel_match.group(2).strip()
                         name = personnel_match.group(3).strip()
                         
-                        print(f"\nОбробка військовослужбовця зі спеціального формату: {rank} {name}, ВЧ: {vch}")
-                        
-                        # Determine personnel type
-                        os_type = determine_personnel_type(" ".join(paragraphs))
+                        logger.debug("Обробка військовослужбовця зі спеціального формату: %s %s, ВЧ: %s", rank, name, vch)
                         
                         # Create unique identifiers for duplicate checking
-                        person_id_exclusion = f"{rank}_{name}_exclusion_{exclusion_info['date']}"
-                        person_id_enrollment = f"{rank}_{name}_enrollment_{enrollment_info['date']}"
+                        person_id_exclusion = f"{rank}_{name}_exclusion_{exclusion_info['date']}".lower()
+                        person_id_enrollment = f"{rank}_{name}_enrollment_{enrollment_info['date']}".lower()
                         
                         # Create exclusion record if not a duplicate
                         if not is_person_duplicate(person_id_exclusion, processed_persons, action="виключити", date=exclusion_info['date']):
@@ -171,15 +242,15 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
                                 os_type=os_type,
                                 date_k=exclusion_info['date'],
                                 meal=exclusion_info['meal'],
-                                cause="Переміщення"
+                                cause="Переміщення",
+                                action="виключити"
                             )
-                            record_exclusion["action"] = "виключити"
                             results.append(record_exclusion)
-                            processed_persons[person_id_exclusion.lower()] = {'action': "виключити", 'date': exclusion_info['date']}
-                            print(f"✅ Додано запис про виключення: {rank} {name}, ВЧ: {vch}, локація: {exclusion_info['location']}")
+                            processed_persons[person_id_exclusion] = {'action': "виключити", 'date': exclusion_info['date']}
+                            logger.debug("✅ Додано запис про виключення: %s %s, ВЧ: %s, локація: %s", rank, name, vch, exclusion_info['location'])
                             total_found += 1
                         else:
-                            print(f"⚠️ Виявлено дублікат виключення: {rank} {name} - пропускаємо!")
+                            logger.debug("⚠️ Виявлено дублікат виключення: %s %s - пропускаємо!", rank, name)
                         
                         # Create enrollment record if not a duplicate
                         if not is_person_duplicate(person_id_enrollment, processed_persons, action="зарахувати", date=enrollment_info['date']):
@@ -191,49 +262,38 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
                                 os_type=os_type,
                                 date_k=enrollment_info['date'],
                                 meal=enrollment_info['meal'],
-                                cause="Переміщення"
+                                cause="Переміщення",
+                                action="зарахувати"
                             )
-                            record_enrollment["action"] = "зарахувати"
                             results.append(record_enrollment)
-                            processed_persons[person_id_enrollment.lower()] = {'action': "зарахувати", 'date': enrollment_info['date']}
-                            print(f"✅ Додано запис про зарахування: {rank} {name}, ВЧ: {vch}, локація: {enrollment_info['location']}")
+                            processed_persons[person_id_enrollment] = {'action': "зарахувати", 'date': enrollment_info['date']}
+                            logger.debug("✅ Додано запис про зарахування: %s %s, ВЧ: %s, локація: %s", rank, name, vch, enrollment_info['location'])
                             total_found += 1
                         else:
-                            print(f"⚠️ Виявлено дублікат зарахування: {rank} {name} - пропускаємо!")
+                            logger.debug("⚠️ Виявлено дублікат зарахування: %s %s - пропускаємо!", rank, name)
             
             # If we successfully processed using the special format, return the results
             if special_format_found:
-                print(f"\nЗагалом додано {total_found} записів зі спеціального формату")
+                logger.info("Загалом додано %s записів зі спеціального формату", total_found)
                 
                 # Нормалізація імен
-                for record in results:
-                    original_name = record.get('name')
-                    if original_name and isinstance(original_name, str):
-                        try:
-                            normalized_name = process_full_name(original_name)
-                            record['name_normal'] = normalized_name
-                            print(f"Нормалізовано ім'я: '{original_name}' -> '{normalized_name}'")
-                        except Exception as e:
-                            print(f"Помилка нормалізації імені '{original_name}': {e}")
-                            record['name_normal'] = original_name # Запасний варіант - оригінальне ім'я
+                _normalize_record_names(results)
                 
                 return results
     
-    total_found = 0
-    
     for i, paragraph in enumerate(paragraphs):
-        print(f"\n--- Обробка абзацу {i+1} ---")
-        print(f"Текст: {paragraph[:100]}...")
+        logger.debug("--- Обробка абзацу %s ---", i+1)
+        logger.debug("Текст: %.100s...", paragraph)
         
         # Витягуємо військовослужбовця
         military_persons = extract_military_personnel(paragraph, rank_map)
         
         if not military_persons:
-            print(f"Не знайдено військовослужбовців у абзаці {i+1}")
+            logger.debug("Не знайдено військовослужбовців у абзаці %s", i+1)
             # Спробуємо використати інший метод для витягнення
             rank, name = extract_rank_and_name(paragraph, rank_map)
             if rank and name:
-                print(f"Знайдено військовослужбовця через extract_rank_and_name: {rank} {name}")
+                logger.debug("Знайдено військовослужбовця через extract_rank_and_name: %s %s", rank, name)
                 military_persons = [{'rank': rank, 'name': name}]
             else:
                 continue
@@ -245,35 +305,30 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
         #elif header_paragraph and "медичного обслуговування" in header_paragraph:
         #    cause = "Медичне обслуговування"
         
-        # Шукаємо інформацію про виключення
-        exclusion_match = re.search(r'[Вв]иключити\s+з\s+котлового\s+забезпечення.*?(\d+)\s+навчального\s+батальйону.*?(з|зі)\s+([а-яіїєґ]+)\s+(?:\'\'|\"?)(\d{1,2})(?:\'\'|\"?)\s+([а-яіїєґ]+)\s+(\d{4})', paragraph)
+        # Шукаємо інформацію про виключення та зарахування
+        # (обидва шаблони містять "котлов": без цього підрядка збігів бути не може)
+        exclusion_match = None
+        enrollment_match = None
+        if 'котлов' in paragraph:
+            exclusion_match = _EXCLUSION_RE.search(paragraph)
+            enrollment_match = _ENROLLMENT_RE.search(paragraph)
         
         source_location = None
         exclusion_meal = None
         exclusion_date = None
         
         if exclusion_match:
-            source_nb = exclusion_match.group(1)
-            source_location = f"{source_nb} НБ"
-            meal_prefix = exclusion_match.group(2)
-            meal_type_str = exclusion_match.group(3)
-            exclusion_meal = f"{meal_prefix} {meal_type_str}"
-            day = exclusion_match.group(4)
-            month = exclusion_match.group(5)
-            year = exclusion_match.group(6)
-            exclusion_date = parse_date(f"{day} {month} {year}")
-            print(f"Знайдено інформацію про виключення: локація {source_location}, харчування {exclusion_meal}, дата {exclusion_date}")
+            source_location = f"{exclusion_match.group(1)} НБ"
+            exclusion_meal = f"{exclusion_match.group(2)} {exclusion_match.group(3)}"
+            exclusion_date = parse_date_parts(exclusion_match.group(4), exclusion_match.group(5), exclusion_match.group(6))
+            logger.debug("Знайдено інформацію про виключення: локація %s, харчування %s, дата %s", source_location, exclusion_meal, exclusion_date)
         else:
             # Спробуємо інший підхід до пошуку локації виключення
-            location_pattern = r'виключити\s+з\s+котлового\s+забезпечення[^,]*?(\d+)\s*навчального\s+батальйону'
-            location_match = re.search(location_pattern, paragraph, re.IGNORECASE)
+            location_match = _EXCLUSION_LOCATION_RE.search(paragraph.lower())
             if location_match:
                 source_nb = location_match.group(1)
                 source_location = f"{source_nb} НБ"
-                print(f"Знайдено локацію виключення альтернативним методом: {source_location}")
-        
-        # Шукаємо інформацію про зарахування
-        enrollment_match = re.search(r'[Зз]арахувати\s+на\s+котлове\s+забезпечення.*?(\d+)\s+навчального\s+батальйону.*?(з|зі)\s+([а-яіїєґ]+)\s+(?:\'\'|\"?)(\d{1,2})(?:\'\'|\"?)\s+([а-яіїєґ]+)\s+(\d{4})', paragraph)
+                logger.debug("Знайдено локацію виключення альтернативним методом: %s", source_location)
         
         if not destination_location and enrollment_match:
             dest_nb = enrollment_match.group(1)
@@ -283,79 +338,84 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
         enrollment_date = None
         
         if enrollment_match:
-            meal_prefix = enrollment_match.group(2)
-            meal_type_str = enrollment_match.group(3)
-            enrollment_meal = f"{meal_prefix} {meal_type_str}"
-            day = enrollment_match.group(4)
-            month = enrollment_match.group(5)
-            year = enrollment_match.group(6)
-            enrollment_date = parse_date(f"{day} {month} {year}")
-            print(f"Знайдено інформацію про зарахування: локація {destination_location}, харчування {enrollment_meal}, дата {enrollment_date}")
+            enrollment_meal = f"{enrollment_match.group(2)} {enrollment_match.group(3)}"
+            enrollment_date = parse_date_parts(enrollment_match.group(4), enrollment_match.group(5), enrollment_match.group(6))
+            logger.debug("Знайдено інформацію про зарахування: локація %s, харчування %s, дата %s", destination_location, enrollment_meal, enrollment_date)
         
         # Якщо не знайдено локацію призначення, шукаємо в тексті абзацу
         if not destination_location:
-            dest_match = re.search(r'до\s+(\d+)\s+навчального\s+батальйону', paragraph)
+            dest_match = _DESTINATION_NB_RE.search(paragraph)
             if dest_match:
                 dest_nb = dest_match.group(1)
                 destination_location = f"{dest_nb} НБ"
-                print(f"Знайдено локацію призначення з тексту абзацу: {destination_location}")
+                logger.debug("Знайдено локацію призначення з тексту абзацу: %s", destination_location)
         
         # Для надійності встановлюємо значення за замовчуванням
         if not source_location:
             source_location = "ППД"
-            print("Локація відправлення не знайдена, використовуємо 'ППД'")
+            logger.debug("Локація відправлення не знайдена, використовуємо 'ППД'")
         
         if not destination_location:
             destination_location = "ППД"
-            print("Локація призначення не знайдена, використовуємо 'ППД'")
+            logger.debug("Локація призначення не знайдена, використовуємо 'ППД'")
         
         if not exclusion_meal:
             exclusion_meal = "зі сніданку"
-            print("Тип харчування для виключення не знайдений, використовуємо 'зі сніданку'")
+            logger.debug("Тип харчування для виключення не знайдений, використовуємо 'зі сніданку'")
         
         if not enrollment_meal:
             enrollment_meal = exclusion_meal if exclusion_meal else "зі сніданку"
-            print(f"Тип харчування для зарахування не знайдений, використовуємо '{enrollment_meal}'")
+            logger.debug("Тип харчування для зарахування не знайдений, використовуємо '%s'", enrollment_meal)
         
         if not exclusion_date:
             # Спробуємо знайти будь-яку дату в абзаці
-            date_pattern = r"(?:''|\")(\d{1,2})(?:''|\")\s+([а-яіїєґ]+)\s+(\d{4})"
-            date_match = re.search(date_pattern, paragraph)
+            date_match = _QUOTED_DATE_RE.search(paragraph)
             if date_match:
                 day, month, year = date_match.groups()
-                exclusion_date = parse_date(f"{day} {month} {year}")
-                print(f"Знайдено дату в абзаці: {exclusion_date}")
+                exclusion_date = parse_date_parts(day, month, year)
+                logger.debug("Знайдено дату в абзаці: %s", exclusion_date)
             else:
                 from datetime import datetime
                 exclusion_date = datetime.now().strftime("%d.%m.%Y")
-                print(f"Дата виключення не знайдена, використовуємо поточну: {exclusion_date}")
+                logger.debug("Дата виключення не знайдена, використовуємо поточну: %s", exclusion_date)
         
         if not enrollment_date:
             enrollment_date = exclusion_date
-            print(f"Дата зарахування не знайдена, використовуємо дату виключення: {enrollment_date}")
+            logger.debug("Дата зарахування не знайдена, використовуємо дату виключення: %s", enrollment_date)
+        
+        # Створюємо унікальні ідентифікатори для перевірки дублікатів (одразу в нижньому регістрі,
+        # як вони зберігаються в processed_persons)
+        person_ids = [
+            (f"{person_data['rank']}_{person_data['name']}_exclusion_{exclusion_date}".lower(),
+             f"{person_data['rank']}_{person_data['name']}_enrollment_{enrollment_date}".lower())
+            for person_data in military_persons
+        ]
+        
+        # Якщо всі особи абзацу вже мають обидва записи з цими датами - решту абзацу не розбираємо
+        if all(is_person_duplicate(person_id_exclusion, processed_persons, action="виключити", date=exclusion_date)
+               and is_person_duplicate(person_id_enrollment, processed_persons, action="зарахувати", date=enrollment_date)
+               for person_id_exclusion, person_id_enrollment in person_ids):
+            logger.debug("⚠️ Усі військовослужбовці абзацу %s вже оброблені - пропускаємо!", i+1)
+            continue
         
         # Визначаємо військову частину
         vch = "А1890"  # За замовчуванням
-        vch_match = re.search(r'військової\s+частини\s+([АA]\d+)', paragraph)
+        vch_match = _VCH_RE.search(paragraph)
         if vch_match:
             vch = vch_match.group(1)
-            print(f"Знайдено військову частину: {vch}")
+            logger.debug("Знайдено військову частину: %s", vch)
+        
+        # Визначаємо тип ОС (однаковий для всіх осіб абзацу)
+        os_type = determine_personnel_type(paragraph)
         
         # Створюємо записи для кожного військовослужбовця
-        for person_data in military_persons:
+        for person_data, (person_id_exclusion, person_id_enrollment) in zip(military_persons, person_ids):
             rank = person_data['rank']
             name = person_data['name']
             
-            # Визначаємо тип ОС
-            os_type = determine_personnel_type(paragraph)
-            
-            # Створюємо унікальні ідентифікатори для перевірки дублікатів
-            person_id_exclusion = f"{rank}_{name}_exclusion_{exclusion_date}"
-            person_id_enrollment = f"{rank}_{name}_enrollment_{enrollment_date}"
-            
             # Перевірка дублікатів для виключення
             if is_person_duplicate(person_id_exclusion, processed_persons, action="виключити", date=exclusion_date):
-                print(f"⚠️ Виявлено дублікат виключення: {rank} {name} з тією ж дією в той самий день - пропускаємо!")
+                logger.debug("⚠️ Виявлено дублікат виключення: %s %s з тією ж дією в той самий день - пропускаємо!", rank, name)
             else:
                 # Створення запису про виключення
                 record_exclusion = create_personnel_record(
@@ -366,17 +426,17 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
                     os_type=os_type,
                     date_k=exclusion_date,
                     meal=exclusion_meal,
-                    cause=cause
+                    cause=cause,
+                    action="виключити"
                 )
-                record_exclusion["action"] = "виключити"
                 results.append(record_exclusion)
-                processed_persons[person_id_exclusion.lower()] = {'action': "виключити", 'date': exclusion_date}
+                processed_persons[person_id_exclusion] = {'action': "виключити", 'date': exclusion_date}
                 total_found += 1
-                print(f"✅ Додано запис про виключення: {rank} {name}, ВЧ: {vch}, локація: {source_location}, причина: {cause}")
+                logger.debug("✅ Додано запис про виключення: %s %s, ВЧ: %s, локація: %s, причина: %s", rank, name, vch, source_location, cause)
             
             # Перевірка дублікатів для зарахування
             if is_person_duplicate(person_id_enrollment, processed_persons, action="зарахувати", date=enrollment_date):
-                print(f"⚠️ Виявлено дублікат зарахування: {rank} {name} з тією ж дією в той самий день - пропускаємо!")
+                logger.debug("⚠️ Виявлено дублікат зарахування: %s %s з тією ж дією в той самий день - пропускаємо!", rank, name)
             else:
                 # Створення запису про зарахування
                 record_enrollment = create_personnel_record(
@@ -387,26 +447,17 @@ def process_transfer_records(section_text, rank_map, location_triggers, processe
                     os_type=os_type,
                     date_k=enrollment_date,
                     meal=enrollment_meal,
-                    cause=cause
+                    cause=cause,
+                    action="зарахувати"
                 )
-                record_enrollment["action"] = "зарахувати"
                 results.append(record_enrollment)
-                processed_persons[person_id_enrollment.lower()] = {'action': "зарахувати", 'date': enrollment_date}
+                processed_persons[person_id_enrollment] = {'action': "зарахувати", 'date': enrollment_date}
                 total_found += 1
-                print(f"✅ Додано запис про зарахування: {rank} {name}, ВЧ: {vch}, локація: {destination_location}, причина: {cause}")
+                logger.debug("✅ Додано запис про зарахування: %s %s, ВЧ: %s, локація: %s, причина: %s", rank, name, vch, destination_location, cause)
     
-    print(f"\nЗагалом додано {total_found} записів у секції переведення військовослужбовців")
+    logger.info("Загалом додано %s записів у секції переведення військовослужбовців", total_found)
     
     # Нормалізація імен
-    for record in results:
-        original_name = record.get('name')
-        if original_name and isinstance(original_name, str):
-            try:
-                normalized_name = process_full_name(original_name)
-                record['name_normal'] = normalized_name
-                print(f"Нормалізовано ім'я: '{original_name}' -> '{normalized_name}'")
-            except Exception as e:
-                print(f"Помилка нормалізації імені '{original_name}': {e}")
-                record['name_normal'] = original_name # Запасний варіант - оригінальне ім'я
+    _normalize_record_names(results)
     
     return results 
\ No newline at end of file
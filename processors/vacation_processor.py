@@ -1,34 +1,40 @@
 from military_personnel import extract_military_personnel, create_personnel_record, is_person_duplicate, determine_personnel_type, extract_military_unit
 from utils import extract_location
 from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
+_SECTION_CAUSE_RE = re.compile(r"Повернення\s+з\s+(.*?)(?:[:,]|$)", re.IGNORECASE) # Причина для всієї секції
+_HEADER_CAUSE_RE = re.compile(r"Повернення\s+з\s+(.*)", re.IGNORECASE) # Причина із заголовка підсекції
+
 def process_vacation_return(section_text, rank_map, location_triggers, default_date=None, default_meal=None, processed_persons=None):
     """
     Обробляє секцію "Повернення з відпустки" та створює записи для кожного військовослужбовця.
     """
-    print("\n=== Обробка Повернення з відпустки ===")
+    logger.debug("=== Обробка Повернення з відпустки ===")
     results = [] # Initialize results list
     if processed_persons is None:
         processed_persons = set()
 
     # Extract the main cause for the entire section first
-    section_cause_match = re.search(r"Повернення\s+з\s+(.*?)(?:[:,]|$)", section_text, re.IGNORECASE)
+    section_cause_match = _SECTION_CAUSE_RE.search(section_text)
     base_cause = section_cause_match.group(1).strip() if section_cause_match else "Повернення з відпустки (не вказано тип)"
-    print(f"Основна причина для секції: {base_cause}")
+    logger.debug("Основна причина для секції: %s", base_cause)
 
     # Split into subsections based on vacation type or date
     subsections = split_section_into_subsections(section_text, r"^\d+\.\d+\.\d+\.\s*(?:з|по)\s") # Use a generic pattern
 
     total_found = 0
     if not subsections:
-        print("Увага: Не знайдено нумерованих підсекцій. Обробляємо весь текст секції.")
+        logger.warning("Увага: Не знайдено нумерованих підсекцій. Обробляємо весь текст секції.")
         subsections = [(section_text, None)] # Process the whole text as one subsection
 
     for i, (subsection_text, header) in enumerate(subsections):
-        print(f"\n--- Обробка підсекції {i+1} ---")
+        logger.debug("--- Обробка підсекції %s ---", i+1)
         if header:
-            print(f"Заголовок підсекції: {header.strip()}")
+            logger.debug("Заголовок підсекції: %s", header.strip())
 
         # Extract specific details for the subsection
         return_date = extract_section_date(subsection_text, default_date)
@@ -38,38 +44,40 @@ def process_vacation_return(section_text, rank_map, location_triggers, default_d
         subsection_cause = base_cause # Default to section cause
         if header:
             # Try to extract a more specific cause from the header
-            cause_match = re.search(r"Повернення\s+з\s+(.*)", header, re.IGNORECASE)
+            cause_match = _HEADER_CAUSE_RE.search(header)
             if cause_match:
                 subsection_cause = cause_match.group(1).strip()
-        print(f"Причина для підсекції: {subsection_cause}")
-        print(f"Дата повернення/харчування: {return_date} / {meal_date}")
-        print(f"Тип харчування: {meal_type}")
+        logger.debug("Причина для підсекції: %s", subsection_cause)
+        logger.debug("Дата повернення/харчування: %s / %s", return_date, meal_date)
+        logger.debug("Тип харчування: %s", meal_type)
 
         # Extract personnel
         personnel_data_list = extract_military_personnel(subsection_text, rank_map)
-        print(f"Знайдено {len(personnel_data_list)} військовослужбовців у підсекції")
+        logger.debug("Знайдено %s військовослужбовців у підсекції", len(personnel_data_list))
         total_found += len(personnel_data_list)
 
+        if personnel_data_list:
+            # ВЧ, локація та тип ОС залежать лише від тексту підсекції - визначаємо один раз
+            subsection_vch = extract_military_unit(subsection_text)
+            location = extract_location(subsection_text, location_triggers) or "ППД"
+            os_type = determine_personnel_type(subsection_text)
+
         for person_data in personnel_data_list:
             rank = person_data['rank']
             name = person_data['name']
             vch_from_extraction = person_data.get('vch') # Optional VCH from the line
 
-            person_id = f"{rank}_{name}"
+            # Ключ-кортеж, як у vacation_return_processor: без форматування нового рядка
+            person_id = (rank, name)
             if person_id in processed_persons:
-                print(f"⚠️ Виявлено дублікат: {rank} {name} - пропускаємо!")
+                logger.debug("⚠️ Виявлено дублікат: %s %s - пропускаємо!", rank, name)
                 continue
 
             # Determine VCH: Use extracted if available, otherwise fallback might be needed (e.g., from config or main order VCH)
             # For now, let's prioritize extraction, then maybe a default? Needs context.
-            vch_to_use = vch_from_extraction or extract_military_unit(subsection_text) or "A1890" # Placeholder default
+            vch_to_use = vch_from_extraction or subsection_vch or "A1890" # Placeholder default
             
-            # Determine location
-            location = extract_location(subsection_text, location_triggers) or "ППД"
-
-            # Determine personnel type
-            os_type = determine_personnel_type(subsection_text)
-            print(f"    Визначено тип ОС для {rank} {name}: {os_type}")
+            logger.debug("Визначено тип ОС для %s %s: %s", rank, name, os_type)
 
             record = create_personnel_record(
                 rank=rank,
@@ -84,7 +92,7 @@ def process_vacation_return(section_text, rank_map, location_triggers, default_d
 
             results.append(record)
             processed_persons.add(person_id)
-            print(f"✅ Додано запис: {rank} {name} - ВЧ: {record['VCH']}, Причина: {record['cause']}")
+            logger.debug("✅ Додано запис: %s %s - ВЧ: %s, Причина: %s", rank, name, record['VCH'], record['cause'])
 
-    print(f"\nЗагалом знайдено {total_found} записів у секції '{base_cause}'")
+    logger.info("Загалом знайдено %s записів у секції '%s'", total_found, base_cause)
     return results 
\ No newline at end of file
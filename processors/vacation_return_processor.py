@@ -2,12 +2,25 @@
 Модуль для обробки секцій, пов'язаних з поверненням з відпусток.
 """
 
+import logging
 import re
 from text_processing import normalize_text
-from section_detection import extract_section_date, extract_meal_info, split_section_into_subsections
+from section_detection import extract_date_and_meal, split_section_into_subsections
 from military_personnel import extract_military_personnel, create_personnel_record, is_person_duplicate, determine_personnel_type
 from utils import extract_location, extract_vch, determine_paragraph_location
 
+logger = logging.getLogger(__name__)
+
+# Причина повернення для кожного відомого типу з determine_vacation_type: один спільний рядок на всі записи
+_CAUSE_BY_TYPE = {vacation_type: f"Повернення з {vacation_type}" for vacation_type in (
+    "щорічної основної відпустки",
+    "відпустки за сімейними обставинами",
+    "відпустки для лікування",
+    "відпустки за іншими поважними причинами",
+    "відпустки (тип не уточнено)",
+    "відпустки (тип не знайдено)",
+)}
+
 def process_vacation_return(section_text, rank_map, location_triggers, default_date=None, default_meal=None, processed_persons=None):
     """
     Обробляє секцію повернення з відпустки та створює записи для кожного військовослужбовця.
@@ -24,92 +37,104 @@ def process_vacation_return(section_text, rank_map, location_triggers, default_d
     Returns:
         list: Список записів про військовослужбовців
     """
-    print("\n=== Обробка Повернення з відпустки (Paragraph Mode) ===")
+    logger.debug("=== Обробка Повернення з відпустки (Paragraph Mode) ===")
     results = []
     if processed_persons is None:
         processed_persons = set()
 
     # Визначаємо загальний тип відпустки для секції (як fallback)
     base_vacation_type = determine_vacation_type(section_text)
-    print(f"Базовий тип відпустки для секції: {base_vacation_type}")
+    logger.debug("Базовий тип відпустки для секції: %s", base_vacation_type)
 
     # Розділяємо на підсекції та абзаци
     subsections_with_paragraphs = split_section_into_subsections(section_text)
-    print(f"Знайдено {len(subsections_with_paragraphs)} підрозділів відпустки")
+    logger.debug("Знайдено %d підрозділів відпустки", len(subsections_with_paragraphs))
     
     total_found_overall = 0
     
     # Головна ВЧ наказу (куди повертаються)
     return_vch = "A1890"
-    print(f"Встановлено стандартну ВЧ повернення з відпустки: {return_vch}")
+    logger.debug("Встановлено стандартну ВЧ повернення з відпустки: %s", return_vch)
+
+    # Підсекції йдуть по порядку, тому заголовок кожної шукаємо від кінця попереднього,
+    # а не з початку всієї секції
+    search_cursor = 0
 
     # Обробка кожної підсекції
     for i, (subsection_number, paragraphs) in enumerate(subsections_with_paragraphs, 1):
-        print(f"\n-- Обробка підрозділу відпустки {subsection_number or 'Без номера'} --")
-        print(f"Кількість абзаців: {len(paragraphs)}")
+        logger.debug("-- Обробка підрозділу відпустки %s --", subsection_number or 'Без номера')
+        logger.debug("Кількість абзаців: %d", len(paragraphs))
 
         # Визначаємо тип відпустки для підсекції (більш точно)
         subsection_vacation_type = base_vacation_type # Починаємо з базового
         if paragraphs:
             # Шукаємо ключові слова в першому абзаці або заголовку
-            header_text_search_area = section_text[section_text.find(subsection_number if subsection_number else '') : section_text.find(paragraphs[0])] if subsection_number else paragraphs[0]
+            if subsection_number:
+                number_pos = section_text.find(subsection_number, search_cursor)
+                if number_pos == -1:
+                    number_pos = section_text.find(subsection_number)
+                paragraph_pos = section_text.find(paragraphs[0], max(number_pos, 0))
+                if paragraph_pos != -1:
+                    search_cursor = paragraph_pos
+                header_text_search_area = section_text[number_pos:paragraph_pos]
+            else:
+                header_text_search_area = paragraphs[0]
             subsection_vacation_type = determine_vacation_type(header_text_search_area) 
-            print(f"   Визначено тип відпустки для підрозділу: {subsection_vacation_type}")
+            logger.debug("Визначено тип відпустки для підрозділу: %s", subsection_vacation_type)
+
+        # Причина повернення однакова для всіх абзаців підсекції
+        current_cause = _CAUSE_BY_TYPE.get(subsection_vacation_type) or f"Повернення з {subsection_vacation_type}"
 
         # Обробка кожного абзацу
         for para_idx, paragraph_text in enumerate(paragraphs, 1):
-            print(f"\n   --- Абзац {para_idx} --- ")
-            print(f"   Текст абзацу (перші 100): {paragraph_text[:100]}...")
+            logger.debug("--- Абзац %d ---", para_idx)
+            logger.debug("Текст абзацу (перші 100): %.100s...", paragraph_text)
             paragraph_norm = normalize_text(paragraph_text)
 
             # --- Локальні дані з абзацу --- 
 
-            # Визначаємо причину повернення
-            # Використовуємо тип, визначений для підсекції
-            current_cause = f"Повернення з {subsection_vacation_type}" 
-            print(f"      Причина: {current_cause}")
+            # Причина повернення - тип, визначений для підсекції
+            logger.debug("Причина: %s", current_cause)
 
-            # Дата повернення (з абзацу)
-            return_date = extract_section_date(paragraph_norm, default_date)
-            print(f"      Дата повернення (з абзацу): {return_date}")
-
-            # Харчування (з абзацу)
-            meal_type, meal_date = extract_meal_info(paragraph_norm, default_meal)
-            print(f"      Харчування (з абзацу): {meal_type}, дата: {meal_date}")
+            # Дата повернення та харчування (з абзацу)
+            return_date, (meal_type, meal_date) = extract_date_and_meal(paragraph_norm, default_date, default_meal)
+            logger.debug("Дата повернення (з абзацу): %s", return_date)
+            logger.debug("Харчування (з абзацу): %s, дата: %s", meal_type, meal_date)
 
             # Локація (зазвичай ППД, але може бути НБ)
             location = determine_paragraph_location(paragraph_norm, location_triggers)
             if not location:
                 location = "ППД" # Стандартно для повернення з відпустки
-                print(f"      Локація не знайдена ні за НБ, ні за тригером, встановлено за замовчуванням: {location}")
+                logger.debug("Локація не знайдена ні за НБ, ні за тригером, встановлено за замовчуванням: %s", location)
 
             # Військовослужбовці (з абзацу)
             military_persons_in_para = extract_military_personnel(paragraph_text, rank_map)
-            print(f"      Знайдено {len(military_persons_in_para)} військовослужбовців в абзаці")
+            logger.debug("Знайдено %d військовослужбовців в абзаці", len(military_persons_in_para))
+
+            # Тип ОС залежить лише від тексту абзацу - визначаємо один раз для всіх осіб
+            if military_persons_in_para:
+                os_type = determine_personnel_type(paragraph_norm)
 
             for person_data in military_persons_in_para:
                 rank = person_data['rank']
                 name = person_data['name']
 
-                # Тип ОС (з абзацу)
-                os_type = determine_personnel_type(paragraph_norm)
-                print(f"         Визначено тип ОС для {rank} {name}: {os_type}")
+                logger.debug("Визначено тип ОС для %s %s: %s", rank, name, os_type)
                 
                 # ВЧ (завжди та, куди повернулись)
-                current_vch_for_person = return_vch
-                print(f"         ВЧ для {rank} {name}: {current_vch_for_person}")
+                logger.debug("ВЧ для %s %s: %s", rank, name, return_vch)
 
                 # Перевірка дублікатів
-                person_id = f"{rank}_{name}"
+                person_id = (rank, name)
                 if person_id in processed_persons:
-                    print(f"      ⚠️ Виявлено дублікат (Vacation): {rank} {name} - пропускаємо!")
+                    logger.debug("⚠️ Виявлено дублікат (Vacation): %s %s - пропускаємо!", rank, name)
                     continue
                     
                 # Створення запису
                 record = create_personnel_record(
                     rank=rank,
                     name=name,
-                    vch=current_vch_for_person,
+                    vch=return_vch,
                     location=location,
                     os_type=os_type,
                     date_k=meal_date or return_date,
@@ -120,12 +145,12 @@ def process_vacation_return(section_text, rank_map, location_triggers, default_d
                 results.append(record)
                 processed_persons.add(person_id)
                 total_found_overall += 1
-                print(f"      ✅ Додано запис (Vacation): {rank} {name}, ВЧ: {record['VCH']}, Локація: {record['location']}, Причина: {record['cause']}")
+                logger.debug("✅ Додано запис (Vacation): %s %s, ВЧ: %s, Локація: %s, Причина: %s", rank, name, record['VCH'], record['location'], record['cause'])
 
             if not military_persons_in_para:
-                 print(f"      Військовослужбовців в цьому абзаці не знайдено.")
+                 logger.debug("Військовослужбовців в цьому абзаці не знайдено.")
 
-    print(f"\nЗагалом знайдено {total_found_overall} записів у секції 'Повернення з відпустки' (Paragraph Mode)")
+    logger.info("Загалом знайдено %d записів у секції 'Повернення з відпустки' (Paragraph Mode)", total_found_overall)
     return results
 
 def determine_vacation_type(section_text):
@@ -5,12 +5,83 @@
 - detect_section_type: Визначає тип секції на основі контексту
 - extract_section_date: Витягує дату з секції
 - extract_meal_info: Витягує інформацію про котлове забезпечення
+- extract_date_and_meal: Дата та харчування абзацу одним (кешованим) викликом
 """
 
+import heapq
+import logging
 import re
+from functools import lru_cache
 from text_processing import normalize_text
 from utils import parse_date
 
+logger = logging.getLogger(__name__)
+
+# Альтернативні маркери секції "З лікувального закладу"
+_HOSPITAL_PATTERNS = [
+    (pattern, re.compile(pattern, re.IGNORECASE)) for pattern in (
+        r'(?:\d+\.\d+\.\s*)?з\s+лікувального\s+закладу',
+        r'(?:\d+\.\d+\.\s*)?з\s+лікарні',
+        r'(?:\d+\.\d+\.\s*)?з\s+медичного\s+закладу',
+        r'(?:\d+\.\d+\.\s*)?з\s+медичного\s+установи',
+    )
+]
+_DEST_UNIT_RE = re.compile(r'до\s+військової\s+частини\s+[АA][-]?\d{4}', re.IGNORECASE)
+_DEST_BATTALION_RE = re.compile(r'до\s+\d+[-]?(?:го|й|й)?\s+навчальн(?:ого|ий)\s+батальйон', re.IGNORECASE)
+# Дата ''DD'' місяць YYYY; перевага - першій даті, після якої йде "року"
+_SECTION_DATE_RE = re.compile(r"''(\d{1,2})''\s+(\w+)\s+(\d{4})")
+_YEAR_WORD_RE = re.compile(r"\s+року")
+# Дата харчування: шаблони в порядку пріоритету, кожен має 3 останні групи для дати
+_MEAL_DATE_RES = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    # Стандартний формат з ''дата''
+    r"(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
+
+    # Формат одразу після "зарахувати на котлове забезпечення"
+    r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+(?:частини|в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу,\s+[\d\w\s]+)?\s+(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
+
+    # Інші варіації запису з "котлове забезпечення"
+    r"котлове\s+забезпечення\s+(?:частини\s+)?(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
+
+    # Запис через кому після частини
+    r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+(?:частини|в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу),\s+[\d\w\s]+\s+(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
+
+    # Загальний патерн з виділенням всієї фрази котлового забезпечення
+    r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+.*?(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
+)]
+_RETURN_DATE_RE = re.compile(r"з\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})\s+року")
+_MEAL_LOCATION_RE = re.compile(r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу,\s+([\d\w\s]+)(?:школи|батальйону)", re.IGNORECASE)
+_SUBSECTION_NUM_RE = re.compile(r'(?:^|\n)\s*(\d+(?:\.\d+)+\.?)\s+', re.MULTILINE)
+_ALT_SUBSECTION_RE = re.compile(r'(?:^|\n)\s*(\d+\.\d+\.\d+)\s+військовослужбовців\s+військової\s+частини', re.MULTILINE)
+_SIMPLE_SUBSECTION_RE = re.compile(r'(?:^|\n)\s*(\d+\.\d+)(?:$|\s|\n)', re.MULTILINE)
+_PARA_SPLIT_RE = re.compile(r'\n\s*\n+')
+
+
+@lru_cache(maxsize=128)
+def _marker_pattern(marker):
+    """
+    Повертає скомпільований шаблон пошуку маркера секції. Кешується:
+    маркери секцій однакові для всіх документів.
+
+    Args:
+        marker (str): Маркер секції (текст або regex)
+
+    Returns:
+        tuple: (скомпільований шаблон, чи був маркер regex-патерном)
+    """
+    # Перевіряємо чи маркер є regex патерном (починається з \d+ або містить regex символи)
+    is_regex = marker.startswith(r'\d+') or '\\d+' in marker or '.*?' in marker or '(?:' in marker
+
+    if is_regex:
+        # Це regex патерн - використовуємо як є
+        pattern = marker
+    else:
+        # Це звичайний текст - екрануємо та додаємо підтримку номерів підпунктів
+        escaped_marker = re.escape(marker.replace(':', ''))
+        # Додаємо підтримку для маркерів, які можуть бути в підпунктах (наприклад, "10.2. З відрядження:")
+        pattern = r'(?:\d+\.\d+\.\s*)?' + escaped_marker
+    return re.compile(pattern, re.IGNORECASE), is_regex
+
+
 def find_sections(text, section_markers):
     """
     Знаходить секції в тексті за заданими маркерами.
@@ -28,25 +99,18 @@ def find_sections(text, section_markers):
     
     # Знайдемо індекси початку кожної секції
     section_starts = []
-    print("\n--- DEBUG: Searching for section markers within the provided text block ---")
+    start_positions = set()  # Позиції з section_starts для швидкої перевірки альтернативних маркерів
+    logger.debug("--- Searching for section markers within the provided text block ---")
     
     for marker, section_type in section_markers:
-        # Перевіряємо чи маркер є regex патерном (починається з \d+ або містить regex символи)
-        is_regex = marker.startswith(r'\d+') or '\\d+' in marker or '.*?' in marker or '(?:' in marker
-        
+        marker_re, is_regex = _marker_pattern(marker)
         if is_regex:
-            # Це regex патерн - використовуємо як є
-            pattern = marker
-            print(f"  Searching with REGEX for Type: '{section_type}', Pattern: '{marker[:50]}...'")
+            logger.debug("Searching with REGEX for Type: '%s', Pattern: '%.50s...'", section_type, marker)
         else:
-            # Це звичайний текст - екрануємо та додаємо підтримку номерів підпунктів
-            escaped_marker = re.escape(marker.replace(':', ''))
-            # Додаємо підтримку для маркерів, які можуть бути в підпунктах (наприклад, "10.2. З відрядження:")
-            pattern = r'(?:\d+\.\d+\.\s*)?' + escaped_marker
-            print(f"  Searching with TEXT for Type: '{section_type}', Marker: '{marker[:50]}...'")
+            logger.debug("Searching with TEXT for Type: '%s', Marker: '%.50s...'", section_type, marker)
         
-        for match in re.finditer(pattern, normalized_text, re.IGNORECASE):
-            print(f"    Found marker '{marker[:50]}...' at relative index: {match.start()}")
+        for match in marker_re.finditer(normalized_text):
+            logger.debug("Found marker '%.50s...' at relative index: %s", marker, match.start())
             
             # Визначення типу відрядження на основі контексту (залишаємо, може бути корисно)
             current_section_type = section_type
@@ -56,29 +120,24 @@ def find_sections(text, section_markers):
                 current_section_type = detect_hospital_section(normalized_text, match.start(), section_type)
                 
             section_starts.append((match.start(), marker, current_section_type))
+            start_positions.add(match.start())
     
     # Додаткова перевірка для секції "З лікувального закладу" (залишаємо)
-    hospital_patterns = [
-        r'(?:\d+\.\d+\.\s*)?з\s+лікувального\s+закладу',
-        r'(?:\d+\.\d+\.\s*)?з\s+лікарні',
-        r'(?:\d+\.\d+\.\s*)?з\s+медичного\s+закладу',
-        r'(?:\d+\.\d+\.\s*)?з\s+медичного\s+установи'
-    ]
-    
-    for pattern in hospital_patterns:
-        for match in re.finditer(pattern, normalized_text, re.IGNORECASE):
-            if not any(start_pos == match.start() for start_pos, _, _ in section_starts):
-                print(f"    Found hospital section with alternative pattern '{pattern}' at relative index: {match.start()}")
+    for pattern, hospital_re in _HOSPITAL_PATTERNS:
+        for match in hospital_re.finditer(normalized_text):
+            if match.start() not in start_positions:
+                logger.debug("Found hospital section with alternative pattern '%s' at relative index: %s", pattern, match.start())
                 section_starts.append((match.start(), pattern, 'Лікарня'))
+                start_positions.add(match.start())
     
-    print(f"--- END DEBUG: Section marker search complete ({len(section_starts)} potential starts found within block) ---")
+    logger.debug("--- Section marker search complete (%d potential starts found within block) ---", len(section_starts))
     
     # Сортуємо знайдені початки секцій за індексом
     section_starts.sort(key=lambda x: x[0])
     
     # Перевірка чи знайдені секції
     if not section_starts:
-        print("Увага: не знайдено жодної відомої секції всередині наданого блоку. Обробляємо весь блок як один розділ.")
+        logger.warning("Увага: не знайдено жодної відомої секції всередині наданого блоку. Обробляємо весь блок як один розділ.")
         # Вирішуємо, який тип присвоїти в такому випадку. Можливо, 'ППОС' або передавати None?
         # Поки що повертаємо як ППОС для сумісності, але це може потребувати уточнення.
         return [('ППОС', normalized_text, 0)]
@@ -93,9 +152,9 @@ def find_sections(text, section_markers):
         
         section_text = normalized_text[start_pos:end_pos]
         sections.append((section_type, section_text, start_pos))
-        print(f"DEBUG: Created section - Type: {section_type}, Relative Start: {start_pos}, Length: {len(section_text)}")
+        logger.debug("Created section - Type: %s, Relative Start: %s, Length: %d", section_type, start_pos, len(section_text))
     
-    print(f"Знайдено {len(sections)} секцій всередині наданого блоку")
+    logger.info("Знайдено %d секцій всередині наданого блоку", len(sections))
     return sections
 
 
@@ -115,30 +174,32 @@ def detect_section_type(text, start_pos, initial_type):
     context_window = 500
     context_end = min(start_pos + context_window, len(text))
     context_text = text[start_pos:context_end]
+    # Нижній регістр вікна контексту обчислюємо один раз для всіх ключових фраз
+    context_lower = context_text.lower()
     
     # Визначаємо чи це навчання чи звичайне відрядження через аналіз контексту
     if initial_type == 'Прибуття у відрядження':
-        if any(phrase in context_text.lower() for phrase in [
+        if any(phrase in context_lower for phrase in [
             "з метою проходження навчання",
             "для проходження навчання",
             "з метою навчання",
             "навчального батальйону",
             "школи індивідуальної підготовки"
         ]):
-            print(f"    Determined as 'Прибуття у відрядження (навчання)' based on context")
+            logger.debug("Determined as 'Прибуття у відрядження (навчання)' based on context")
             return 'Прибуття у відрядження (навчання)'
-        elif any(phrase in context_text.lower() for phrase in [
+        elif any(phrase in context_lower for phrase in [
             "з метою виконання службового завдання",
             "для виконання службового завдання",
             "для виконання службових обов'язків"
         ]):
-            print(f"    Confirmed as 'Прибуття у відрядження' based on context")
+            logger.debug("Confirmed as 'Прибуття у відрядження' based on context")
             return 'Прибуття у відрядження'
-        elif re.search(r'до\s+військової\s+частини\s+[АA][-]?\d{4}', context_text, re.IGNORECASE):
-            print(f"    Determined as 'Прибуття у відрядження' based on destination military unit")
+        elif _DEST_UNIT_RE.search(context_text):
+            logger.debug("Determined as 'Прибуття у відрядження' based on destination military unit")
             return 'Прибуття у відрядження'
-        elif re.search(r'до\s+\d+[-]?(?:го|й|й)?\s+навчальн(?:ого|ий)\s+батальйон', context_text, re.IGNORECASE) or "школи" in context_text.lower():
-            print(f"    Determined as 'Прибуття у відрядження (навчання)' based on destination training battalion")
+        elif _DEST_BATTALION_RE.search(context_text) or "школи" in context_lower:
+            logger.debug("Determined as 'Прибуття у відрядження (навчання)' based on destination training battalion")
             return 'Прибуття у відрядження (навчання)'
     
     return initial_type
@@ -160,6 +221,7 @@ def detect_hospital_section(text, start_pos, initial_type):
     context_window = 500
     context_end = min(start_pos + context_window, len(text))
     context_text = text[start_pos:context_end]
+    context_lower = context_text.lower()
     
     # Перевіряємо наявність ключових слів для підтвердження, що це секція лікувального закладу
     hospital_keywords = [
@@ -173,13 +235,13 @@ def detect_hospital_section(text, start_pos, initial_type):
         "виписний епікриз"
     ]
     
-    if any(keyword in context_text.lower() for keyword in hospital_keywords):
-        print(f"    Confirmed as '{initial_type}' based on hospital keywords")
+    if any(keyword in context_lower for keyword in hospital_keywords):
+        logger.debug("Confirmed as '%s' based on hospital keywords", initial_type)
         return initial_type
     
     # Якщо не знайдено ключових слів, але є маркер "З лікувального закладу", все одно вважаємо це секцією лікарні
-    if "з лікувального закладу" in context_text.lower() or "з лікарні" in context_text.lower():
-        print(f"    Confirmed as '{initial_type}' based on marker")
+    if "з лікувального закладу" in context_lower or "з лікарні" in context_lower:
+        logger.debug("Confirmed as '%s' based on marker", initial_type)
         return initial_type
     
     # Якщо не знайдено підтверджень, повертаємо початковий тип
@@ -201,11 +263,18 @@ def extract_section_date(section_text, default_date=None):
     if isinstance(section_text, tuple) and len(section_text) == 2:
         _, section_text = section_text
     
-    # Пошук дати за різними шаблонами
-    date_match = re.search(r"''(\d{1,2})''\s+(\w+)\s+(\d{4})\s+року", section_text)
-    if not date_match:
-        date_match = re.search(r"''(\d{1,2})''\s+(\w+)\s+(\d{4})", section_text)
-        
+    # Один прохід по датах: перша дата зі словом "року" після неї, інакше просто перша дата
+    date_match = None
+    first_match = None
+    for candidate in _SECTION_DATE_RE.finditer(section_text):
+        if _YEAR_WORD_RE.match(section_text, candidate.end()):
+            date_match = candidate
+            break
+        if first_match is None:
+            first_match = candidate
+    if date_match is None:
+        date_match = first_match
+
     if date_match:
         date_str = f"{date_match.group(1)} {date_match.group(2)} {date_match.group(3)}"
         return parse_date(date_str)
@@ -231,37 +300,23 @@ def extract_meal_info(section_text, default_meal=None):
     # 1. Шукаємо тип харчування простим пошуком тексту
     if "зі сніданку" in normalized_section_text:
         meal_type = "зі сніданку"
-        print("DEBUG: Found 'зі сніданку'")
+        logger.debug("Found 'зі сніданку'")
     elif "з обіду" in normalized_section_text:
         meal_type = "з обіду"
-        print("DEBUG: Found 'з обіду'")
+        logger.debug("Found 'з обіду'")
     elif "з вечері" in normalized_section_text:
         meal_type = "з вечері"
-        print("DEBUG: Found 'з вечері'")
+        logger.debug("Found 'з вечері'")
     else:
-        print("DEBUG: Meal type keyword not found.")
+        logger.debug("Meal type keyword not found.")
 
     # 2. Покращений патерн для пошуку дати, пов'язаної з харчуванням
-    # Врахування різних форматів запису з "зарахувати на котлове забезпечення"
-    date_patterns = [
-        # Стандартний формат з ''дата''
-        r"(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
-        
-        # Формат одразу після "зарахувати на котлове забезпечення"
-        r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+(?:частини|в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу,\s+[\d\w\s]+)?\s+(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
-        
-        # Інші варіації запису з "котлове забезпечення"
-        r"котлове\s+забезпечення\s+(?:частини\s+)?(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
-        
-        # Запис через кому після частини
-        r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+(?:частини|в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу),\s+[\d\w\s]+\s+(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})",
-        
-        # Загальний патерн з виділенням всієї фрази котлового забезпечення
-        r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+.*?(?:зі|з)\s+(?:сніданку|вечері|обіду)\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})"
-    ]
-    
-    for pattern in date_patterns:
-        date_match = re.search(pattern, section_text, re.IGNORECASE)
+    # Врахування різних форматів запису з "зарахувати на котлове забезпечення" (див. _MEAL_DATE_RES)
+    # Усі шаблони дати (і запасний _RETURN_DATE_RE) вимагають дату в подвійних апострофах ''DD'':
+    # якщо їх у тексті немає, регулярні вирази не запускаємо
+    date_res = _MEAL_DATE_RES if "''" in section_text else ()
+    for date_re in date_res:
+        date_match = date_re.search(section_text)
         if date_match:
             # Всі патерни повинні мати 3 групи для дати
             if len(date_match.groups()) >= 3:
@@ -271,7 +326,7 @@ def extract_meal_info(section_text, default_meal=None):
                 date_month = groups[-2]
                 date_year = groups[-1]
                 meal_date = parse_date(f"{date_day} {date_month} {date_year}")
-                print(f"DEBUG: Found meal date: {meal_date}")
+                logger.debug("Found meal date: %s", meal_date)
                 
                 # Якщо ми не знайшли тип харчування в п.1, але знайшли тут, то витягуємо його з контексту
                 if not meal_type:
@@ -282,30 +337,47 @@ def extract_meal_info(section_text, default_meal=None):
                         meal_type = "з обіду" 
                     elif "з вечері" in meal_context:
                         meal_type = "з вечері"
-                    print(f"DEBUG: Extracted meal type from context: {meal_type}")
+                    logger.debug("Extracted meal type from context: %s", meal_type)
                 
                 break  # Знайшли дату, виходимо з циклу
     
     if not meal_date:
-        print("DEBUG: Meal date pattern not found.")
+        logger.debug("Meal date pattern not found.")
         # Спробуємо знайти хоча б дату повернення з лікарні, якщо немає конкретної дати котлового
-        date_match = re.search(r"з\s+''(\d{1,2})''\s+(\w+)\s+(\d{4})\s+року", section_text)
+        date_match = _RETURN_DATE_RE.search(section_text) if date_res else None
         if date_match:
             meal_date = parse_date(f"{date_match.group(1)} {date_match.group(2)} {date_match.group(3)}")
-            print(f"DEBUG: Fallback to return date: {meal_date}")
+            logger.debug("Fallback to return date: %s", meal_date)
     
     # 3. Витягуємо додаткову інформацію про місце харчування для контексту
     # Може бути використано для визначення локації, якщо необхідно
-    location_match = re.search(r"зарахувати\s+на\s+котлов(?:е|ого)\s+забезпечення\s+в\s+місці\s+тимчасового\s+розміщення\s+особового\s+складу,\s+([\d\w\s]+)(?:школи|батальйону)", section_text, re.IGNORECASE)
+    location_match = _MEAL_LOCATION_RE.search(section_text)
     if location_match:
         meal_location = location_match.group(1).strip()
-        print(f"DEBUG: Found meal location: {meal_location}")
+        logger.debug("Found meal location: %s", meal_location)
     
     # Повертаємо знайдений тип харчування та дату (або стандартні значення)
-    print(f"DEBUG: Returning meal info - Type: {meal_type}, Date: {meal_date}")
+    logger.debug("Returning meal info - Type: %s, Date: %s", meal_type, meal_date)
     return (meal_type, meal_date)
 
 
+@lru_cache(maxsize=1024)
+def extract_date_and_meal(text, default_date=None, default_meal=None):
+    """
+    Повертає дату та харчування для тексту абзацу одним викликом.
+    Кешується, бо однакові абзаци-шаблони часто повторюються в наказі.
+
+    Args:
+        text (str): Текст абзацу (нормалізований)
+        default_date (str, optional): Стандартна дата, якщо не знайдено.
+        default_meal (str, optional): Стандартне харчування, якщо не знайдено.
+
+    Returns:
+        tuple: (дата, (тип_харчування, дата_харчування))
+    """
+    return extract_section_date(text, default_date), extract_meal_info(text, default_meal)
+
+
 def split_section_into_subsections(section_text, section_type=None):
     """
     Розділяє текст секції на підсекції за маркерами типу '1.2.3.' або '11.2.1' або '11.9' на початку рядка.
@@ -321,24 +393,26 @@ def split_section_into_subsections(section_text, section_type=None):
               де список_рядків_абзаців_цієї_підсекції - це list[str], кожен str - текст абзацу.
     """
     # НЕ викликаємо normalize_text тут, щоб зберегти \n для MULTILINE
-    print(f"DEBUG (split_section): Input text length (raw): {len(section_text)}")
+    logger.debug("split_section: Input text length (raw): %d", len(section_text))
     if len(section_text) > 0:
-        print(f"DEBUG: First 100 chars (raw): {section_text[:100]}")
+        logger.debug("First 100 chars (raw): %.100s", section_text)
 
     # Покращуємо патерн, щоб він краще обробляв X.Y.Z формат у військових наказах
     # Та підтримував варіації у форматуванні номерів (з чи без крапки в кінці)
-    subsection_numbers_pattern = r'(?:^|\n)\s*(\d+(?:\.\d+)+\.?)\s+'
-    subsection_numbers = list(re.finditer(subsection_numbers_pattern, section_text, re.MULTILINE))
+    subsection_numbers = _SUBSECTION_NUM_RE.finditer(section_text)
 
     # Доповнюємо патерн для знаходження секцій типу "11.9.1 військовослужбовців військової частини..."
-    alt_subsection_pattern = r'(?:^|\n)\s*(\d+\.\d+\.\d+)\s+військовослужбовців\s+військової\s+частини'
-    alt_subsection_matches = list(re.finditer(alt_subsection_pattern, section_text, re.MULTILINE))
+    # Шаблон вимагає слово "військовослужбовців": без нього другий прохід по тексту не потрібен
+    if 'військовослужбовців' in section_text:
+        alt_subsection_matches = list(_ALT_SUBSECTION_RE.finditer(section_text))
+    else:
+        alt_subsection_matches = []
     
     # Перевіряємо, чи знайдено якісь додаткові підсекції за альтернативним патерном
     if alt_subsection_matches:
-        print(f"DEBUG (split_section): Found {len(alt_subsection_matches)} additional subsections with alt pattern.")
-        subsection_numbers.extend(alt_subsection_matches)
-        subsection_numbers.sort(key=lambda match: match.start())
+        logger.debug("split_section: Found %d additional subsections with alt pattern.", len(alt_subsection_matches))
+        # Обидва потоки вже впорядковані за позицією: зливаємо їх без проміжного списку
+        subsection_numbers = heapq.merge(subsection_numbers, alt_subsection_matches, key=lambda match: match.start())
 
     positions = []
     number_texts = []
@@ -353,29 +427,23 @@ def split_section_into_subsections(section_text, section_type=None):
             number_texts.append(num_group)
             match_ends.append(match.end()) # Use end of the full match for text slicing
         else:
-             print(f"DEBUG (split_section): Match found but group 1 (number) is empty. Match: {match.group(0)}")
+             logger.debug("split_section: Match found but group 1 (number) is empty. Match: %s", match.group(0))
 
-    print(f"DEBUG (split_section): Found {len(positions)} subsection numbers: {number_texts}")
+    logger.debug("split_section: Found %d subsection numbers: %s", len(positions), number_texts)
 
     # Якщо не знайдено жодного номера підсекції, спробуємо знайти за іншим форматом
     if not positions:
-        # Простий патерн для знаходження чисел типу "11.8", "11.9" на початку рядка
-        simple_section_pattern = r'(?:^|\n)\s*(\d+\.\d+)(?:$|\s|\n)'
-        simple_matches = list(re.finditer(simple_section_pattern, section_text, re.MULTILINE))
-        
-        if simple_matches:
-            print(f"DEBUG (split_section): Found {len(simple_matches)} simple subsections like X.Y")
-            
-            for match in simple_matches:
-                num_group = match.group(1)
-                if num_group:
-                    positions.append(match.start(1))
-                    number_texts.append(num_group)
-                    match_ends.append(match.end())
-
-            if positions: # If we found matches with this pattern
-                combined = sorted(zip(positions, number_texts, match_ends), key=lambda x: x[0])
-                positions, number_texts, match_ends = zip(*combined)
+        # Простий патерн для знаходження чисел типу "11.8", "11.9" на початку рядка.
+        # finditer повертає збіги за зростанням позиції, тож сортувати не потрібно
+        for match in _SIMPLE_SUBSECTION_RE.finditer(section_text):
+            num_group = match.group(1)
+            if num_group:
+                positions.append(match.start(1))
+                number_texts.append(num_group)
+                match_ends.append(match.end())
+
+        if positions:
+            logger.debug("split_section: Found %d simple subsections like X.Y", len(positions))
 
     # Якщо все ще не знайдено жодного номера підсекції
     if not positions:
@@ -384,13 +452,13 @@ def split_section_into_subsections(section_text, section_type=None):
             # ... (логіка для повернення з відрядження залишається)
             pass # Залишимо як є, можливо, не потребує нормалізації тут
 
-        print("DEBUG (split_section): No subsection numbers found, processing whole section.")
+        logger.debug("split_section: No subsection numbers found, processing whole section.")
         # Split the entire section text into paragraphs
         # Using regex to split by one or more newlines, potentially surrounded by whitespace
-        paragraphs = [p.strip() for p in re.split(r'\n\s*\n+', section_text) if p.strip()]
+        paragraphs = [p.strip() for p in _PARA_SPLIT_RE.split(section_text) if p.strip()]
         if not paragraphs and section_text.strip(): # Handle case of single paragraph section
              paragraphs = [section_text.strip()]
-        print(f"DEBUG (split_section): Whole section split into {len(paragraphs)} paragraphs.")
+        logger.debug("split_section: Whole section split into %d paragraphs.", len(paragraphs))
         return [(None, paragraphs)] # Return paragraphs for the single, non-numbered section
 
     # --- Main Logic for Splitting Subsections and Paragraphs ---
@@ -422,16 +490,16 @@ def split_section_into_subsections(section_text, section_type=None):
         if raw_subsection_text:
             # Split the raw subsection text into paragraphs
             # Using regex to split by one or more newlines, potentially surrounded by whitespace
-            paragraphs = [p.strip() for p in re.split(r'\n\s*\n+', raw_subsection_text) if p.strip()]
+            paragraphs = [p.strip() for p in _PARA_SPLIT_RE.split(raw_subsection_text) if p.strip()]
 
             if not paragraphs and raw_subsection_text: # Handle single paragraph subsections
                 paragraphs = [raw_subsection_text]
 
             if paragraphs: # Only add if there are non-empty paragraphs
                  subsections_with_paragraphs.append((subsection_number, paragraphs))
-                 print(f"DEBUG (split_section): Added subsection {subsection_number}. Found {len(paragraphs)} paragraphs. First para starts: '{paragraphs[0][:50]}...'")
+                 logger.debug("split_section: Added subsection %s. Found %s paragraphs. First para starts: '%.50s...'", subsection_number, len(paragraphs), paragraphs[0])
             else:
-                 print(f"DEBUG (split_section): Subsection {subsection_number} resulted in no paragraphs after splitting.")
+                 logger.debug("split_section: Subsection %s resulted in no paragraphs after splitting.", subsection_number)
 
-    print(f"DEBUG (split_section): Returning {len(subsections_with_paragraphs)} subsections with paragraphs.")
+    logger.debug("split_section: Returning %d subsections with paragraphs.", len(subsections_with_paragraphs))
     return subsections_with_paragraphs 
\ No newline at end of file
@@ -7,8 +7,19 @@
 - get_subsection_cause: Визначає причину на основі тексту підрозділу
 """
 
+import logging
 import re
+from functools import lru_cache
 
+logger = logging.getLogger(__name__)
+
+# Послідовності горизонтальних пробілів, крім одиночного пробілу (його заміна нічого не змінює)
+_HORIZONTAL_SPACE_RE = re.compile(r'\t[ \t]*| [ \t]+')
+# Типографські лапки -> прямі (один прохід str.translate замість regex)
+_QUOTES_TABLE = str.maketrans({'«': '"', '»': '"', '„': '"'})
+
+
+@lru_cache(maxsize=4096)
 def normalize_text(text):
     """
     Нормалізує текст для надійного пошуку:
@@ -16,6 +27,8 @@ def normalize_text(text):
     - Зберігає переноси рядків (\n)
     - Нормалізує лапки
     - Прибирає зайві пробіли на початку та в кінці рядків та всього тексту
+
+    Результат кешується: однакові абзаци-шаблони в наказі нормалізуються один раз.
     
     Args:
         text (str): Текст для нормалізації
@@ -30,17 +43,14 @@ def normalize_text(text):
     normalized = text.replace('\r\n', '\n').replace('\r', '\n')
     
     # Замінюємо множинні горизонтальні пробіли (пробіл, таб) на один пробіл
-    normalized = re.sub(r'[ \t]+', ' ', normalized)
+    normalized = _HORIZONTAL_SPACE_RE.sub(' ', normalized)
     
     # Видаляємо пробіли на початку/кінці кожного рядка (після заміни табів)
-    lines = normalized.split('\n')
-    stripped_lines = [line.strip() for line in lines]
-    # Видаляємо порожні рядки, що могли утворитися
-    non_empty_lines = [line for line in stripped_lines if line]
-    normalized = '\n'.join(non_empty_lines)
+    # та порожні рядки, що могли утворитися, - одним проходом
+    normalized = '\n'.join([line for line in map(str.strip, normalized.split('\n')) if line])
     
     # Нормалізація лапок (різні типи лапок на стандартні)
-    normalized = re.sub(r'[«»""„"]', '"', normalized)
+    normalized = normalized.translate(_QUOTES_TABLE)
     
     # Прибираємо пробіли на початку та в кінці всього тексту (на випадок, якщо текст був порожнім)
     normalized = normalized.strip()
@@ -48,6 +58,18 @@ def normalize_text(text):
     return normalized
 
 
+# Фрази для should_exclude_record (у нижньому регістрі)
+_RELEASED_FROM_DUTY_PHRASES = (
+    "звільнені від виконання службових обов'язків",
+    "звільнений від виконання службових обов'язків",
+)
+# "зарахувати на котлове забезпечення" містить "на котлове забезпечення", тож окремо не перевіряється
+_KOTLOVE_PHRASES = (
+    "на котлове забезпечення",
+    "котлове забезпечення зарахувати",
+)
+
+
 def should_exclude_record(entry_text, section_text):
     """
     Перевіряє, чи запис слід виключити на основі відсутності інформації про котлове забезпечення.
@@ -60,22 +82,19 @@ def should_exclude_record(entry_text, section_text):
     Returns:
         bool: True якщо запис слід виключити, False якщо обробляти
     """
+    section_lower = section_text.lower()
+
     # Перевіряємо, чи є запис в секції звільнених від виконання службових обов'язків
-    if "звільнені від виконання службових обов'язків" in section_text.lower() or "звільнений від виконання службових обов'язків" in section_text.lower():
+    if any(phrase in section_lower for phrase in _RELEASED_FROM_DUTY_PHRASES):
         return True
         
-    # Перевіряємо, чи є в записі або загальному контексті згадка про зарахування на котлове забезпечення
-    has_kotlove_in_entry = any(phrase in entry_text.lower() for phrase in [
-        "зарахувати на котлове забезпечення", 
-        "котлове забезпечення зарахувати",
-        "на котлове забезпечення"
-    ])
-    
-    has_kotlove_in_section = any(phrase in section_text.lower() for phrase in [
-        "зарахувати на котлове забезпечення", 
-        "котлове забезпечення зарахувати",
-        "на котлове забезпечення"
-    ])
+    # Перевіряємо, чи є в загальному контексті та в записі згадка про зарахування на котлове забезпечення.
+    # Запис перевіряємо лише тоді, коли від нього залежить результат
+    has_kotlove_in_section = any(phrase in section_lower for phrase in _KOTLOVE_PHRASES)
+    has_kotlove_in_entry = False
+    if has_kotlove_in_section:
+        entry_lower = entry_text.lower()
+        has_kotlove_in_entry = any(phrase in entry_lower for phrase in _KOTLOVE_PHRASES)
     
     # Виключаємо запис, якщо:
     # - В секції згадується котлове забезпечення, але не для цього конкретного запису
@@ -89,6 +108,38 @@ def should_exclude_record(entry_text, section_text):
     return False
 
 
+@lru_cache(maxsize=64)
+def _numbered_header_pattern(header):
+    """
+    Повертає скомпільований шаблон заголовка, перед яким може стояти номер
+    пункту ("X.Y." або "X.Y.Z."). Кешується: заголовки секцій
+    однакові для всіх документів.
+
+    Args:
+        header (str): Текст заголовка
+
+    Returns:
+        re.Pattern: Шаблон; група 4 - сам заголовок
+    """
+    return re.compile(rf"(^|\n)\s*(\d+\.\d+(\.\d+)?\.?\s*)?({re.escape(header)})")
+
+
+# Маркери секцій, що можуть іти після секції, вміст якої видаляється
+_NEXT_SECTION_MARKERS = (
+    'Відповідно до мобілізаційного призначення',
+    'З відрядження',
+    'З частини щорічної основної відпустки',
+    'З відпустки за сімейними обставинами',
+    'З відпустки для лікування',
+    'з лікувального закладу', # Note lowercase
+    'Нижчепойменованих військовослужбовців вважати такими, що прибули у службове відрядження',
+    'Вважати такими, що вибули',
+)
+_NEXT_SECTION_RE = re.compile(
+    r"(^|\n)\s*(\d+\.\d+(\.\d+)?\.?\s*)?(" + "|".join(re.escape(marker) for marker in _NEXT_SECTION_MARKERS) + ")"
+)
+
+
 def remove_section_content(text, section_header):
     """
     Видаляє вміст секції, залишаючи її заголовок.
@@ -102,68 +153,46 @@ def remove_section_content(text, section_header):
     """
     # Використовуємо регулярний вираз для пошуку заголовка
     # Заголовок може бути з номером (e.g., "11.7. ") або без
-    escaped_header = re.escape(section_header)
     # Regex to find the header, optionally preceded by "X.Y." or "X.Y.Z." and whitespace
-    header_pattern = rf"(^|\n)\s*(\d+\.\d+(\.\d+)?\.?\s*)?({escaped_header})"
+    header_pattern = _numbered_header_pattern(section_header)
     
-    match = re.search(header_pattern, text)
+    match = header_pattern.search(text)
     
     if not match:
-        print(f"DEBUG: Заголовок секції для видалення контенту не знайдено за патерном: '{section_header}'")
+        logger.debug("Заголовок секції для видалення контенту не знайдено за патерном: '%s'", section_header)
         return text # Повертаємо оригінальний текст, якщо заголовок не знайдено
 
     start_idx = match.start() # Start of the entire matched pattern (including potential newline)
     actual_header_start_idx = match.start(4) # Start of the captured header text itself
     full_header_text = match.group(0).strip() # Get the full matched header including number
 
-    print(f"DEBUG: Знайдено заголовок '{full_header_text}' для видалення контенту на позиції {actual_header_start_idx}")
+    logger.debug("Знайдено заголовок '%s' для видалення контенту на позиції %s", full_header_text, actual_header_start_idx)
 
     # Знаходимо кінець заголовка (перший перенос рядка після повного знайденого заголовка)
-    header_end_idx = text.find('\n', actual_header_start_idx + len(section_header))
+    header_end_idx = text.find('\n', match.end(4))
     if header_end_idx == -1:
         # Якщо переносу рядка немає, можливо це кінець тексту
-        print(f"DEBUG: Не знайдено кінець заголовка (перенос рядка) після '{full_header_text}'")
+        logger.debug("Не знайдено кінець заголовка (перенос рядка) після '%s'", full_header_text)
         return text
         
     content_start_idx = header_end_idx + 1
 
-    # Шукаємо початок НАСТУПНОЇ секції
-    # Використовуємо ті ж маркери
-    next_section_markers = [
-        'Відповідно до мобілізаційного призначення',
-        'З відрядження',
-        'З частини щорічної основної відпустки',
-        'З відпустки за сімейними обставинами',
-        'З відпустки для лікування',
-        'з лікувального закладу', # Note lowercase
-        'Нижчепойменованих військовослужбовців вважати такими, що прибули у службове відрядження',
-        'Вважати такими, що вибули' 
-    ]
-    
+    # Шукаємо найближчий маркер НАСТУПНОЇ секції ПІСЛЯ початку поточного контенту:
+    # одна альтернація знаходить найраніший з усіх маркерів за один прохід
     content_end_idx = len(text) # За замовчуванням - кінець тексту
     found_next_marker = False
 
-    # Шукаємо найближчий маркер НАСТУПНОЇ секції ПІСЛЯ початку поточного контенту
-    for marker in next_section_markers:
-        # Екрануємо маркер і шукаємо його, можливо, з номером попереду
-        escaped_marker = re.escape(marker)
-        marker_pattern = rf"(^|\n)\s*(\d+\.\d+(\.\d+)?\.?\s*)?({escaped_marker})"
-        marker_match = re.search(marker_pattern, text[content_start_idx:])
-        
-        if marker_match:
-            # Знайшли потенційний початок наступної секції
-            # marker_idx - це позиція відносно content_start_idx
-            marker_idx_relative = marker_match.start()
-            marker_idx_absolute = content_start_idx + marker_idx_relative
-
-            # Обираємо найближчий
-            if marker_idx_absolute < content_end_idx:
-                content_end_idx = marker_idx_absolute
-                found_next_marker = True
-                print(f"DEBUG: Знайдено маркер наступної секції '{marker_match.group(4)}' на позиції {marker_idx_absolute}")
+    # Пошук без копії хвоста тексту. Починаємо з переносу рядка після заголовка, бо
+    # '^' не спрацьовує на позиції pos: маркер одразу на наступному рядку знаходиться
+    # через '\n', а контент у такому разі порожній (починається з content_start_idx)
+    marker_match = _NEXT_SECTION_RE.search(text, header_end_idx)
+    if marker_match:
+        content_end_idx = max(marker_match.start(), content_start_idx)
+        found_next_marker = True
+        logger.debug("Знайдено маркер наступної секції '%s' на позиції %s", marker_match.group(4), content_end_idx)
 
     if not found_next_marker:
-        print(f"DEBUG: Не знайдено чіткого маркера наступної секції після '{full_header_text}'. Видаляємо до кінця тексту.")
+        logger.debug("Не знайдено чіткого маркера наступної секції після '%s'. Видаляємо до кінця тексту.", full_header_text)
         # Якщо маркер наступної секції не знайдено, видаляємо все до кінця тексту.
 
     # Формуємо новий текст: частина до початку знайденого повного заголовка + сам повний заголовок + частина після контенту
@@ -175,65 +204,31 @@ def remove_section_content(text, section_header):
     # Збираємо текст
     cleaned_text = text_before_header + header_with_newline + text_after_content
     
-    print(f"DEBUG: Видалено контент секції '{section_header}' (приблизно {content_end_idx - content_start_idx} символів)")
+    logger.debug("Видалено контент секції '%s' (приблизно %s символів)", section_header, content_end_idx - content_start_idx)
     
     return cleaned_text
 
 
+# Підстава за типом секції. Ключові фрази секції на результат не впливають:
+# для кожного типу підстава при збігу фраз збігається з підставою без них
+_CAUSE_BY_SECTION_TYPE = {
+    "Відрядження": "з Відрядження",
+    "Лікарня": "з Лікарні",
+    "Відпустка": "з Відпустки",
+}
+
+
 def get_subsection_cause(section_text, section_type="ППОС", full_text_context=""):
     """
-    Визначає підставу (cause) відповідно до підрозділу документа.
+    Визначає підставу (cause) за типом секції, в якій знаходиться запис.
     
     Args:
-        section_text (str): Текст розділу для аналізу
+        section_text (str): Текст розділу. Не використовується, залишений для сумісності викликів
         section_type (str): Тип секції, в якій знаходиться запис (використовується як пріоритетне значення)
-        full_text_context (str): Повний контекст для додаткового аналізу
+        full_text_context (str): Повний контекст. Не використовується, залишений для сумісності викликів
     
     Returns:
         str: Визначена підстава
     """
-    # Нормалізуємо текст для пошуку
-    normalized_text = normalize_text(section_text.lower())
-    
-    # 1. Пріоритет базується на контексті запису та типі секції
-    
-    # Особливі випадки для кожної секції, які мають найвищий пріоритет
-    if section_type == "ППОС" and ("відповідно до мобілізаційного призначення" in normalized_text or 
-                                   "за мобілізаційним планом" in normalized_text):
-        return "ППОС"
-    
-    if section_type == "Відрядження" and ("з військової частини" in normalized_text or 
-                                          "з відрядження" in normalized_text or
-                                          "посвідчення про відрядження" in normalized_text):
-        return "з Відрядження"
-        
-    if section_type == "Прибуття у відрядження (навчання)" and ("відрядження" in normalized_text and 
-                                                                "навчання" in normalized_text and
-                                                                "вважати такими, що прибули у службове відрядження" in normalized_text):
-        return "Прибуття у відрядження (навчання)"
-    
-    if section_type == "Відпустка" and ("відпустка" in normalized_text or 
-                                       "відпускний квиток" in normalized_text):
-        return "з Відпустки"
-    
-    if section_type == "Лікарня" and ("лікувальний заклад" in normalized_text or 
-                                     "лікарня" in normalized_text or
-                                     "виписний епікриз" in normalized_text):
-        return "з Лікарні"
-    
-    if section_type == "Хвороба" and ("звільнені від виконання службових обов'язків" in normalized_text or 
-                                     "звільнений від виконання службових обов'язків" in normalized_text):
-        return "Хвороба"
-    
-    if section_type == "Прибуття у відрядження" and ("відрядження" in normalized_text):
-        return "Прибуття у відрядження"
-    
-    # 2. Якщо нічого не знайдено, використовуємо тип секції як підставу з модифікаціями
-    if section_type == "Відрядження":
-        return "з Відрядження"
-    elif section_type == "Лікарня":
-        return "з Лікарні"
-    elif section_type == "Відпустка":
-        return "з Відпустки"
-    else:
-        return section_type 
\ No newline at end of file
+    # Тип секції використовується як підстава з модифікаціями
+    return _CAUSE_BY_SECTION_TYPE.get(section_type, section_type)
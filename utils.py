@@ -1,13 +1,22 @@
 # utils.py
 import docx
+from docx.enum.text import WD_COLOR_INDEX
+import logging
 import re
-import pandas as pd
 import os
 import json
 from datetime import datetime
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
+from operator import attrgetter
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
 from openpyxl.utils import get_column_letter
+
+logger = logging.getLogger(__name__)
+
+# Кольори виділення прізвищ: червоний - виключити, зелений - зарахувати
+_HIGHLIGHT_REMOVE = WD_COLOR_INDEX.RED
+_HIGHLIGHT_ADD = WD_COLOR_INDEX.BRIGHT_GREEN
+
 # Відкладений імпорт stanza - завантажується тільки коли потрібно
 nlp_uk = None
 
@@ -25,21 +34,13 @@ def get_stanza_pipeline():
             nlp_uk = False
     return nlp_uk if nlp_uk != False else None
 
-def load_doc(file_path):
-    """Завантаження документа Word."""
-    try:
-        return docx.Document(file_path)
-    except Exception as e:
-        print(f"Помилка завантаження документа {file_path}: {e}")
-        return None
-
 def load_ranks(file_path="ranks.txt"):
     """Зчитування звань з файлу та мапування їх на базову форму."""
     rank_map = {}
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
             for line in file:
-                forms = [r.strip() for r in line.strip().split(",") if r.strip()]
+                forms = [r for r in map(str.strip, line.split(",")) if r]
                 if forms:
                     base = forms[0]  # нормалізована форма
                     for f in forms:
@@ -61,6 +62,17 @@ def load_locations(file_path="locations.txt"):
         print(f"Помилка зчитування локацій з файлу {file_path}: {e}")
     return locations
 
+# Номери українських місяців у родовому відмінку
+_MONTHS = {
+    'січня': '01', 'лютого': '02', 'березня': '03', 'квітня': '04',
+    'травня': '05', 'червня': '06', 'липня': '07', 'серпня': '08',
+    'вересня': '09', 'жовтня': '10', 'листопада': '11', 'грудня': '12'
+}
+_DATE_QUOTES_TABLE = str.maketrans({'«': ' ', '»': ' ', '"': ' ', '„': ' '})
+_DATE_TEXT_RE = re.compile(r'(\d{1,2})\s+(\w+)\s+(\d{4})') # "число місяць рік"
+# "N-го навчального батальйону" - пріоритетна локація абзацу
+_NB_RE = re.compile(r'(\d+)[\s-]?(?:го|й|ї)?\s+навчальн(?:ого|ий|ому)\s+батальйон(?:у)?', re.IGNORECASE)
+
 def parse_date(date_text):
     """
     Розбирає дату з тексту у формат DD.MM.YYYY.
@@ -74,54 +86,69 @@ def parse_date(date_text):
     if not date_text:
         return None
     
-    # Словник відповідності українських місяців до номерів
-    months = {
-        'січня': '01', 'лютого': '02', 'березня': '03', 'квітня': '04',
-        'травня': '05', 'червня': '06', 'липня': '07', 'серпня': '08',
-        'вересня': '09', 'жовтня': '10', 'листопада': '11', 'грудня': '12'
-    }
-    
     # Замінюємо спеціальні символи на пробіли
-    date_text = re.sub(r'[«»""„"]', ' ', date_text)
+    date_text = date_text.translate(_DATE_QUOTES_TABLE)
     
     # Шукаємо у форматі "число місяць рік"
-    match = re.search(r'(\d{1,2})\s+(\w+)\s+(\d{4})', date_text)
+    match = _DATE_TEXT_RE.search(date_text)
     
     if match:
-        day = match.group(1).zfill(2)  # день з провідним нулем
-        month_name = match.group(2).lower()
-        year = match.group(3)
-        
-        # Знаходимо номер місяця
-        if month_name in months:
-            month = months[month_name]
-            return f"{day}.{month}.{year}"
+        return parse_date_parts(*match.groups())
     
     return None
 
+def parse_date_parts(day, month_name, year):
+    """
+    Формує дату DD.MM.YYYY з уже виділених дня, назви місяця та року.
+    Для дня з 1-2 цифр, місяця-слова та року з 4 цифр результат збігається з
+    parse_date(f"{day} {month_name} {year}"), але без повторного розбору рядка.
+    
+    Args:
+        day (str): День (1-2 цифри)
+        month_name (str): Назва місяця в родовому відмінку
+        year (str): Рік (4 цифри)
+        
+    Returns:
+        str: Дата у форматі DD.MM.YYYY або None, якщо місяць не розпізнано
+    """
+    month = _MONTHS.get(month_name.lower())
+    if month is None:
+        return None
+    return f"{day.zfill(2)}.{month}.{year}"
+
 def save_to_excel_append(data, output_path="results.xlsx"):
-    """Збереження результатів в Excel. Якщо файл існує – додаються нові рядки."""
+    """Збереження результатів в Excel. Якщо файл існує – додаються нові рядки.
+
+    Книга відкривається один раз: рядки дописуються через openpyxl (без повного
+    перечитування через pandas), форматування застосовується перед тим самим збереженням."""
     columns = ["rank", "name", "VCH", "location", "OS", "date_k", "meal", "cause", "action"]
-    new_df = pd.DataFrame(data, columns=columns)
+    wb = None
     if os.path.exists(output_path):
         try:
-            existing_df = pd.read_excel(output_path)
-            final_df = pd.concat([existing_df, new_df], ignore_index=True)
+            wb = load_workbook(output_path)
         except Exception as e:
             print(f"Помилка при завантаженні існуючих даних: {e}")
-            final_df = new_df
-    else:
-        final_df = new_df
+    if wb is None:
+        wb = Workbook()
+        wb.active.append(columns)
+    ws = wb.active
+
+    # Рядки записуються за заголовками файлу; відсутні в ньому колонки додаються в кінець
+    headers = [cell.value for cell in ws[1]]
+    for column in columns:
+        if column not in headers:
+            ws.cell(row=1, column=len(headers) + 1, value=column)
+            headers.append(column)
+    # Заголовок жирним, як його записував pandas
+    for cell in ws[1]:
+        cell.font = Font(bold=True)
+    for record in data:
+        ws.append([record.get(header) for header in headers])
 
     try:
-        final_df.to_excel(output_path, index=False)
+        _format_worksheet(ws)
+        wb.save(output_path)
         print(f"Результати успішно збережено в {output_path}")
-        
-        # Застосовуємо форматування до файлу Excel
-        if format_excel_file(output_path):
-            print(f"Форматування успішно застосовано до {output_path}")
-        else:
-            print(f"Не вдалося застосувати форматування до {output_path}")
     except Exception as e:
         print(f"Помилка при збереженні в Excel: {e}")
 
@@ -140,25 +167,26 @@ def determine_paragraph_location(paragraph_norm, location_triggers):
         str: Знайдена локація ("N НБ" або за тригером) або None.
     """
     # 1. Пріоритетний пошук "N навчального батальйону"
-    nb_match = re.search(r'(\d+)[\s-]?(?:го|й|ї)?\s+навчальн(?:ого|ий|ому)\s+батальйон(?:у)?', paragraph_norm, re.IGNORECASE)
+    nb_match = _NB_RE.search(paragraph_norm)
     if nb_match:
         location = f"{nb_match.group(1)} НБ"
-        print(f"      DEBUG (determine_location): Знайдено пріоритетну локацію НБ: {location}")
+        logger.debug("determine_location: Знайдено пріоритетну локацію НБ: %s", location)
         return location
 
     # 2. Якщо НБ не знайдено, використовуємо загальні тригери
     location = extract_location(paragraph_norm, location_triggers)
     if location:
-        print(f"      DEBUG (determine_location): Знайдено локацію за тригером: {location}")
+        logger.debug("determine_location: Знайдено локацію за тригером: %s", location)
         return location
 
     # 3. Якщо нічого не знайдено
-    print(f"      DEBUG (determine_location): Локація не знайдена ні за НБ, ні за тригерами.")
+    logger.debug("determine_location: Локація не знайдена ні за НБ, ні за тригерами.")
     return None
 
 def extract_location(text, location_triggers):
     """
     Витягує локацію з тексту на основі тригерних фраз.
+    Пріоритет має перша локація словника, для якої знайдено будь-який тригер.
     
     Args:
         text (str): Текст для аналізу
@@ -173,7 +201,7 @@ def extract_location(text, location_triggers):
     for location, triggers in location_triggers.items():
         for trigger in triggers:
             if trigger.lower() in normalized_text:
-                print(f"DEBUG: Found location trigger '{trigger}' for location '{location}'")
+                logger.debug("Found location trigger '%s' for location '%s'", trigger, location)
                 return location
     
     return None
@@ -226,17 +254,32 @@ def load_doc(file_path):
     """
     try:
         doc = docx.Document(file_path)
-        full_text = []
-        
-        for para in doc.paragraphs:
-            full_text.append(para.text)
-            
-        return '\n'.join(full_text)
+        return '\n'.join(map(attrgetter('text'), doc.paragraphs))
     except Exception as e:
         print(f"Помилка при завантаженні документа: {e}")
         return ""
 
-def format_excel_file(excel_file_path):
+def excel_column_widths(df):
+    """
+    Обчислює довжину найдовшого значення кожної колонки (разом із заголовком)
+    ще до запису DataFrame в Excel, щоб format_excel_file не перечитував усі клітинки.
+    Порожні значення (None, NaN, '') не враховуються - як і порожні клітинки файлу.
+
+    Args:
+        df (pd.DataFrame): Дані, що записуються в Excel
+
+    Returns:
+        dict: {назва_колонки: довжина найдовшого значення}
+    """
+    widths = {}
+    for column in df.columns:
+        values = df[column]
+        lengths = [len(str(value)) for value in values[values.notna()] if value]
+        widths[str(column)] = max([len(str(column))] + lengths)
+    return widths
+
+
+def format_excel_file(excel_file_path, col_widths=None):
     """
     Застосовує форматування до Excel файлу:
     1. Автоматично регулює ширину колонок відповідно до вмісту (крім колонки VCH)
@@ -246,6 +289,8 @@ def format_excel_file(excel_file_path):
     
     Args:
         excel_file_path (str): Шлях до Excel файлу для форматування
+        col_widths (dict, optional): Готові довжини вмісту колонок з excel_column_widths.
+            Якщо не передані, обчислюються за клітинками файлу.
         
     Returns:
         bool: True при успішному форматуванні, False у випадку помилки
@@ -253,45 +298,7 @@ def format_excel_file(excel_file_path):
     try:
         # Завантажуємо робочу книгу
         wb = load_workbook(excel_file_path)
-        ws = wb.active
-        
-        # Визначаємо кольори для підсвічування
-        light_red = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
-        light_green = PatternFill(start_color='CCFFCC', end_color='CCFFCC', fill_type='solid')
-        
-        # Знаходимо індекс колонки 'action' та 'VCH'
-        action_col_idx = None
-        vch_col_idx = None
-        
-        # Отримуємо заголовки колонок
-        headers = [cell.value for cell in ws[1]]
-        
-        for idx, header in enumerate(headers, start=1):
-            if header == 'action':
-                action_col_idx = idx
-            elif header == 'VCH':
-                vch_col_idx = idx
-        
-        # Застосовуємо кольори до клітинок в колонці 'action'
-        if action_col_idx:
-            action_col_letter = get_column_letter(action_col_idx)
-            for row in range(2, ws.max_row + 1):  # Starting from row 2 to skip header
-                cell = ws[f"{action_col_letter}{row}"]
-                if row == 1:  # Пропускаємо комірку заголовку
-                    pass
-                elif cell.value == 'виключити':
-                    cell.fill = light_red
-                elif cell.value == 'зарахувати':
-                    cell.fill = light_green
-        
-        # Встановлюємо мінімальний верхній відступ (0.25 дюйма)
-        # Автоматично регулюємо ширину колонок, крім VCH
-        for idx, column_cells in enumerate(ws.columns, start=1):
-            if idx != vch_col_idx:  # Пропускаємо колонку VCH
-                length = max(len(str(cell.value)) for cell in column_cells if cell.value)
-                # Додаємо трохи додаткового простору
-                adjusted_width = length + 2
-                ws.column_dimensions[get_column_letter(idx)].width = adjusted_width
+        _format_worksheet(wb.active, col_widths)
         
         # Зберігаємо форматований файл
         wb.save(excel_file_path)
@@ -300,6 +307,60 @@ def format_excel_file(excel_file_path):
         print(f"Помилка при форматуванні Excel файлу: {e}")
         return False
 
+
+def _format_worksheet(ws, col_widths=None):
+    """
+    Форматує аркуш результатів на місці (див. format_excel_file).
+
+    Args:
+        ws: Аркуш openpyxl з заголовками в першому рядку
+        col_widths (dict, optional): {заголовок: довжина найдовшого значення}
+    """
+    # Визначаємо кольори для підсвічування
+    light_red = PatternFill(start_color='FFCCCC', end_color='FFCCCC', fill_type='solid')
+    light_green = PatternFill(start_color='CCFFCC', end_color='CCFFCC', fill_type='solid')
+    
+    # Знаходимо індекс колонки 'action' та 'VCH'
+    action_col_idx = None
+    vch_col_idx = None
+    
+    # Отримуємо заголовки колонок
+    headers = [cell.value for cell in ws[1]]
+    
+    for idx, header in enumerate(headers, start=1):
+        if header == 'action':
+            action_col_idx = idx
+        elif header == 'VCH':
+            vch_col_idx = idx
+    
+    # Застосовуємо кольори до клітинок в колонці 'action'
+    if action_col_idx:
+        action_col_letter = get_column_letter(action_col_idx)
+        for row in range(2, ws.max_row + 1):  # Starting from row 2 to skip header
+            cell = ws[f"{action_col_letter}{row}"]
+            if row == 1:  # Пропускаємо комірку заголовку
+                pass
+            elif cell.value == 'виключити':
+                cell.fill = light_red
+            elif cell.value == 'зарахувати':
+                cell.fill = light_green
+    
+    # Встановлюємо мінімальний верхній відступ (0.25 дюйма)
+    # Автоматично регулюємо ширину колонок, крім VCH
+    for idx in range(1, ws.max_column + 1):
+        if idx != vch_col_idx:  # Пропускаємо колонку VCH
+            header = headers[idx - 1] if idx <= len(headers) else None
+            if col_widths and header in col_widths:
+                # Довжини вже відомі з даних - клітинки колонки не перечитуємо
+                length = col_widths[header]
+            else:
+                column_cells = next(ws.iter_cols(min_col=idx, max_col=idx))
+                length = max(len(str(cell.value)) for cell in column_cells if cell.value)
+            # Додаємо трохи додаткового простору
+            adjusted_width = length + 2
+            ws.column_dimensions[get_column_letter(idx)].width = adjusted_width
+
+
 def save_results(results, output_file='results.json'):
     """
     Зберігає результати у JSON-файл.
@@ -341,6 +402,38 @@ def convert_surnames_to_nominative(text):
     return ' '.join(new_tokens)
 
 
+def _highlight_paragraph(paragraph, names_to_add, names_to_remove, highlighted_count):
+    """
+    Виділяє runs абзацу, що містять прізвища: червоним - виключення, зеленим - зарахування.
+
+    Args:
+        paragraph: Абзац python-docx
+        names_to_add (set): Прізвища для зарахування (верхній регістр)
+        names_to_remove (set): Прізвища для виключення (верхній регістр)
+        highlighted_count (dict): Лічильники {'add': int, 'remove': int}, оновлюються на місці
+    """
+    paragraph_text = paragraph.text.upper()
+
+    # Перевіряємо чи параграф містить прізвища
+    found_add_surnames = [s for s in names_to_add if s in paragraph_text]
+    found_remove_surnames = [s for s in names_to_remove if s in paragraph_text]
+
+    # Якщо знайдено хоча б одне прізвище, виділяємо runs
+    if found_remove_surnames or found_add_surnames:
+        for run in paragraph.runs:
+            run_text = run.text.upper()
+
+            # Перевіряємо чи цей run містить якесь прізвище
+            if any(surname in run_text for surname in found_remove_surnames):
+                # Червоний фон для виключення
+                run.font.highlight_color = _HIGHLIGHT_REMOVE
+                highlighted_count['remove'] += 1
+            elif any(surname in run_text for surname in found_add_surnames):
+                # Зелений фон для зарахування
+                run.font.highlight_color = _HIGHLIGHT_ADD
+                highlighted_count['add'] += 1
+
+
 def highlight_names_in_documents(input_dir='in', output_dir='out_highlighted', results_file='results.json'):
     """
     Виділяє прізвища у вихідних документах кольором:
@@ -389,15 +482,14 @@ def highlight_names_in_documents(input_dir='in', output_dir='out_highlighted', r
         print(f"Створено папку: {output_dir}")
     
     # Обробляємо всі .docx файли
-    docx_files = [f for f in os.listdir(input_dir) if f.lower().endswith('.docx') and not f.startswith('~$')]
+    with os.scandir(input_dir) as entries:
+        docx_files = [entry.name for entry in entries
+                      if entry.name.lower().endswith('.docx') and not entry.name.startswith('~$') and entry.is_file()]
     
     if not docx_files:
         print(f"Не знайдено .docx файлів у папці {input_dir}")
         return False
     
-    from docx.shared import RGBColor
-    from docx.enum.text import WD_COLOR_INDEX
-    
     for filename in docx_files:
         input_path = os.path.join(input_dir, filename)
         output_path = os.path.join(output_dir, filename)
@@ -410,51 +502,19 @@ def highlight_names_in_documents(input_dir='in', output_dir='out_highlighted', r
             
             # Обробляємо кожен параграф
             for paragraph in doc.paragraphs:
-                paragraph_text = paragraph.text.upper()
-                
-                # Перевіряємо чи параграф містить прізвища
-                found_add_surnames = [s for s in names_to_add if s in paragraph_text]
-                found_remove_surnames = [s for s in names_to_remove if s in paragraph_text]
-                
-                # Якщо знайдено хоча б одне прізвище, виділяємо runs
-                if found_remove_surnames or found_add_surnames:
-                    # Виділяємо кожен run у цьому параграфі
-                    for run in paragraph.runs:
-                        run_text = run.text.upper()
-                        
-                        # Перевіряємо чи цей run містить якесь прізвище
-                        if any(surname in run_text for surname in found_remove_surnames):
-                            # Червоний фон для виключення
-                            run.font.highlight_color = WD_COLOR_INDEX.RED
-                            highlighted_count['remove'] += 1
-                        elif any(surname in run_text for surname in found_add_surnames):
-                            # Зелений фон для зарахування
-                            run.font.highlight_color = WD_COLOR_INDEX.BRIGHT_GREEN
-                            highlighted_count['add'] += 1
+                _highlight_paragraph(paragraph, names_to_add, names_to_remove, highlighted_count)
             
-            # Обробляємо таблиці (якщо є)
+            # Обробляємо таблиці (якщо є). Об'єднані клітинки row.cells повертає
+            # кілька разів (над тим самим елементом <w:tc>) - обробляємо кожну один раз
+            seen = set()
             for table in doc.tables:
                 for row in table.rows:
                     for cell in row.cells:
+                        if cell._element in seen:
+                            continue
+                        seen.add(cell._element)
                         for paragraph in cell.paragraphs:
-                            paragraph_text = paragraph.text.upper()
-                            
-                            # Перевіряємо чи параграф містить прізвища
-                            found_add_surnames = [s for s in names_to_add if s in paragraph_text]
-                            found_remove_surnames = [s for s in names_to_remove if s in paragraph_text]
-                            
-                            # Якщо знайдено хоча б одне прізвище, виділяємо runs
-                            if found_remove_surnames or found_add_surnames:
-                                for run in paragraph.runs:
-                                    run_text = run.text.upper()
-                                    
-                                    # Перевіряємо чи цей run містить якесь прізвище
-                                    if any(surname in run_text for surname in found_remove_surnames):
-                                        run.font.highlight_color = WD_COLOR_INDEX.RED
-                                        highlighted_count['remove'] += 1
-                                    elif any(surname in run_text for surname in found_add_surnames):
-                                        run.font.highlight_color = WD_COLOR_INDEX.BRIGHT_GREEN
-                                        highlighted_count['add'] += 1
+                            _highlight_paragraph(paragraph, names_to_add, names_to_remove, highlighted_count)
             
             # Зберігаємо документ
             doc.save(output_path)